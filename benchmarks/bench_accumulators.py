@@ -0,0 +1,113 @@
+"""
+Скорость и точность аккумуляторов сумм рейтингов.
+
+Сравниваются прежний расчет средних (сложение float в словаре бренда на
+каждую строку) и калькулятор average-rating с каждым аккумулятором на одних
+и тех же продуктах в памяти, без чтения файлов. Точность измеряется на
+рейтингах с большим количеством значащих цифр: ошибка суммы относительно
+точной (fractions.Fraction) и разброс результата при перемешивании строк.
+
+Запуск:
+    python -m benchmarks.bench_accumulators --rows 1000000 --brands 100
+"""
+
+import argparse
+import random
+import time
+from collections.abc import Callable
+from fractions import Fraction
+from functools import partial
+
+from core.accumulators import ACCUMULATORS, create_accumulator
+from core.calculator import BrandRatingCalculator
+from core.models import Product
+
+
+def _best_time(action: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _inline_float(products: list[Product]) -> dict[str, dict]:
+    # Расчет до введения аккумуляторов
+    state: dict[str, dict] = {}
+    for product in products:
+        stats = state.get(product.brand)
+        if stats is None:
+            state[product.brand] = {"total_rating": product.rating, "count": 1}
+        else:
+            stats["total_rating"] += product.rating
+            stats["count"] += 1
+    return state
+
+
+def _calculate(accumulator: str, products: list[Product]) -> object:
+    calculator = BrandRatingCalculator(accumulator=accumulator)
+    state = calculator.create_state()
+    calculator.accumulate(state, products)
+    return state
+
+
+def _products(rows: int, brands: int) -> list[Product]:
+    rng = random.Random(42)
+    return [
+        Product(
+            name="product%d" % row,
+            brand="brand%d" % rng.randrange(brands),
+            price=100.0,
+            rating=rng.uniform(0, 5),
+        )
+        for row in range(rows)
+    ]
+
+
+def _errors(accumulator: str, values: list[float], shuffles: int) -> tuple[float, int]:
+    """
+    :return: Наибольшая относительная ошибка суммы и количество различных
+        сумм при перемешивании значений
+    """
+    exact = sum(map(Fraction, values))
+    rng = random.Random(0)
+    totals = set()
+    worst = 0.0
+    for _ in range(shuffles):
+        rng.shuffle(values)
+        total = create_accumulator(accumulator)
+        total.add_many(values)
+        totals.add(total.total)
+        worst = max(worst, float(abs(Fraction(total.total) - exact) / exact))
+    return worst, len(totals)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк аккумуляторов рейтингов")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--brands", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--shuffles", type=int, default=5)
+    args = parser.parse_args()
+
+    products = _products(args.rows, args.brands)
+
+    print("Расчет average-rating по %d продуктам:" % args.rows)
+    seconds = _best_time(partial(_inline_float, products), args.repeat)
+    print("  %-10s %10.0f строк/с" % ("inline", args.rows / seconds))
+    for name in ACCUMULATORS:
+        seconds = _best_time(partial(_calculate, name, products), args.repeat)
+        print("  %-10s %10.0f строк/с" % (name, args.rows / seconds))
+
+    values = [product.rating for product in products[:100_000]]
+    print("Сумма %d рейтингов, %d перемешиваний:" % (len(values), args.shuffles))
+    for name in ACCUMULATORS:
+        error, distinct = _errors(name, values, args.shuffles)
+        print("  %-10s ошибка %.1e, различных сумм: %d" % (name, error, distinct))
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
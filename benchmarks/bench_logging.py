@@ -0,0 +1,93 @@
+"""
+Стоимость debug-вывода при выключенном debug-режиме.
+
+Сравниваются вызов с ленивыми аргументами (debug_print("... %d", n)),
+вызов с предварительным форматированием (debug_print("... %d" % n), как
+было до перевода debug-вывода на logging) и пустой цикл. Затем измеряется
+чтение файла с большой долей некорректных строк, где сообщение о пропуске
+формируется на каждую такую строку.
+
+Запуск:
+    python -m benchmarks.bench_logging --calls 1000000 --rows 200000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from collections.abc import Callable
+from functools import partial
+
+from benchmarks.datasets import write_products_csv
+from core.debug import debug_print, sampled_debug_print, set_debug_mode
+from core.reader import READERS
+from core.utils.converters import DataConverter
+from core.utils.validators import DataValidator
+
+MESSAGE = "Предупреждение: Пропуск пустой строки %d в файле %s"
+FILE_PATH = "/data/products.csv"
+
+
+def _best_time(action: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        action()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _empty(calls: int) -> None:
+    for _ in range(calls):
+        pass
+
+
+def _lazy(calls: int) -> None:
+    for row_num in range(calls):
+        debug_print(MESSAGE, row_num, FILE_PATH)
+
+
+def _sampled(calls: int) -> None:
+    for row_num in range(calls):
+        sampled_debug_print(row_num, "invalid_number", MESSAGE, row_num, FILE_PATH)
+
+
+def _eager(calls: int) -> None:
+    for row_num in range(calls):
+        debug_print(MESSAGE % (row_num, FILE_PATH))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк выключенного debug-вывода")
+    parser.add_argument("--calls", type=int, default=1_000_000)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--invalid-ratio", type=float, default=0.5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    set_debug_mode(False)
+
+    baseline = _best_time(partial(_empty, args.calls), args.repeat)
+    print("Вызов при выключенном debug-режиме (нс на вызов сверх пустого цикла):")
+    for name, action in (("lazy", _lazy), ("sampled", _sampled), ("eager", _eager)):
+        seconds = _best_time(partial(action, args.calls), args.repeat)
+        print("  %-8s %8.1f нс" % (name, (seconds - baseline) / args.calls * 1e9))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "products.csv")
+        write_products_csv(file_path, args.rows, 1000, args.invalid_ratio)
+
+        print(
+            "Чтение файла с %.0f%% некорректных строк (debug выключен):"
+            % (args.invalid_ratio * 100)
+        )
+        for name, reader_class in READERS.items():
+            reader = reader_class(DataValidator(), DataConverter())
+            seconds = _best_time(partial(reader.read, [file_path]), args.repeat)
+            print("  %-8s %10.0f строк/с" % (name, args.rows / seconds))
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,208 @@
+"""
+Бенчмарк этапов обработки: чтение CSV, расчет статистик, генерация отчета.
+
+Для каждого этапа измеряются скорость (строк в секунду) и пиковая память
+процесса (RSS). Каждый этап выполняется в отдельном процессе: пиковый RSS
+монотонно растет, поэтому в общем процессе этапы влияли бы друг на друга.
+Результаты записываются в JSON для сравнения между коммитами
+(см. benchmarks.compare).
+
+Запуск:
+    python -m benchmarks.bench_pipeline --rows 500000 --files 4 --skew 1.1 \\
+        --output results.json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from benchmarks.datasets import write_products_dataset
+from core.calculator import BrandRatingCalculator
+from core.models import BrandStatistics, Product
+from core.reader import READERS
+from core.reports import AverageRatingReport
+from core.utils.converters import DataConverter
+from core.utils.validators import DataValidator
+
+STAGES = ("read", "calculate", "report")
+
+FORMAT_VERSION = 1
+
+
+def peak_rss_kb() -> int | None:
+    """Возвращает пиковый RSS текущего процесса в КБ (None, если недоступно)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS возвращает байты, Linux - килобайты
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _best_time(action: Callable[[], Any], repeat: int) -> tuple[float, Any]:
+    """Выполняет action repeat раз, возвращает лучшее время и результат."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        result = None  # Предыдущий результат не должен влиять на пик памяти
+        started = time.perf_counter()
+        result = action()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def run_stage(
+    stage: str, file_paths: list[str], reader_type: str, repeat: int
+) -> dict[str, Any]:
+    """
+    Измеряет один этап. Выполняется в отдельном процессе.
+
+    Данные для этапа (продукты, статистики) готовятся до замера; прирост
+    пикового RSS считается относительно пика после подготовки.
+
+    :param stage: Этап: read, calculate или report
+    :param file_paths: Пути к CSV файлам
+    :param reader_type: Режим чтения CSV
+    :param repeat: Количество повторов (берется лучшее время)
+
+    :return: Результат этапа
+    """
+    reader = READERS[reader_type](DataValidator(), DataConverter())
+    calculator = BrandRatingCalculator()
+    report = AverageRatingReport()
+
+    products: list[Product] = []
+    statistics: list[BrandStatistics] = []
+    if stage != "read":
+        products = reader.read(file_paths)
+    if stage == "report":
+        statistics = calculator.calculate(products)
+
+    rss_before = peak_rss_kb()
+    if stage == "read":
+        seconds, products = _best_time(lambda: reader.read(file_paths), repeat)
+        rows = len(products)
+    elif stage == "calculate":
+        seconds, _ = _best_time(lambda: calculator.calculate(products), repeat)
+        rows = len(products)
+    else:
+        seconds, _ = _best_time(lambda: report.generate(statistics), repeat)
+        rows = len(statistics)  # Строки отчета - бренды
+    rss_after = peak_rss_kb()
+
+    return {
+        "rows": rows,
+        "seconds": seconds,
+        "rows_per_sec": rows / seconds if seconds else None,
+        "peak_rss_kb": rss_after,
+        "peak_rss_increase_kb": (
+            rss_after - rss_before
+            if rss_after is not None and rss_before is not None
+            else None
+        ),
+    }
+
+
+def git_commit() -> str | None:
+    """Возвращает хэш текущего коммита или None вне git репозитория."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк этапов обработки")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--files", type=int, default=1)
+    parser.add_argument("--brands", type=int, default=1000)
+    parser.add_argument(
+        "--skew", type=float, default=0.0, help="Перекос по брендам (закон Ципфа)"
+    )
+    parser.add_argument("--invalid-ratio", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reader", choices=list(READERS), default="default")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--output", "-o", help="Файл для результатов в JSON")
+    args = parser.parse_args()
+
+    params = {
+        "rows": args.rows,
+        "files": args.files,
+        "brands": args.brands,
+        "skew": args.skew,
+        "invalid_ratio": args.invalid_ratio,
+        "seed": args.seed,
+        "reader": args.reader,
+        "repeat": args.repeat,
+    }
+    results: dict[str, Any] = {}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_paths = write_products_dataset(
+            tmp_dir,
+            args.rows,
+            args.files,
+            args.brands,
+            args.invalid_ratio,
+            args.seed,
+            args.skew,
+        )
+
+        context = multiprocessing.get_context("spawn")
+        for stage in args.stages:
+            # Новый процесс на этап: пиковый RSS не наследуется
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                result = pool.submit(
+                    run_stage, stage, file_paths, args.reader, args.repeat
+                ).result()
+            results[stage] = result
+            print(
+                "%-10s %12.0f строк/с  %8d строк  %.3f с  пик RSS %s КБ (+%s)"
+                % (
+                    stage,
+                    result["rows_per_sec"] or 0,
+                    result["rows"],
+                    result["seconds"],
+                    result["peak_rss_kb"],
+                    result["peak_rss_increase_kb"],
+                )
+            )
+
+    if args.output:
+        document = {
+            "version": FORMAT_VERSION,
+            "commit": git_commit(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": params,
+            "results": results,
+        }
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(document, file, indent=2)
+            file.write("\n")
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
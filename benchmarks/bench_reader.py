@@ -0,0 +1,57 @@
+"""
+Сравнение скорости режимов чтения CSV (строк в секунду).
+
+Запуск:
+    python -m benchmarks.bench_reader --rows 500000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.datasets import write_products_csv
+from core.reader import READERS
+from core.utils.converters import DataConverter
+from core.utils.validators import DataValidator
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Бенчмарк режимов чтения CSV")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--brands", type=int, default=1000)
+    parser.add_argument("--invalid-ratio", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "products.csv")
+        write_products_csv(file_path, args.rows, args.brands, args.invalid_ratio)
+
+        results = {}
+        for name, reader_class in READERS.items():
+            reader = reader_class(DataValidator(), DataConverter())
+
+            best = float("inf")
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                products = reader.read([file_path])
+                best = min(best, time.perf_counter() - started)
+
+            results[name] = products
+            print(
+                "%-8s %10.0f строк/с  (%d продуктов, %.3f с)"
+                % (name, args.rows / best, len(products), best)
+            )
+
+    baseline = results.pop("default")
+    for name, products in results.items():
+        if products != baseline:
+            print("ОШИБКА: результат режима %s отличается от default" % name)
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,109 @@
+"""
+Сравнение результатов benchmarks.bench_pipeline двух запусков (например,
+до и после изменения) с порогом допустимой регрессии.
+
+Запуск:
+    python -m benchmarks.compare baseline.json results.json --threshold 0.1
+
+Код завершения 1, если скорость какого-либо этапа упала или пиковая память
+выросла больше порога.
+"""
+
+import argparse
+import json
+from typing import Any
+
+
+def load_results(file_path: str) -> dict[str, Any]:
+    """Читает файл результатов бенчмарка."""
+    with open(file_path, encoding="utf-8") as file:
+        document: dict[str, Any] = json.load(file)
+    return document
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float
+) -> list[str]:
+    """
+    Сравнивает результаты этапов и печатает таблицу изменений.
+
+    :param baseline: Результаты базового запуска
+    :param current: Результаты нового запуска
+    :param threshold: Допустимое относительное ухудшение (0.1 - 10%)
+
+    :return: Описания регрессий
+    """
+    regressions = []
+    print(
+        "%-10s %14s %14s %8s %12s %12s %8s"
+        % ("stage", "base rows/s", "rows/s", "change", "base RSS", "RSS", "change")
+    )
+
+    for stage, result in current["results"].items():
+        base = baseline["results"].get(stage)
+        if base is None:
+            print("%-10s нет в базовых результатах" % stage)
+            continue
+
+        speed_change = _change(base["rows_per_sec"], result["rows_per_sec"])
+        rss_change = _change(base["peak_rss_kb"], result["peak_rss_kb"])
+        print(
+            "%-10s %14.0f %14.0f %8s %12s %12s %8s"
+            % (
+                stage,
+                base["rows_per_sec"] or 0,
+                result["rows_per_sec"] or 0,
+                _format_change(speed_change),
+                base["peak_rss_kb"],
+                result["peak_rss_kb"],
+                _format_change(rss_change),
+            )
+        )
+
+        if speed_change is not None and speed_change < -threshold:
+            regressions.append(
+                "%s: скорость упала на %.1f%%" % (stage, -speed_change * 100)
+            )
+        if rss_change is not None and rss_change > threshold:
+            regressions.append(
+                "%s: пиковая память выросла на %.1f%%" % (stage, rss_change * 100)
+            )
+
+    return regressions
+
+
+def _change(before: float | None, after: float | None) -> float | None:
+    if not before or after is None:
+        return None
+    return after / before - 1
+
+
+def _format_change(change: float | None) -> str:
+    return "-" if change is None else "%+.1f%%" % (change * 100)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Сравнение результатов бенчмарка")
+    parser.add_argument("baseline", help="Базовые результаты (JSON)")
+    parser.add_argument("current", help="Новые результаты (JSON)")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Допустимое ухудшение скорости и памяти (по умолчанию: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    baseline = load_results(args.baseline)
+    current = load_results(args.current)
+    if baseline.get("params") != current.get("params"):
+        print("Предупреждение: параметры запусков различаются")
+
+    regressions = compare(baseline, current, args.threshold)
+    for regression in regressions:
+        print("РЕГРЕССИЯ: %s" % regression)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    exit(main())
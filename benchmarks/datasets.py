@@ -0,0 +1,125 @@
+"""
+Генерация синтетических CSV файлов с продуктами для бенчмарков.
+"""
+
+import csv
+import os
+import random
+
+# Примеры некорректных строк: пустая, без бренда, плохая цена, плохой рейтинг
+INVALID_ROWS = [
+    ["", "", "", ""],
+    ["product", "", "100", "4.5"],
+    ["product", "brand", "n/a", "4.5"],
+    ["product", "brand", "100", "7.5"],
+]
+
+
+def brand_weights(brands: int, skew: float) -> list[float]:
+    """
+    Возвращает накопленные веса брендов по закону Ципфа: вес бренда
+    с рангом r пропорционален 1 / r ** skew.
+
+    :param brands: Количество различных брендов
+    :param skew: Степень перекоса (0 - равномерное распределение)
+
+    :return: Накопленные веса для random.choices(cum_weights=...)
+    """
+    weights = []
+    total = 0.0
+    for rank in range(1, brands + 1):
+        total += 1 / rank**skew
+        weights.append(total)
+    return weights
+
+
+def write_products_csv(
+    file_path: str,
+    rows: int,
+    brands: int = 100,
+    invalid_ratio: float = 0.0,
+    seed: int = 0,
+    skew: float = 0.0,
+    first_index: int = 0,
+) -> None:
+    """
+    Записывает детерминированный CSV файл с продуктами.
+
+    :param file_path: Путь к создаваемому файлу
+    :param rows: Количество строк данных
+    :param brands: Количество различных брендов
+    :param invalid_ratio: Доля некорректных строк от 0 до 1
+    :param seed: Зерно генератора случайных чисел
+    :param skew: Перекос распределения строк по брендам (закон Ципфа)
+    :param first_index: Номер первого продукта (уникальные названия в наборе файлов)
+    """
+    rng = random.Random(seed)
+    cum_weights = brand_weights(brands, skew) if skew else None
+    brand_codes = range(brands)
+
+    with open(file_path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["name", "brand", "price", "rating"])
+
+        for index in range(first_index, first_index + rows):
+            if invalid_ratio and rng.random() < invalid_ratio:
+                writer.writerow(rng.choice(INVALID_ROWS))
+                continue
+
+            if cum_weights is None:
+                brand = rng.randrange(brands)
+            else:
+                brand = rng.choices(brand_codes, cum_weights=cum_weights)[0]
+
+            writer.writerow(
+                [
+                    "product %d" % index,
+                    "Brand %d" % brand,
+                    "%.2f" % rng.uniform(1, 2000),
+                    "%.1f" % rng.uniform(0, 5),
+                ]
+            )
+
+
+def write_products_dataset(
+    directory: str,
+    rows: int,
+    files: int = 1,
+    brands: int = 100,
+    invalid_ratio: float = 0.0,
+    seed: int = 0,
+    skew: float = 0.0,
+) -> list[str]:
+    """
+    Записывает детерминированный набор CSV файлов с продуктами.
+
+    Строки распределяются по файлам поровну, у каждого файла свое зерно
+    генератора, выведенное из seed.
+
+    :param directory: Каталог для файлов
+    :param rows: Общее количество строк данных
+    :param files: Количество файлов
+    :param brands: Количество различных брендов
+    :param invalid_ratio: Доля некорректных строк от 0 до 1
+    :param seed: Зерно генератора случайных чисел
+    :param skew: Перекос распределения строк по брендам (закон Ципфа)
+
+    :return: Пути к созданным файлам
+    """
+    file_paths = []
+    first_index = 0
+    for number in range(files):
+        file_rows = rows // files + (1 if number < rows % files else 0)
+        file_path = os.path.join(directory, "products_%03d.csv" % number)
+        write_products_csv(
+            file_path,
+            file_rows,
+            brands,
+            invalid_ratio,
+            seed=seed * 1_000_003 + number,
+            skew=skew,
+            first_index=first_index,
+        )
+        file_paths.append(file_path)
+        first_index += file_rows
+    return file_paths
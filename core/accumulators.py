@@ -0,0 +1,307 @@
+"""
+Модуль аккумуляторов суммы и среднего значений (например, рейтингов бренда).
+
+Аккумулятор получает значения блоками (add_many) и объединяется с
+аккумулятором другой части данных (merge): так частичные состояния
+считаются в разных процессах, фрагментах файлов и в кэше. Реализации
+отличаются точностью и зависимостью результата от порядка значений:
+
+- float - обычное сложение float, результат зависит от порядка;
+- neumaier - сложение с компенсацией ошибки (Kahan-Babuska-Neumaier),
+  ошибка почти не растет с количеством значений, но порядок влияет
+  на последний бит;
+- fsum - точная сумма (неперекрывающиеся слагаемые, как в math.fsum),
+  округляемая один раз: результат не зависит от порядка файлов,
+  фрагментов и количества процессов;
+- welford - среднее и дисперсия по Уэлфорду (объединение по Чану),
+  сумма вычисляется как среднее * количество.
+"""
+
+import math
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from typing import TypeVar
+
+A = TypeVar("A", bound="Accumulator")
+
+
+class Accumulator(ABC):
+    """
+    Абстрактный аккумулятор суммы значений.
+
+    Аккумуляторы сериализуются через pickle и объединяются только
+    с аккумулятором того же класса.
+    """
+
+    __slots__ = ("count",)
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    @abstractmethod
+    def add_many(self, values: Sequence[float]) -> None:
+        """
+        Добавляет значения.
+
+        :param values: Значения (список или массив)
+        """
+        pass
+
+    def add(self, value: float) -> None:
+        """Добавляет одно значение (для блоков значений быстрее add_many)."""
+        self.add_many((value,))
+
+    @abstractmethod
+    def merge(self: A, other: A) -> A:
+        """
+        Добавляет значения другого аккумулятора.
+
+        :param other: Аккумулятор того же класса (не изменяется)
+
+        :return: Этот аккумулятор
+        """
+        pass
+
+    @abstractmethod
+    def copy(self: A) -> A:
+        """Возвращает независимую копию аккумулятора."""
+        pass
+
+    @property
+    @abstractmethod
+    def total(self) -> float:
+        """Сумма значений."""
+        pass
+
+    @property
+    def mean(self) -> float:
+        """Среднее значений (nan, если значений нет)."""
+        return self.total / self.count if self.count else math.nan
+
+    def __eq__(self, other: object) -> bool:
+        # Аккумуляторы равны, если у них одинаковые класс, количество и сумма
+        if not isinstance(other, Accumulator) or type(other) is not type(self):
+            return NotImplemented
+        return self.count == other.count and self.total == other.total
+
+    def __repr__(self) -> str:
+        return "%s(count=%d, total=%r)" % (type(self).__name__, self.count, self.total)
+
+
+class FloatAccumulator(Accumulator):
+    """Обычная сумма float в порядке добавления значений."""
+
+    __slots__ = ("_total",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._total = 0.0
+
+    def add_many(self, values: Sequence[float]) -> None:
+        total = self._total
+        for value in values:
+            total += value
+        self._total = total
+        self.count += len(values)
+
+    def merge(self, other: "FloatAccumulator") -> "FloatAccumulator":
+        self._total += other._total
+        self.count += other.count
+        return self
+
+    def copy(self) -> "FloatAccumulator":
+        clone = FloatAccumulator()
+        clone._total, clone.count = self._total, self.count
+        return clone
+
+    @property
+    def total(self) -> float:
+        return self._total
+
+
+class NeumaierAccumulator(Accumulator):
+    """
+    Сумма с компенсацией ошибки округления (алгоритм Неймайера).
+
+    Потерянные при сложении младшие биты накапливаются отдельно,
+    поэтому ошибка не растет с количеством значений.
+    """
+
+    __slots__ = ("_sum", "_compensation")
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._sum = 0.0
+        self._compensation = 0.0
+
+    def add_many(self, values: Sequence[float]) -> None:
+        total, compensation = self._sum, self._compensation
+        for value in values:
+            new_total = total + value
+            if abs(total) >= abs(value):
+                compensation += (total - new_total) + value
+            else:
+                compensation += (value - new_total) + total
+            total = new_total
+        self._sum, self._compensation = total, compensation
+        self.count += len(values)
+
+    def merge(self, other: "NeumaierAccumulator") -> "NeumaierAccumulator":
+        count = self.count
+        self.add_many((other._sum, other._compensation))
+        self.count = count + other.count
+        return self
+
+    def copy(self) -> "NeumaierAccumulator":
+        clone = NeumaierAccumulator()
+        clone._sum, clone._compensation = self._sum, self._compensation
+        clone.count = self.count
+        return clone
+
+    @property
+    def total(self) -> float:
+        return self._sum + self._compensation
+
+
+class FsumAccumulator(Accumulator):
+    """
+    Точная сумма: хранится как несколько неперекрывающихся float, сумма
+    которых в точности равна сумме значений. Округляется только при чтении
+    total (math.fsum), поэтому результат не зависит от порядка значений
+    и разбиения данных на части.
+
+    Блок значений добавляется несколькими проходами math.fsum (на C):
+    округленная сумма и остатки округления, пока остаток не станет нулем.
+    """
+
+    __slots__ = ("_partials",)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._partials: list[float] = []
+
+    def add_many(self, values: Sequence[float]) -> None:
+        self._partials = _exact_partials([*self._partials, *values])
+        self.count += len(values)
+
+    def merge(self, other: "FsumAccumulator") -> "FsumAccumulator":
+        self._partials = _exact_partials([*self._partials, *other._partials])
+        self.count += other.count
+        return self
+
+    def copy(self) -> "FsumAccumulator":
+        clone = FsumAccumulator()
+        clone._partials, clone.count = list(self._partials), self.count
+        return clone
+
+    @property
+    def total(self) -> float:
+        return math.fsum(self._partials)
+
+
+class WelfordAccumulator(Accumulator):
+    """
+    Среднее и дисперсия по Уэлфорду.
+
+    Блок значений сводится к своему среднему и сумме квадратов отклонений
+    (два прохода math.fsum), которые объединяются с накопленными по
+    формулам Чана; так же объединяются аккумуляторы разных частей данных.
+    """
+
+    __slots__ = ("_mean", "_m2")
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def add_many(self, values: Sequence[float]) -> None:
+        count = len(values)
+        if not count:
+            return
+        mean = math.fsum(values) / count
+        m2 = math.fsum([(value - mean) * (value - mean) for value in values])
+        self._combine(count, mean, m2)
+
+    def merge(self, other: "WelfordAccumulator") -> "WelfordAccumulator":
+        if other.count:
+            self._combine(other.count, other._mean, other._m2)
+        return self
+
+    def copy(self) -> "WelfordAccumulator":
+        clone = WelfordAccumulator()
+        clone.count, clone._mean, clone._m2 = self.count, self._mean, self._m2
+        return clone
+
+    @property
+    def total(self) -> float:
+        return self._mean * self.count
+
+    @property
+    def mean(self) -> float:
+        return self._mean if self.count else math.nan
+
+    def variance(self, ddof: int = 0) -> float:
+        """
+        Дисперсия значений.
+
+        :param ddof: 0 - дисперсия совокупности, 1 - выборочная
+
+        :return: Дисперсия или nan, если значений не больше ddof
+        """
+        if self.count <= ddof:
+            return math.nan
+        return self._m2 / (self.count - ddof)
+
+    def _combine(self, count: int, mean: float, m2: float) -> None:
+        total = self.count + count
+        delta = mean - self._mean
+        self._mean += delta * count / total
+        self._m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+
+# Реализации аккумуляторов по названиям
+ACCUMULATORS: dict[str, type[Accumulator]] = {
+    "float": FloatAccumulator,
+    "neumaier": NeumaierAccumulator,
+    "fsum": FsumAccumulator,
+    "welford": WelfordAccumulator,
+}
+
+
+def create_accumulator(name: str) -> Accumulator:
+    """
+    Создает пустой аккумулятор.
+
+    :param name: Название реализации из ACCUMULATORS
+
+    :return: Аккумулятор
+
+    :raise ValueError: Если реализация неизвестна
+    """
+    accumulator_class = ACCUMULATORS.get(name)
+    if accumulator_class is None:
+        raise ValueError("Unknown accumulator: %s" % name)
+    return accumulator_class()
+
+
+def _exact_partials(terms: list[float]) -> list[float]:
+    """
+    Возвращает неперекрывающиеся слагаемые (по убыванию модуля), сумма
+    которых в точности равна сумме terms.
+
+    math.fsum округляет точную сумму корректно, поэтому остаток после
+    вычитания округленной суммы тоже точно суммируется следующим проходом;
+    ненулевая точная сумма float не округляется до нуля.
+    """
+    partials = []
+    while terms:
+        total = math.fsum(terms)
+        if total == 0.0:
+            break
+        partials.append(total)
+        if not math.isfinite(total):
+            break
+        terms.append(-total)
+    return partials
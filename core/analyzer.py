@@ -1,10 +1,30 @@
-from core.calculator import CalculatorFactory
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING, Any
+
+from core.accumulators import ACCUMULATORS
+from core.cache import CheckpointCache
+from core.calculator import CalculatorFactory, CompositeCalculator, StatisticsCalculator
 from core.debug import debug_print, error_print
-from core.reader import CSVProductReader
-from core.reports import ReportFactory
+from core.incremental import IncrementalAggregator
+from core.metrics import get_metrics
+from core.models import BrandStatistics
+from core.options import DEFAULT_ACCUMULATOR, DEFAULT_ENGINE, DEFAULT_READER
+from core.parallel import ParallelAggregator
+from core.reader import READERS, CSVProductReader
+from core.reports import ReportFactory, ReportWriterFactory
+from core.reports.formats import (
+    DEFAULT_FORMAT,
+    GridReportWriter,
+    open_output,
+    report_output_path,
+)
+from core.utils.brands import BrandNormalizer
 from core.utils.converters import DataConverter
 from core.utils.validators import DataValidator
 
+if TYPE_CHECKING:
+    from core.async_reader import AsyncCSVProductReader
+
 
 class BrandRatingAnalyzer:
     """
@@ -12,35 +32,70 @@ class BrandRatingAnalyzer:
     Использует фабрики для создания калькуляторов и отчетов.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        jobs: int = 1,
+        engine: str = DEFAULT_ENGINE,
+        reader_type: str = DEFAULT_READER,
+        cache: CheckpointCache | None = None,
+        accumulator: str = DEFAULT_ACCUMULATOR,
+        brand_aliases: Mapping[str, str] | None = None,
+    ) -> None:
         """
         Инициализирует анализатор с необходимыми компонентами.
+
+        :param jobs: Количество процессов для параллельного чтения файлов
+        :param engine: Движок расчета статистик (python, numpy)
+        :param reader_type: Режим чтения CSV (default, fast)
+        :param cache: Кэш результатов по файлам или None
+        :param accumulator: Аккумулятор сумм рейтингов (float, neumaier,
+            fsum, welford)
+        :param brand_aliases: Псевдонимы брендов: псевдоним -> бренд
+
+        :raise ValueError: Если режим чтения или аккумулятор неизвестен
         """
         debug_print("Initializing BrandRatingAnalyzer")
-        self.reader = CSVProductReader(DataValidator(), DataConverter())
+        if reader_type not in READERS:
+            raise ValueError("Unknown reader type: %s" % reader_type)
+        if accumulator not in ACCUMULATORS:
+            raise ValueError("Unknown accumulator: %s" % accumulator)
+        self.reader = READERS[reader_type](
+            DataValidator(), DataConverter(), normalizer=BrandNormalizer(brand_aliases)
+        )
+        self.jobs = jobs
+        self.engine = engine
+        self.cache = cache
+        self.accumulator = accumulator
+        self._async_reader: "AsyncCSVProductReader | None" = None
         debug_print("BrandRatingAnalyzer initialized successfully")
 
-    def analyze(self, file_paths: list[str], report_type: str) -> str:
+    def analyze(
+        self,
+        file_paths: list[str],
+        report_type: str,
+        top: int | None = None,
+        min_products: int = 1,
+    ) -> str:
         """
         Выполняет полный анализ: чтение данных, расчет статистик, генерация отчета.
         :param file_paths: Список путей к файлам с данными
         :param report_type: Тип отчета для генерации
+        :param top: Сколько первых брендов включить в отчет (None - все)
+        :param min_products: Минимальное количество продуктов бренда в отчете
         :return: Сгенерированный отчет в виде строки
         """
 
         debug_print("Starting analysis: files=%s, report=%s", file_paths, report_type)
 
         try:
-            # Чтение данных
-            products = self.reader.read(file_paths)
-
-            # Создание калькулятора по типу отчета
-            calculator = CalculatorFactory.create(report_type)
-            statistics = calculator.calculate(products)
+            statistics = self.calculate_statistics(
+                file_paths, report_type, top, min_products
+            )
 
             # Создание отчета
             report = ReportFactory.create(report_type)
-            result = report.generate(statistics)
+            with get_metrics().stage("render"):
+                result = report.generate(statistics)
 
             debug_print("Analysis completed successfully")
             return result
@@ -49,6 +104,285 @@ class BrandRatingAnalyzer:
             error_print("Analysis failed: %s", e)
             raise
 
+    def write_report(
+        self,
+        file_paths: list[str],
+        report_type: str,
+        output_format: str = DEFAULT_FORMAT,
+        output_path: str | None = None,
+        top: int | None = None,
+        min_products: int = 1,
+    ) -> None:
+        """
+        Выполняет анализ и записывает отчет в файл или stdout.
+
+        Машиночитаемые форматы (csv, jsonl, parquet) пишутся построчно,
+        без сборки всего отчета в одну строку. Файл открывается только
+        после расчета статистик: при ошибке анализа он не создается.
+
+        :param file_paths: Список путей к файлам с данными
+        :param report_type: Тип отчета для генерации
+        :param output_format: Формат вывода (см. ReportWriterFactory)
+        :param output_path: Путь к файлу отчета или None для stdout
+        :param top: Сколько первых брендов включить в отчет (None - все)
+        :param min_products: Минимальное количество продуктов бренда в отчете
+
+        :raise ValueError: Если формат вывода неизвестен или недоступен
+        """
+        self.write_reports(
+            file_paths, [report_type], output_format, output_path, top, min_products
+        )
+
+    def write_reports(
+        self,
+        file_paths: list[str],
+        report_types: Sequence[str],
+        output_format: str = DEFAULT_FORMAT,
+        output_path: str | None = None,
+        top: int | None = None,
+        min_products: int = 1,
+    ) -> None:
+        """
+        Выполняет анализ для нескольких отчетов за одно чтение файлов
+        и записывает отчеты в файлы или stdout.
+
+        Один отчет записывается в output_path. Для нескольких отчетов имя
+        отчета добавляется к output_path перед расширением (report_output_path);
+        без output_path таблицы (grid) выводятся одна за другой с заголовками,
+        а машиночитаемые форматы не поддерживаются.
+
+        :param file_paths: Список путей к файлам с данными
+        :param report_types: Типы отчетов для генерации
+        :param output_format: Формат вывода (см. ReportWriterFactory)
+        :param output_path: Путь к файлу отчета или None для stdout
+        :param top: Сколько первых брендов включить в отчеты (None - все)
+        :param min_products: Минимальное количество продуктов бренда в отчетах
+
+        :raise ValueError: Если формат вывода неизвестен, недоступен или
+            не поддерживает вывод нескольких отчетов в stdout
+        """
+        debug_print(
+            "Starting analysis: files=%s, reports=%s, format=%s",
+            file_paths,
+            ", ".join(report_types),
+            output_format,
+        )
+
+        try:
+            writer = ReportWriterFactory.create(output_format)
+            several = len(report_types) > 1
+            if (
+                several
+                and output_path is None
+                and not isinstance(writer, GridReportWriter)
+            ):
+                raise ValueError(
+                    "Format %s requires --output for several reports" % output_format
+                )
+
+            reports = [
+                ReportFactory.create(report_type) for report_type in report_types
+            ]
+            results = self.calculate_statistics_each(
+                file_paths, report_types, top, min_products
+            )
+
+            with get_metrics().stage("render"):
+                for index, (report, statistics) in enumerate(
+                    zip(reports, results, strict=True)
+                ):
+                    path = output_path
+                    if several and output_path is not None:
+                        path = report_output_path(output_path, report.name)
+                    with open_output(path, writer.binary) as output:
+                        if several and path is None:
+                            output.write(
+                                "%sОтчет: %s\n" % ("\n" if index else "", report.name)
+                            )
+                        writer.write(report, statistics, output)
+
+            debug_print("Analysis completed successfully")
+
+        except Exception as e:
+            error_print("Analysis failed: %s", e)
+            raise
+
+    def calculate_statistics(
+        self,
+        file_paths: list[str],
+        report_type: str,
+        top: int | None = None,
+        min_products: int = 1,
+    ) -> list[BrandStatistics]:
+        """
+        Читает данные и рассчитывает статистики брендов без генерации отчета.
+
+        :param file_paths: Список путей к файлам с данными
+        :param report_type: Тип отчета, определяющий калькулятор
+        :param top: Сколько первых брендов оставить (None - все)
+        :param min_products: Минимальное количество продуктов бренда
+
+        :return: Статистики брендов в порядке отчета
+        """
+        (statistics,) = self.calculate_statistics_each(
+            file_paths, [report_type], top, min_products
+        )
+        return statistics
+
+    def calculate_statistics_each(
+        self,
+        file_paths: list[str],
+        report_types: Sequence[str],
+        top: int | None = None,
+        min_products: int = 1,
+    ) -> list[list[BrandStatistics]]:
+        """
+        Рассчитывает статистики нескольких отчетов за одно чтение файлов.
+
+        Калькуляторы отчетов объединяются в CompositeCalculator: каждая
+        строка читается и разбирается один раз и передается всем
+        калькуляторам. Читаются колонки, нужные хотя бы одному из них.
+
+        :param file_paths: Список путей к файлам с данными
+        :param report_types: Типы отчетов (хотя бы один)
+        :param top: Сколько первых брендов оставить (None - все)
+        :param min_products: Минимальное количество продуктов бренда
+
+        :return: Статистики брендов каждого отчета в порядке report_types
+        """
+        # Создание калькуляторов по типам отчетов
+        calculators = [
+            CalculatorFactory.create(
+                report_type,
+                self.engine,
+                top=top,
+                min_products=min_products,
+                accumulator=self.accumulator,
+            )
+            for report_type in report_types
+        ]
+        calculator = (
+            calculators[0]
+            if len(calculators) == 1
+            else CompositeCalculator(calculators)
+        )
+
+        # Читаются только колонки, нужные калькуляторам
+        reader = self.reader.with_columns(calculator.required_columns)
+        # Частичные состояния разных аккумуляторов несовместимы, а псевдонимы
+        # брендов меняют результат
+        cache_key = "%s:%s:%s:%s" % (
+            "+".join(report_types),
+            ",".join(reader.columns),
+            self.accumulator,
+            reader.normalizer.fingerprint,
+        )
+
+        # Чтение данных и расчет частичного состояния
+        metrics = get_metrics()
+        with metrics.stage("aggregate"):
+            state = self._aggregate(calculator, reader, file_paths, cache_key)
+        with metrics.stage("finalize"):
+            if isinstance(calculator, CompositeCalculator):
+                return calculator.finalize_each(state)
+            return [calculator.finalize(state)]
+
+    async def analyze_async(
+        self,
+        file_paths: list[str],
+        report_type: str,
+        top: int | None = None,
+        min_products: int = 1,
+    ) -> str:
+        """
+        Выполняет анализ, не блокируя цикл событий asyncio.
+
+        Файлы читаются и разбираются AsyncCSVProductReader (см. ограничения
+        параллельности там); jobs и кэш не используются. Анализатор должен
+        использоваться в одном цикле событий.
+
+        :param file_paths: Список путей к файлам с данными
+        :param report_type: Тип отчета для генерации
+        :param top: Сколько первых брендов включить в отчет (None - все)
+        :param min_products: Минимальное количество продуктов бренда в отчете
+
+        :return: Сгенерированный отчет в виде строки
+        """
+        debug_print(
+            "Starting async analysis: files=%s, report=%s", file_paths, report_type
+        )
+
+        try:
+            calculator = CalculatorFactory.create(
+                report_type,
+                self.engine,
+                top=top,
+                min_products=min_products,
+                accumulator=self.accumulator,
+            )
+            columns = CalculatorFactory.get_required_columns(report_type)
+            if self._async_reader is None:
+                # asyncio импортируется только для асинхронного анализа
+                from core.async_reader import AsyncCSVProductReader
+
+                self._async_reader = AsyncCSVProductReader(self.reader)
+
+            reader = self._async_reader.with_columns(columns)
+            state = await reader.aggregate(calculator, file_paths)
+
+            report = ReportFactory.create(report_type)
+            result = report.generate(calculator.finalize(state))
+
+            debug_print("Analysis completed successfully")
+            return result
+
+        except Exception as e:
+            error_print("Analysis failed: %s", e)
+            raise
+
+    def _aggregate(
+        self,
+        calculator: StatisticsCalculator,
+        reader: CSVProductReader,
+        file_paths: list[str],
+        cache_key: str,
+    ) -> Any:
+        """
+        Заполняет частичное состояние калькулятора данными из файлов.
+
+        При jobs > 1 файлы (и фрагменты больших файлов) обрабатываются
+        в нескольких процессах, иначе читаются потоково в текущем процессе.
+        При включенном кэше (состояния и контрольные точки файлов по
+        IncrementalAggregator) читаются только записи, добавленные в файлы
+        после сохранения контрольных точек.
+
+        :param calculator: Калькулятор статистик
+        :param reader: Читатель с проекцией колонок калькулятора
+        :param file_paths: Список путей к файлам
+        :param cache_key: Ключ расчета в кэше
+
+        :return: Частичное состояние калькулятора
+        """
+        if self.cache is not None:
+            aggregator = IncrementalAggregator(reader, self.cache, self.jobs)
+            state = calculator.create_state()
+            for file_state in aggregator.aggregate_each(
+                calculator, file_paths, cache_key
+            ):
+                state = calculator.merge(state, file_state)
+            return state
+
+        if self.jobs > 1:
+            return ParallelAggregator(reader, self.jobs).aggregate(
+                calculator, file_paths
+            )
+
+        # Потоковое чтение данных: продукты CSV не накапливаются в памяти
+        state = calculator.create_state()
+        for products in reader.iter_file_products(file_paths):
+            calculator.accumulate(state, products)
+        return state
+
     @staticmethod
     def get_available_reports() -> list[str]:
         """
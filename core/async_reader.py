@@ -0,0 +1,230 @@
+"""
+Асинхронное (asyncio) чтение CSV файлов с продуктами.
+"""
+
+import asyncio
+import copy
+import io
+from collections.abc import Iterable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, BinaryIO
+
+from core.calculator import StatisticsCalculator
+from core.debug import debug_print
+from core.reader import CSVProductReader
+from core.snapshot import is_snapshot
+
+# Размер блока, читаемого из файла за одну операцию
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+
+# Конец файла и отмена чтения в очереди блоков
+_EOF = b""
+_ABORT = object()
+
+
+class _QueueStream(io.RawIOBase):
+    """
+    Бинарный поток для потока разбора: блоки файла приходят из очереди
+    asyncio, заполняемой в цикле событий.
+    """
+
+    def __init__(self, queue: asyncio.Queue, loop: asyncio.AbstractEventLoop):
+        super().__init__()
+        self._queue = queue
+        self._loop = loop
+        self._block = memoryview(b"")
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        if not self._block and not self._eof:
+            # Поток разбора ждет блок, не блокируя цикл событий
+            item = asyncio.run_coroutine_threadsafe(
+                self._queue.get(), self._loop
+            ).result()
+            if item is _ABORT:
+                raise asyncio.CancelledError()
+            if isinstance(item, BaseException):
+                raise item
+            self._eof = item == _EOF
+            self._block = memoryview(item)
+
+        size = min(len(buffer), len(self._block))
+        buffer[:size] = self._block[:size]
+        self._block = self._block[size:]
+        return size
+
+
+class AsyncCSVProductReader:
+    """
+    Асинхронное чтение CSV файлов для сервисов на asyncio.
+
+    Для каждого файла две задачи: чтение блоков файла в пуле потоков
+    ввода-вывода (цикл событий не блокируется) в ограниченную очередь и
+    разбор блоков обычным CSVProductReader в отдельном пуле потоков.
+    Заполненная очередь приостанавливает чтение (обратное давление),
+    поэтому в памяти не больше queue_size блоков на файл. Снимки
+    (core.snapshot) читаются целиком в пуле потоков разбора.
+
+    Одновременно обрабатывается не больше max_files файлов для всех вызовов
+    (общий семафор) и не больше max_files_per_call файлов одного вызова,
+    поэтому вызов с сотнями файлов не вытесняет остальные: ожидающие
+    семафора файлы разных вызовов обслуживаются по очереди.
+
+    Разбор выполняется в потоках и разделяет GIL с циклом событий; для
+    больших объемов лучше BrandRatingAnalyzer.analyze с jobs > 1 в executor.
+    """
+
+    def __init__(
+        self,
+        reader: CSVProductReader,
+        max_files: int = 4,
+        max_files_per_call: int = 2,
+        queue_size: int = 4,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+    ):
+        """
+        :param reader: Синхронный читатель, которым разбираются файлы
+        :param max_files: Общее ограничение одновременно читаемых файлов
+        :param max_files_per_call: Ограничение файлов одного вызова aggregate
+        :param queue_size: Количество прочитанных, но не разобранных блоков файла
+        :param block_size: Размер блока чтения в байтах
+        """
+        self.reader = reader
+        self.max_files = max_files
+        self.max_files_per_call = max(1, min(max_files_per_call, max_files))
+        self.queue_size = queue_size
+        self.block_size = block_size
+        self._semaphore = asyncio.Semaphore(max_files)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_files, thread_name_prefix="csv-parse"
+        )
+
+    def with_columns(self, columns: Iterable[str]) -> "AsyncCSVProductReader":
+        """
+        Возвращает читатель с другой проекцией колонок и общими
+        с текущим ограничениями и пулом потоков.
+        """
+        clone = copy.copy(self)
+        clone.reader = self.reader.with_columns(columns)
+        return clone
+
+    def close(self) -> None:
+        """Останавливает пул потоков разбора."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def aggregate(
+        self, calculator: StatisticsCalculator, file_paths: Sequence[str]
+    ) -> Any:
+        """
+        Асинхронно агрегирует данные файлов.
+
+        :param calculator: Калькулятор статистик
+        :param file_paths: Пути к CSV файлам
+
+        :return: Объединенное частичное состояние (в порядке file_paths)
+
+        :raises
+            FileNotFoundError: Если файл не найден
+            ValueError: Если данные некорректны
+        """
+        file_states: list[Any] = [None] * len(file_paths)
+        pending = iter(enumerate(file_paths))
+
+        async def worker() -> None:
+            for index, file_path in pending:
+                file_states[index] = await self.aggregate_file(calculator, file_path)
+
+        workers = [
+            asyncio.create_task(worker())
+            for _ in range(min(self.max_files_per_call, len(file_paths)))
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+
+        state = calculator.create_state()
+        for file_state in file_states:
+            state = calculator.merge(state, file_state)
+        return state
+
+    async def aggregate_file(
+        self, calculator: StatisticsCalculator, file_path: str
+    ) -> Any:
+        """
+        Асинхронно агрегирует данные одного файла.
+
+        :param calculator: Калькулятор статистик
+        :param file_path: Путь к CSV файлу
+
+        :return: Частичное состояние файла
+        """
+        async with self._semaphore:
+            debug_print("Обработка файла: %s", file_path)
+            loop = asyncio.get_running_loop()
+            if await loop.run_in_executor(None, is_snapshot, file_path):
+                return await loop.run_in_executor(
+                    self._executor, self._aggregate_snapshot, calculator, file_path
+                )
+
+            queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+            producer = asyncio.create_task(self._read_blocks(file_path, queue))
+            try:
+                return await loop.run_in_executor(
+                    self._executor,
+                    self._parse,
+                    calculator,
+                    _QueueStream(queue, loop),
+                    file_path,
+                )
+            finally:
+                producer.cancel()
+                # Разбор мог остаться в ожидании блока (отмена вызова)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(_ABORT)
+
+    async def _read_blocks(self, file_path: str, queue: asyncio.Queue) -> None:
+        """Читает файл блоками в очередь; ошибки передаются разбору."""
+        loop = asyncio.get_running_loop()
+        file: BinaryIO | None = None
+        try:
+            file = await loop.run_in_executor(None, open, file_path, "rb")
+            while True:
+                block = await loop.run_in_executor(None, file.read, self.block_size)
+                await queue.put(block)
+                if block == _EOF:
+                    break
+        except OSError as e:
+            await queue.put(e)
+        finally:
+            if file is not None:
+                file.close()
+
+    def _aggregate_snapshot(
+        self, calculator: StatisticsCalculator, file_path: str
+    ) -> Any:
+        """
+        Агрегирует снимок (core.snapshot): он отображается в память
+        и читается без разбора строк. Выполняется в пуле потоков.
+        """
+        state = calculator.create_state()
+        calculator.accumulate(state, self.reader.read_snapshot(file_path))
+        return state
+
+    def _parse(
+        self, calculator: StatisticsCalculator, stream: _QueueStream, file_path: str
+    ) -> Any:
+        """
+        Разбирает файл из потока блоков. Выполняется в пуле потоков.
+        Сжатый файл распаковывается здесь же, пока цикл событий читает
+        следующие блоки.
+        """
+        binary = io.BufferedReader(stream, self.block_size)
+        state = calculator.create_state()
+        calculator.accumulate(state, self.reader.iter_binary_stream(binary, file_path))
+        return state
@@ -0,0 +1,189 @@
+"""
+Кэш контрольных точек агрегации по файлам.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from typing import Any
+
+from core.debug import debug_print
+
+# Размер кэша по умолчанию, после превышения удаляются давно не читавшиеся записи
+DEFAULT_CACHE_SIZE = 256 * 1024 * 1024
+
+_MAGIC = b"BRAC"
+_VERSION = 3
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def file_digest(file_path: str) -> str:
+    """
+    Вычисляет хэш содержимого файла.
+
+    :param file_path: Путь к файлу
+
+    :return: Хэш BLAKE2b в шестнадцатеричном виде
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, "rb") as file:
+        while block := file.read(_HASH_BLOCK_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class CheckpointCache(ABC):
+    """Абстрактное хранилище записей по файлам с данными и ключам расчета."""
+
+    @abstractmethod
+    def load(self, file_path: str, key: str) -> Any | None:
+        """
+        Возвращает сохраненную запись файла.
+
+        :param file_path: Путь к файлу с данными
+        :param key: Ключ расчета (тип калькулятора и параметры чтения)
+
+        :return: Сохраненное значение или None, если записи нет
+        """
+
+    @abstractmethod
+    def store(self, file_path: str, key: str, value: Any) -> None:
+        """
+        Сохраняет запись файла.
+
+        :param file_path: Путь к файлу с данными
+        :param key: Ключ расчета
+        :param value: Сохраняемое значение (копируется сразу)
+        """
+
+
+class MemoryCache(CheckpointCache):
+    """
+    Кэш записей в памяти процесса для долгоживущих сервисов.
+
+    Значения хранятся сериализованными (pickle): вызывающий код может
+    изменять сохраненное состояние после store, а каждый load возвращает
+    независимую копию. Безопасен для использования из нескольких потоков.
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[tuple[str, str], bytes] = {}
+        self._lock = threading.Lock()
+
+    def load(self, file_path: str, key: str) -> Any | None:
+        with self._lock:
+            data = self._entries.get((os.path.abspath(file_path), key))
+        return None if data is None else pickle.loads(data)
+
+    def store(self, file_path: str, key: str, value: Any) -> None:
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._entries[(os.path.abspath(file_path), key)] = data
+
+    def clear(self) -> None:
+        """Удаляет все записи."""
+        with self._lock:
+            self._entries.clear()
+
+
+class AggregateCache(CheckpointCache):
+    """
+    Дисковый кэш контрольных точек агрегации по файлам с данными.
+
+    Записи хранятся в бинарном виде (pickle) по одной на файл и ключ
+    расчета. Проверка актуальности записи выполняется вызывающим кодом
+    (см. core.incremental). Общий размер кэша ограничен: при превышении
+    удаляются записи, которые дольше всего не читались (LRU по mtime
+    записи). Каталог кэша должен быть доступен только владельцу,
+    так как записи десериализуются.
+    """
+
+    def __init__(self, cache_dir: str, max_size: int = DEFAULT_CACHE_SIZE):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+
+    def load(self, file_path: str, key: str) -> Any | None:
+        entry_path = self._entry_path(file_path, key)
+
+        try:
+            entry = self._read_entry(entry_path)
+            if entry is None:
+                return None
+            os.utime(entry_path)  # Отмечаем запись как недавно использованную
+        except OSError:
+            return None
+
+        if entry.get("path") != os.path.abspath(file_path) or entry.get("key") != key:
+            return None
+        return entry["value"]
+
+    def store(self, file_path: str, key: str, value: Any) -> None:
+        entry = {"path": os.path.abspath(file_path), "key": key, "value": value}
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            self._write_entry(self._entry_path(file_path, key), entry)
+        except OSError as e:
+            debug_print("Кэш: не удалось сохранить запись: %s", e)
+            return
+
+        self._evict()
+
+    def _entry_path(self, file_path: str, key: str) -> str:
+        name = hashlib.sha256(
+            ("%s\0%s" % (os.path.abspath(file_path), key)).encode("utf-8")
+        ).hexdigest()
+        return os.path.join(self.cache_dir, name[:32] + ".cache")
+
+    @staticmethod
+    def _read_entry(entry_path: str) -> dict[str, Any] | None:
+        with open(entry_path, "rb") as file:
+            data = file.read()
+
+        if data[:4] != _MAGIC or data[4:5] != bytes([_VERSION]):
+            return None
+
+        try:
+            entry = pickle.loads(data[5:])
+        except Exception as e:
+            debug_print("Кэш: поврежденная запись %s: %s", entry_path, e)
+            return None
+
+        return entry if isinstance(entry, dict) else None
+
+    def _write_entry(self, entry_path: str, entry: dict[str, Any]) -> None:
+        # Запись через временный файл, чтобы не оставить недописанную запись
+        fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(_MAGIC + bytes([_VERSION]))
+                pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, entry_path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+    def _evict(self) -> None:
+        """Удаляет давно не использованные записи сверх max_size."""
+        entries = []
+        total_size = 0
+
+        with os.scandir(self.cache_dir) as scan:
+            for item in scan:
+                if not item.name.endswith(".cache"):
+                    continue
+                stat = item.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, item.path))
+                total_size += stat.st_size
+
+        for _, size, path in sorted(entries):
+            if total_size <= self.max_size:
+                break
+            debug_print("Кэш: удаление записи %s", path)
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total_size -= size
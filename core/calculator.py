@@ -2,51 +2,260 @@
 Модуль для вычисления статистик по брендам.
 """
 
+import heapq
+import importlib
 from abc import ABC, abstractmethod
-from collections import defaultdict
+from bisect import bisect_right
+from collections.abc import Callable, Hashable, Iterable, Mapping, Sequence
+from itertools import islice, pairwise
+from math import inf
+from operator import itemgetter
+from typing import Any, TypeVar
 
-from core.models import BrandStatistics, Product
+from core.accumulators import ACCUMULATORS, Accumulator, create_accumulator
+from core.debug import debug_print, error_print
+from core.models import PRODUCT_COLUMNS, BrandStatistics, Product, ProductTable
+from core.options import (
+    DEFAULT_ACCUMULATOR,
+    DEFAULT_ENGINE,
+    ENGINE_MODULES,
+    get_available_engines,
+)
+from core.sketches import HyperLogLog, KLLSketch
+
+T = TypeVar("T")
 
 
 class StatisticsCalculator(ABC):
-    """Абстрактный базовый класс для расчета статистик."""
+    """
+    Абстрактный базовый класс для расчета статистик.
+
+    Расчет выполняется потоково: продукты по одному добавляются в частичное
+    состояние калькулятора (аккумуляторы по брендам), из которого затем
+    строится итоговая статистика. Память зависит от числа брендов,
+    а не от числа строк.
+
+    Частичные состояния должны объединяться через merge() и сериализоваться
+    через pickle: так их можно считать в разных процессах и сливать
+    в родительском.
+
+    required_columns - колонки CSV, которые нужны калькулятору: остальные
+    поля продукта не читаются и не проверяются (name = "", price = nan).
+
+    top и min_products ограничивают только итоговую статистику (finalize):
+    частичные состояния от них не зависят. accumulator - реализация сумм
+    рейтингов и цен (core.accumulators): от нее зависит вид частичного
+    состояния. Значения добавляются в аккумуляторы блоками: продукты
+    читаются по BATCH_SIZE и группируются по брендам.
+    """
+
+    required_columns: tuple[str, ...] = PRODUCT_COLUMNS
+
+    # Количество продуктов, значения которых группируются за раз
+    BATCH_SIZE = 4096
+
+    def __init__(
+        self,
+        top: int | None = None,
+        min_products: int = 1,
+        accumulator: str = DEFAULT_ACCUMULATOR,
+    ) -> None:
+        """
+        :param top: Сколько первых брендов оставить в результате (None - все)
+        :param min_products: Минимальное количество продуктов бренда в результате
+        :param accumulator: Аккумулятор сумм рейтингов (см. ACCUMULATORS)
+
+        :raise ValueError: Если аккумулятор неизвестен
+        """
+        if accumulator not in ACCUMULATORS:
+            raise ValueError("Unknown accumulator: %s" % accumulator)
+        self.top = top
+        self.min_products = min_products
+        self.accumulator = accumulator
+
+    def calculate(self, products: Iterable[Product]) -> list[BrandStatistics]:
+        """
+        Вычисляет статистику за один проход по продуктам.
+
+        :param products: Продукты (список или генератор)
+
+        :return: Список статистик по брендам
+        """
+        state = self.create_state()
+        self.accumulate(state, products)
+        return self.finalize(state)
 
     @abstractmethod
-    def calculate(self, products: list[Product]) -> list[BrandStatistics]:
+    def create_state(self) -> Any:
+        """Создает пустое частичное состояние расчета."""
         pass
 
+    @abstractmethod
+    def accumulate(self, state: Any, products: Iterable[Product]) -> None:
+        """Добавляет продукты в частичное состояние."""
+        pass
+
+    @abstractmethod
+    def merge(self, state: Any, other: Any) -> Any:
+        """
+        Объединяет два частичных состояния.
+
+        :param state: Состояние, в которое выполняется слияние
+        :param other: Присоединяемое состояние
+
+        :return: Объединенное состояние
+        """
+        pass
+
+    @abstractmethod
+    def finalize(self, state: Any) -> list[BrandStatistics]:
+        """Строит итоговую статистику из частичного состояния."""
+        pass
+
+    @property
+    def state_key(self) -> Hashable | None:
+        """
+        Вид частичного состояния. Калькуляторы с одинаковым ключом (не None)
+        создают, заполняют и объединяют состояние одинаково и отличаются
+        только finalize, который состояние не изменяет: CompositeCalculator
+        заполняет для них одно общее состояние. None - состояние свое.
+        """
+        return None
+
+    def _select(self, rows: Iterable[T], key: Callable[[T], Any]) -> list[T]:
+        """
+        Упорядочивает строки по убыванию key и оставляет первые top.
+
+        При заданном top выполняется частичный отбор кучей (heapq.nlargest,
+        O(n log top)) вместо сортировки всех строк. Порядок строк с равными
+        ключами такой же, как при сортировке.
+
+        :param rows: Строки результата (обычно кортежи до создания DTO)
+        :param key: Ключ упорядочивания
+
+        :return: Выбранные строки по убыванию key
+        """
+        if self.top is None:
+            return sorted(rows, key=key, reverse=True)
+        return heapq.nlargest(self.top, rows, key=key)
+
 
 class CalculatorFactory:
     """Фабрика для создания калькулятора статистик."""
 
     _calculators: dict[str, type[StatisticsCalculator]] = {}
+    _engine_calculators: dict[tuple[str, str], type[StatisticsCalculator]] = {}
 
     @classmethod
-    def create(cls, calculator_type: str) -> StatisticsCalculator:
+    def create(
+        cls,
+        calculator_type: str,
+        engine: str = DEFAULT_ENGINE,
+        top: int | None = None,
+        min_products: int = 1,
+        accumulator: str = DEFAULT_ACCUMULATOR,
+    ) -> StatisticsCalculator:
         """
         Создает калькулятор указанного типа.
 
+        Если для движка нет реализации калькулятора или движок недоступен
+        (не установлена библиотека), используется движок по умолчанию.
+
         :param calculator_type: Тип калькулятора
+        :param engine: Движок расчета
+        :param top: Сколько первых брендов оставить в результате (None - все)
+        :param min_products: Минимальное количество продуктов бренда в результате
+        :param accumulator: Аккумулятор сумм рейтингов (см. ACCUMULATORS)
 
         :return: Объект калькулятора
 
-        :raise ValueError: Если тип калькулятора неизвестен
+        :raise ValueError: Если тип калькулятора или движок неизвестен
         """
         if calculator_type not in cls._calculators:
             raise ValueError("Unknown calculator type: %s" % calculator_type)
-        return cls._calculators[calculator_type]()
+
+        if engine != DEFAULT_ENGINE and cls._load_engine(engine):
+            engine_class = cls._engine_calculators.get((calculator_type, engine))
+            if engine_class is not None:
+                return engine_class(
+                    top=top, min_products=min_products, accumulator=accumulator
+                )
+            debug_print(
+                "Движок %s не поддерживает %s, используется %s",
+                engine,
+                calculator_type,
+                DEFAULT_ENGINE,
+            )
+
+        return cls._calculators[calculator_type](
+            top=top, min_products=min_products, accumulator=accumulator
+        )
 
     @classmethod
     def register(
-        cls, calculator_type: str, calculator_class: type[StatisticsCalculator]
+        cls,
+        calculator_type: str,
+        calculator_class: type[StatisticsCalculator],
+        engine: str = DEFAULT_ENGINE,
     ) -> None:
         """
         Регистрирует новый тип калькулятора.
 
         :param calculator_type: Идентификатор калькулятора
         :param calculator_class: Класс калькулятора
+        :param engine: Движок, для которого регистрируется реализация
         """
-        cls._calculators[calculator_type] = calculator_class
+        if engine == DEFAULT_ENGINE:
+            cls._calculators[calculator_type] = calculator_class
+        else:
+            cls._engine_calculators[(calculator_type, engine)] = calculator_class
+
+    @classmethod
+    def get_required_columns(cls, calculator_type: str) -> tuple[str, ...]:
+        """
+        Возвращает колонки CSV, которые нужны калькулятору.
+
+        :param calculator_type: Тип калькулятора
+
+        :return: Названия колонок
+
+        :raise ValueError: Если тип калькулятора неизвестен
+        """
+        if calculator_type not in cls._calculators:
+            raise ValueError("Unknown calculator type: %s" % calculator_type)
+        return cls._calculators[calculator_type].required_columns
+
+    @staticmethod
+    def get_available_engines() -> list[str]:
+        """Возвращает список движков расчета."""
+        return get_available_engines()
+
+    @staticmethod
+    def _load_engine(engine: str) -> bool:
+        """
+        Импортирует модуль движка, регистрирующий его калькуляторы.
+
+        :param engine: Движок расчета
+
+        :return: True, если движок доступен
+
+        :raise ValueError: Если движок неизвестен
+        """
+        if engine not in ENGINE_MODULES:
+            raise ValueError("Unknown engine: %s" % engine)
+
+        try:
+            importlib.import_module(ENGINE_MODULES[engine])
+        except ImportError as e:
+            error_print(
+                "Предупреждение: движок %s недоступен (%s), используется %s",
+                engine,
+                e,
+                DEFAULT_ENGINE,
+            )
+            return False
+
+        return True
 
     @classmethod
     def get_available_calculators(cls) -> list[str]:
@@ -54,15 +263,18 @@ class CalculatorFactory:
         return list(cls._calculators.keys())
 
 
-def register_calculator(calculator_type: str):  # type: ignore
+def register_calculator(  # type: ignore
+    calculator_type: str, engine: str = DEFAULT_ENGINE
+):
     """
     Декоратор для автоматической регистрации калькуляторов в фабрике.
 
     :param calculator_type: Тип калькулятора для регистрации
+    :param engine: Движок, для которого регистрируется реализация
     """
 
     def decorator(cls: type[StatisticsCalculator]):  # type: ignore
-        CalculatorFactory.register(calculator_type, cls)
+        CalculatorFactory.register(calculator_type, cls, engine)
         return cls
 
     return decorator
@@ -70,39 +282,609 @@ def register_calculator(calculator_type: str):  # type: ignore
 
 @register_calculator("average-rating")
 class BrandRatingCalculator(StatisticsCalculator):
-    """Калькулятор средних рейтингов по брендам."""
+    """
+    Калькулятор средних рейтингов по брендам.
+
+    Рейтинги бренда складываются аккумулятором (core.accumulators):
+    продукты читаются блоками по BATCH_SIZE, рейтинги блока группируются
+    по брендам и добавляются в аккумулятор бренда одним вызовом. С точным
+    аккумулятором fsum результат не зависит от порядка файлов и количества
+    процессов.
+    """
 
-    def calculate(self, products: list[Product]) -> list[BrandStatistics]:
-        if not products:
-            return []
+    required_columns = ("brand", "rating")
 
-        brand_stats = self._aggregate_brand_data(products)
-        return self._create_brand_statistics(brand_stats)
+    def create_state(self) -> dict[str, Accumulator]:
+        return {}
 
-    @staticmethod
-    def _aggregate_brand_data(products: list[Product]) -> dict[str, dict]:
-        brand_stats: dict[str, dict] = defaultdict(
-            lambda: {"total_rating": 0, "count": 0}
+    def accumulate(
+        self, state: dict[str, Accumulator], products: Iterable[Product]
+    ) -> None:
+        if isinstance(products, ProductTable):
+            self._aggregate_table(products, state)
+            return
+
+        iterator = iter(products)
+        while batch := list(islice(iterator, self.BATCH_SIZE)):
+            groups: dict[str, list[float]] = {}
+            for product in batch:
+                ratings = groups.get(product.brand)
+                if ratings is None:
+                    ratings = groups[product.brand] = []
+                ratings.append(product.rating)
+            self._add_groups(state, groups)
+
+    def merge(
+        self, state: dict[str, Accumulator], other: dict[str, Accumulator]
+    ) -> dict[str, Accumulator]:
+        for brand, other_ratings in other.items():
+            ratings = state.get(brand)
+            if ratings is None:
+                state[brand] = other_ratings.copy()
+            else:
+                ratings.merge(other_ratings)
+        return state
+
+    def finalize(self, state: dict[str, Accumulator]) -> list[BrandStatistics]:
+        return self._create_brand_statistics(state)
+
+    def _add_groups(
+        self, state: dict[str, Accumulator], groups: Mapping[str, Sequence[float]]
+    ) -> None:
+        """
+        Добавляет в состояние сгруппированные по брендам рейтинги.
+
+        :param state: Частичное состояние
+        :param groups: Рейтинги по брендам
+        """
+        for brand, values in groups.items():
+            ratings = state.get(brand)
+            if ratings is None:
+                ratings = state[brand] = create_accumulator(self.accumulator)
+            ratings.add_many(values)
+
+    def _aggregate_table(
+        self, table: ProductTable, state: dict[str, Accumulator]
+    ) -> None:
+        """
+        Агрегирует колонки таблицы, не создавая объекты на каждую строку.
+        Рейтинги бренда добавляются в том же порядке строк, что и при обходе
+        продуктов.
+        """
+        groups: list[list[float]] = [[] for _ in table.brands]
+        for code, rating in zip(table.brand_codes, table.ratings, strict=True):
+            groups[code].append(rating)
+
+        self._add_groups(
+            state,
+            {
+                brand: values
+                for brand, values in zip(table.brands, groups, strict=True)
+                if values
+            },
         )
 
-        for product in products:
-            brand_stats[product.brand]["total_rating"] += product.rating
-            brand_stats[product.brand]["count"] += 1
+    def _create_brand_statistics(
+        self, state: dict[str, Accumulator]
+    ) -> list[BrandStatistics]:
+        # Бренды фильтруются и упорядочиваются в виде кортежей: при top
+        # объекты статистики создаются только для выбранных брендов.
+        # Средние округляются до упорядочивания, как в BrandStatistics.
+        rows = (
+            (round(ratings.mean, 2), brand, ratings.count)
+            for brand, ratings in state.items()
+            if ratings.count >= self.min_products
+        )
+
+        return [
+            BrandStatistics(brand=brand, average_rating=rating, product_count=count)
+            for rating, brand, count in self._select(rows, key=itemgetter(0))
+        ]
+
+
+@register_calculator("rating-percentiles")
+class RatingPercentilesCalculator(StatisticsCalculator):
+    """
+    Калькулятор медианы и 90-го перцентиля рейтингов по брендам.
+
+    Рейтинги бренда накапливаются в KLLSketch фиксированного размера:
+    память не зависит от числа продуктов, а состояния из разных процессов
+    и из кэша объединяются через merge скетчей. Перцентили приближенные
+    (ошибка ранга около 1%), пока у бренда меньше k продуктов - точные.
+    Средний рейтинг считается аккумулятором, как в BrandRatingCalculator.
+    """
+
+    required_columns = ("brand", "rating")
+
+    def create_state(self) -> dict[str, dict]:
+        return {}
 
-        return brand_stats
+    def accumulate(self, state: dict[str, dict], products: Iterable[Product]) -> None:
+        iterator = iter(products)
+        while batch := list(islice(iterator, self.BATCH_SIZE)):
+            groups: dict[str, list[float]] = {}
+            for product in batch:
+                ratings = groups.get(product.brand)
+                if ratings is None:
+                    ratings = groups[product.brand] = []
+                ratings.append(product.rating)
+
+            for brand, values in groups.items():
+                stats = state.get(brand)
+                if stats is None:
+                    stats = state[brand] = {
+                        "total_rating": create_accumulator(self.accumulator),
+                        "ratings": KLLSketch(),
+                    }
+                stats["total_rating"].add_many(values)
+                stats["ratings"].update(values)
+
+    def merge(self, state: dict[str, dict], other: dict[str, dict]) -> dict[str, dict]:
+        for brand, other_stats in other.items():
+            stats = state.get(brand)
+            if stats is None:
+                ratings = other_stats["ratings"]
+                state[brand] = {
+                    "total_rating": other_stats["total_rating"].copy(),
+                    "ratings": KLLSketch(ratings.k).merge(ratings),
+                }
+                continue
+            stats["total_rating"].merge(other_stats["total_rating"])
+            stats["ratings"].merge(other_stats["ratings"])
+        return state
+
+    def finalize(self, state: dict[str, dict]) -> list[BrandStatistics]:
+        rows = [
+            (
+                round(stats["ratings"].quantile(0.5), 2),
+                round(stats["total_rating"].mean, 2),
+                brand,
+                stats["ratings"],
+            )
+            for brand, stats in state.items()
+            if stats["ratings"].count >= self.min_products
+        ]
+
+        # 90-й перцентиль считается только для выбранных брендов
+        return [
+            BrandStatistics(
+                brand=brand,
+                average_rating=rating,
+                product_count=ratings.count,
+                median_rating=median,
+                p90_rating=ratings.quantile(0.9),
+            )
+            for median, rating, brand, ratings in self._select(
+                rows, key=itemgetter(0, 1)
+            )
+        ]
+
+
+@register_calculator("distinct-products")
+class DistinctProductsCalculator(StatisticsCalculator):
+    """
+    Калькулятор количества уникальных названий продуктов по брендам.
+
+    Названия бренда учитываются в HyperLogLog фиксированного размера
+    (4 КБ на бренд) вместо множества всех названий; оценка приближенная
+    (стандартная ошибка около 1.6%), для небольших наборов - практически
+    точная. Скетчи из разных процессов и из кэша объединяются через merge.
+    Средний рейтинг считается аккумулятором, как в BrandRatingCalculator.
+    """
+
+    required_columns = ("name", "brand", "rating")
+
+    def create_state(self) -> dict[str, dict]:
+        return {}
+
+    def accumulate(self, state: dict[str, dict], products: Iterable[Product]) -> None:
+        iterator = iter(products)
+        while batch := list(islice(iterator, self.BATCH_SIZE)):
+            groups: dict[str, tuple[list[float], list[str]]] = {}
+            for product in batch:
+                group = groups.get(product.brand)
+                if group is None:
+                    group = groups[product.brand] = ([], [])
+                group[0].append(product.rating)
+                group[1].append(product.name)
+
+            for brand, (ratings, names) in groups.items():
+                stats = state.get(brand)
+                if stats is None:
+                    stats = state[brand] = {
+                        "total_rating": create_accumulator(self.accumulator),
+                        "names": HyperLogLog(),
+                    }
+                stats["total_rating"].add_many(ratings)
+                stats["names"].update(names)
+
+    def merge(self, state: dict[str, dict], other: dict[str, dict]) -> dict[str, dict]:
+        for brand, other_stats in other.items():
+            stats = state.get(brand)
+            if stats is None:
+                names = other_stats["names"]
+                state[brand] = {
+                    "total_rating": other_stats["total_rating"].copy(),
+                    "names": HyperLogLog(names.precision).merge(names),
+                }
+                continue
+            stats["total_rating"].merge(other_stats["total_rating"])
+            stats["names"].merge(other_stats["names"])
+        return state
+
+    def finalize(self, state: dict[str, dict]) -> list[BrandStatistics]:
+        rows = (
+            (
+                # Оценка не может превышать число продуктов
+                min(stats["names"].count(), stats["total_rating"].count),
+                stats["total_rating"].count,
+                brand,
+                stats["total_rating"],
+            )
+            for brand, stats in state.items()
+            if stats["total_rating"].count >= self.min_products
+        )
+
+        return [
+            BrandStatistics(
+                brand=brand,
+                average_rating=ratings.mean,
+                product_count=count,
+                distinct_products=distinct,
+            )
+            for distinct, count, brand, ratings in self._select(
+                rows, key=itemgetter(0, 1)
+            )
+        ]
+
+
+# Границы ценовых диапазонов по умолчанию: < 200, 200 - 500, 500 - 1000, >= 1000
+DEFAULT_PRICE_BOUNDS = (200.0, 500.0, 1000.0)
+
+
+class PriceStatisticsCalculator(StatisticsCalculator):
+    """
+    Базовый класс калькуляторов статистик по ценам.
+
+    Все калькуляторы по ценам заполняют одно состояние: для каждой пары
+    (бренд, индекс ценового диапазона) - список [количество, сумма
+    рейтингов, сумма цен, сумма цена * рейтинг, минимальная цена,
+    максимальная цена]; суммы - аккумуляторы (core.accumulators).
+    Диапазон цены находится двоичным поиском (bisect)
+    по заранее заданным границам. Статистики бренда получаются суммированием
+    аккумуляторов его диапазонов, поэтому отчеты по ценам вместе считаются
+    за один проход (см. state_key и CompositeCalculator).
+
+    Пар (бренд, диапазон) в несколько раз больше, чем брендов, поэтому
+    блоки крупнее: иначе на каждый аккумулятор приходится по нескольку
+    значений и точное сложение (fsum) становится заметно медленнее.
+    """
+
+    BATCH_SIZE = 65536
+
+    required_columns = ("brand", "price", "rating")
+
+    def __init__(
+        self,
+        top: int | None = None,
+        min_products: int = 1,
+        price_bounds: Iterable[float] = DEFAULT_PRICE_BOUNDS,
+        accumulator: str = DEFAULT_ACCUMULATOR,
+    ) -> None:
+        """
+        :param top: Сколько первых брендов оставить в результате (None - все)
+        :param min_products: Минимальное количество продуктов бренда в результате
+        :param price_bounds: Возрастающие границы ценовых диапазонов
+        :param accumulator: Аккумулятор сумм рейтингов и цен (см. ACCUMULATORS)
+
+        :raise ValueError: Если границы не возрастают
+        """
+        super().__init__(top, min_products, accumulator)
+        bounds = tuple(float(bound) for bound in price_bounds)
+        if any(low >= high for low, high in pairwise(bounds)):
+            raise ValueError("Price bounds must be increasing: %s" % (bounds,))
+        self.price_bounds = bounds
+        self.band_labels = _price_band_labels(bounds)
+
+    @property
+    def state_key(self) -> Hashable:
+        return ("price", self.price_bounds, self.accumulator)
+
+    def create_state(self) -> dict[tuple[str, int], list]:
+        return {}
+
+    def accumulate(
+        self, state: dict[tuple[str, int], list], products: Iterable[Product]
+    ) -> None:
+        bounds = self.price_bounds
+        iterator = iter(products)
+        while batch := list(islice(iterator, self.BATCH_SIZE)):
+            # Рейтинги и цены блока по парам (бренд, диапазон)
+            groups: dict[tuple[str, int], tuple[list[float], list[float]]] = {}
+            for product in batch:
+                price = product.price
+                key = (product.brand, bisect_right(bounds, price))
+                group = groups.get(key)
+                if group is None:
+                    group = groups[key] = ([], [])
+                group[0].append(product.rating)
+                group[1].append(price)
+
+            for key, (ratings, prices) in groups.items():
+                stats = state.get(key)
+                if stats is None:
+                    stats = state[key] = [
+                        0,
+                        create_accumulator(self.accumulator),
+                        create_accumulator(self.accumulator),
+                        create_accumulator(self.accumulator),
+                        inf,
+                        -inf,
+                    ]
+                stats[0] += len(ratings)
+                stats[1].add_many(ratings)
+                stats[2].add_many(prices)
+                stats[3].add_many(
+                    [
+                        price * rating
+                        for price, rating in zip(prices, ratings, strict=True)
+                    ]
+                )
+                stats[4] = min(stats[4], min(prices))
+                stats[5] = max(stats[5], max(prices))
+
+    def merge(
+        self,
+        state: dict[tuple[str, int], list],
+        other: dict[tuple[str, int], list],
+    ) -> dict[tuple[str, int], list]:
+        for key, other_stats in other.items():
+            stats = state.get(key)
+            if stats is None:
+                state[key] = _copy_price_stats(other_stats)
+            else:
+                _add_price_stats(stats, other_stats)
+        return state
 
     @staticmethod
-    def _create_brand_statistics(brand_stats: dict) -> list[BrandStatistics]:
-        statistics = []
-
-        for brand, stats in brand_stats.items():
-            avg_rating = stats["total_rating"] / stats["count"]
-            statistics.append(
-                BrandStatistics(
-                    brand=brand,
-                    average_rating=avg_rating,
-                    product_count=stats["count"],
+    def _brand_totals(state: dict[tuple[str, int], list]) -> dict[str, list]:
+        """Объединяет аккумуляторы диапазонов каждого бренда."""
+        totals: dict[str, list] = {}
+        for (brand, _), stats in state.items():
+            brand_stats = totals.get(brand)
+            if brand_stats is None:
+                totals[brand] = _copy_price_stats(stats)
+            else:
+                _add_price_stats(brand_stats, stats)
+        return totals
+
+
+@register_calculator("price-bands")
+class PriceBandsCalculator(PriceStatisticsCalculator):
+    """
+    Калькулятор средних рейтингов брендов по ценовым диапазонам.
+
+    Бренды упорядочиваются по среднему рейтингу (top и min_products
+    относятся к брендам), диапазоны бренда - по возрастанию цены.
+    """
+
+    def finalize(self, state: dict[tuple[str, int], list]) -> list[BrandStatistics]:
+        bands: dict[str, list[int]] = {}
+        for brand, band in state:
+            bands.setdefault(brand, []).append(band)
+
+        rows = (
+            (round(stats[1].mean, 2), brand)
+            for brand, stats in self._brand_totals(state).items()
+            if stats[0] >= self.min_products
+        )
+
+        result = []
+        for _, brand in self._select(rows, key=itemgetter(0)):
+            for band in sorted(bands[brand]):
+                stats = state[(brand, band)]
+                result.append(
+                    BrandStatistics(
+                        brand=brand,
+                        average_rating=stats[1].mean,
+                        product_count=stats[0],
+                        price_band=self.band_labels[band],
+                        min_price=stats[4],
+                        max_price=stats[5],
+                        average_price=stats[2].mean,
+                    )
                 )
+        return result
+
+
+@register_calculator("price-weighted-rating")
+class PriceWeightedRatingCalculator(PriceStatisticsCalculator):
+    """
+    Калькулятор среднего рейтинга брендов, взвешенного по цене продуктов:
+    сумма цена * рейтинг / сумма цен (при нулевой сумме цен - обычное среднее).
+    """
+
+    def finalize(self, state: dict[tuple[str, int], list]) -> list[BrandStatistics]:
+        rows = (
+            (
+                round(
+                    (
+                        stats[3].total / stats[2].total
+                        if stats[2].total
+                        else stats[1].mean
+                    ),
+                    2,
+                ),
+                brand,
+                stats,
+            )
+            for brand, stats in self._brand_totals(state).items()
+            if stats[0] >= self.min_products
+        )
+
+        return [
+            BrandStatistics(
+                brand=brand,
+                average_rating=stats[1].mean,
+                product_count=stats[0],
+                weighted_rating=weighted,
+            )
+            for weighted, brand, stats in self._select(rows, key=itemgetter(0))
+        ]
+
+
+@register_calculator("price-range")
+class PriceRangeCalculator(PriceStatisticsCalculator):
+    """Калькулятор минимальной, максимальной и средней цены брендов."""
+
+    def finalize(self, state: dict[tuple[str, int], list]) -> list[BrandStatistics]:
+        rows = (
+            (round(stats[2].mean, 2), brand, stats)
+            for brand, stats in self._brand_totals(state).items()
+            if stats[0] >= self.min_products
+        )
+
+        return [
+            BrandStatistics(
+                brand=brand,
+                average_rating=stats[1].mean,
+                product_count=stats[0],
+                min_price=stats[4],
+                max_price=stats[5],
+                average_price=average_price,
+            )
+            for average_price, brand, stats in self._select(rows, key=itemgetter(0))
+        ]
+
+
+def _add_price_stats(stats: list, other: list) -> None:
+    """Добавляет статистику цен other к stats."""
+    stats[0] += other[0]
+    stats[1].merge(other[1])
+    stats[2].merge(other[2])
+    stats[3].merge(other[3])
+    stats[4] = min(stats[4], other[4])
+    stats[5] = max(stats[5], other[5])
+
+
+def _copy_price_stats(stats: list) -> list:
+    """Возвращает независимую копию статистики цен."""
+    return [
+        stats[0],
+        stats[1].copy(),
+        stats[2].copy(),
+        stats[3].copy(),
+        stats[4],
+        stats[5],
+    ]
+
+
+def _price_band_labels(bounds: tuple[float, ...]) -> list[str]:
+    """Возвращает названия диапазонов: индекс bisect_right -> название."""
+    if not bounds:
+        return ["all"]
+    return [
+        "< %g" % bounds[0],
+        *("%g - %g" % pair for pair in pairwise(bounds)),
+        ">= %g" % bounds[-1],
+    ]
+
+
+class CompositeCalculator(StatisticsCalculator):
+    """
+    Несколько калькуляторов за один проход по продуктам.
+
+    Продукты читаются один раз: каждый блок из BATCH_SIZE продуктов
+    передается всем калькуляторам, поэтому N отчетов стоят одного чтения
+    файлов. Состояние - кортеж состояний калькуляторов: оно объединяется
+    и сериализуется так же, как они, и работает с параллельной обработкой
+    и кэшем. Калькуляторы с одинаковым state_key (например, отчеты по
+    ценам) заполняют одно общее состояние.
+
+    Статистики строятся для каждого калькулятора отдельно (finalize_each).
+    """
+
+    # Количество продуктов, передаваемых калькуляторам за раз
+    BATCH_SIZE = 1024
+
+    def __init__(self, calculators: Iterable[StatisticsCalculator]) -> None:
+        """
+        :param calculators: Калькуляторы отчетов (хотя бы один)
+
+        :raise ValueError: Если калькуляторы не переданы
+        """
+        super().__init__()
+        self.calculators = tuple(calculators)
+        if not self.calculators:
+            raise ValueError("No calculators to combine")
+
+        # Калькулятор, заполняющий каждое состояние, и номер состояния
+        # каждого калькулятора
+        self._fillers: list[StatisticsCalculator] = []
+        self._state_indexes: list[int] = []
+        shared: dict[Hashable, int] = {}
+        for calculator in self.calculators:
+            key = calculator.state_key
+            index = shared.get(key) if key is not None else None
+            if index is None:
+                index = len(self._fillers)
+                self._fillers.append(calculator)
+                if key is not None:
+                    shared[key] = index
+            self._state_indexes.append(index)
+
+        required = {
+            column
+            for calculator in self.calculators
+            for column in calculator.required_columns
+        }
+        self.required_columns = tuple(
+            column for column in PRODUCT_COLUMNS if column in required
+        )
+
+    def create_state(self) -> tuple[Any, ...]:
+        return tuple(calculator.create_state() for calculator in self._fillers)
+
+    def accumulate(self, state: tuple[Any, ...], products: Iterable[Product]) -> None:
+        pairs = list(zip(self._fillers, state, strict=True))
+        if isinstance(products, ProductTable):
+            # Таблицу можно обойти несколько раз: калькуляторы читают колонки
+            for calculator, calculator_state in pairs:
+                calculator.accumulate(calculator_state, products)
+            return
+
+        iterator = iter(products)
+        while batch := list(islice(iterator, self.BATCH_SIZE)):
+            for calculator, calculator_state in pairs:
+                calculator.accumulate(calculator_state, batch)
+
+    def merge(self, state: tuple[Any, ...], other: tuple[Any, ...]) -> tuple[Any, ...]:
+        return tuple(
+            calculator.merge(calculator_state, other_state)
+            for calculator, calculator_state, other_state in zip(
+                self._fillers, state, other, strict=True
             )
+        )
+
+    def finalize(self, state: tuple[Any, ...]) -> list[BrandStatistics]:
+        """
+        Не поддерживается: у каждого калькулятора своя статистика.
+
+        :raise TypeError: Всегда (используйте finalize_each)
+        """
+        raise TypeError("CompositeCalculator has no single result, use finalize_each")
+
+    def finalize_each(self, state: tuple[Any, ...]) -> list[list[BrandStatistics]]:
+        """
+        Строит итоговые статистики всех калькуляторов.
 
-        return sorted(statistics, key=lambda x: x.average_rating, reverse=True)
+        :param state: Частичное состояние
+
+        :return: Статистики в порядке калькуляторов
+        """
+        return [
+            calculator.finalize(state[index])
+            for calculator, index in zip(
+                self.calculators, self._state_indexes, strict=True
+            )
+        ]
@@ -1,14 +1,70 @@
 """
 Модуль для управления debug-выводом.
+
+Сообщения пишутся через logging (логгер LOGGER_NAME): debug-сообщения -
+в стандартный вывод, только если включен debug-режим, ошибки - всегда
+в стандартный поток ошибок. Аргументы сообщений форматируются лениво,
+как в logging: debug_print("Файл %s", path) при выключенном debug-режиме
+не собирает строку, поэтому вызовы можно оставлять на горячих путях.
 """
 
+import logging
 import sys
 from typing import Any
 
-# Глобальная переменная для режима отладки
+LOGGER_NAME = "brand_rating"
+
+# Сколько повторяющихся сообщений одного вида выводить (см. sampled_debug_print)
+DEFAULT_SAMPLE_LIMIT = 10
+
+_logger = logging.getLogger(LOGGER_NAME)
+_logger.propagate = False
+
+# Глобальная переменная для режима отладки (дублирует уровень логгера,
+# чтобы проверка на горячих путях была одним чтением переменной)
 _DEBUG = False
 
 
+class _StreamHandler(logging.Handler):
+    """
+    Пишет сообщения в sys.stdout или sys.stderr, получая поток при каждой
+    записи: потоки могут быть заменены после настройки (например, в тестах).
+    """
+
+    def __init__(self, stream_name: str, level: int = logging.NOTSET) -> None:
+        super().__init__(level)
+        self.stream_name = stream_name
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            stream = getattr(sys, self.stream_name)
+            stream.write(self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
+
+
+class _MaxLevelFilter(logging.Filter):
+    """Пропускает записи ниже уровня level."""
+
+    def __init__(self, level: int) -> None:
+        super().__init__()
+        self.level = level
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.levelno < self.level
+
+
+def _configure() -> None:
+    stdout = _StreamHandler("stdout")
+    stdout.addFilter(_MaxLevelFilter(logging.ERROR))
+    _logger.addHandler(stdout)
+    _logger.addHandler(_StreamHandler("stderr", logging.ERROR))
+    _logger.setLevel(logging.ERROR)
+
+
+_configure()
+
+
 def set_debug_mode(debug: bool) -> None:
     """
     Включает или выключает debug-режим.
@@ -17,24 +73,58 @@ def set_debug_mode(debug: bool) -> None:
     """
     global _DEBUG
     _DEBUG = debug
+    _logger.setLevel(logging.DEBUG if debug else logging.ERROR)
+
+
+def is_debug_enabled() -> bool:
+    """Возвращает True, если включен debug-режим."""
+    return _DEBUG
+
 
+def get_logger() -> logging.Logger:
+    """Возвращает логгер приложения (например, для своих обработчиков)."""
+    return _logger
 
-def debug_print(*args: Any, **kwargs: Any) -> None:
+
+def debug_print(message: str, *args: Any) -> None:
     """
     Выводит сообщение только, если включен debug-режим.
 
-    :param args: Аргументы для print
-    :param kwargs: Ключевые аргументы для print
+    :param message: Сообщение с %-подстановками
+    :param args: Аргументы подстановок (форматируются только при выводе)
     """
     if _DEBUG:
-        print(*args, **kwargs)
+        _logger.debug(message, *args)
+
+
+def sampled_debug_print(count: int, kind: str, message: str, *args: Any) -> None:
+    """
+    Выводит повторяющееся сообщение (например, о пропуске строки по одной
+    причине) только для первых DEFAULT_SAMPLE_LIMIT повторов, затем
+    один раз сообщает, что остальные сообщения этого вида скрыты.
+
+    :param count: Номер повтора сообщения, начиная с 1 (считает вызывающий)
+    :param kind: Вид сообщения для уведомления о скрытых
+    :param message: Сообщение с %-подстановками
+    :param args: Аргументы подстановок
+    """
+    if not _DEBUG or count > DEFAULT_SAMPLE_LIMIT + 1:
+        return
+    if count <= DEFAULT_SAMPLE_LIMIT:
+        _logger.debug(message, *args)
+    else:
+        _logger.debug(
+            "Дальнейшие сообщения вида %s скрыты (выводятся первые %d)",
+            kind,
+            DEFAULT_SAMPLE_LIMIT,
+        )
 
 
-def error_print(*args: Any, **kwargs: Any) -> None:
+def error_print(message: str, *args: Any) -> None:
     """
     Выводит сообщение об ошибке (всегда, независимо от debug-режима).
 
-    :param args: Аргументы для print
-    :param kwargs: Ключевые аргументы для print
+    :param message: Сообщение с %-подстановками
+    :param args: Аргументы подстановок
     """
-    print(*args, **kwargs, file=sys.stderr)
+    _logger.error(message, *args)
@@ -0,0 +1,442 @@
+"""
+Инкрементальная агрегация CSV файлов, которые только дописываются в конец.
+"""
+
+import hashlib
+import os
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO
+
+from core.cache import CheckpointCache, file_digest
+from core.calculator import StatisticsCalculator
+from core.debug import debug_print
+from core.parallel import DEFAULT_CHUNK_SIZE, ParallelAggregator
+from core.reader import CSVProductReader, FileChunk, is_splittable
+from core.utils.records import last_line_end
+
+# Размер блока чтения при хэшировании прочитанной части файла
+_HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def range_hash(file: BinaryIO, start: int, end: int, digest: Any = None) -> Any:
+    """
+    Хэширует диапазон байтов [start, end) файла целиком.
+
+    Хэш можно продолжить следующим диапазоном: хэш [a, b), продолженный
+    диапазоном [b, c), равен хэшу [a, c). Так при дочитывании файла
+    проверенная часть не хэшируется второй раз.
+
+    :param file: Файл, открытый в бинарном режиме
+    :param start: Начало диапазона
+    :param end: Конец диапазона
+    :param digest: Продолжаемый хэш (по умолчанию - новый BLAKE2b)
+
+    :return: Объект хэша; hexdigest() - отпечаток диапазона
+    """
+    if digest is None:
+        digest = hashlib.blake2b(digest_size=16)
+    file.seek(start)
+    position = start
+    while position < end:
+        block = file.read(min(_HASH_BLOCK_SIZE, end - position))
+        if not block:
+            break
+        digest.update(block)
+        position += len(block)
+    return digest
+
+
+@dataclass
+class FileCheckpoint:
+    """
+    Контрольная точка агрегации файла: состояние калькулятора по записям
+    до offset и отпечатки, по которым проверяется, что файл только дописан.
+    """
+
+    size: int  # Размер файла при сохранении
+    mtime_ns: int
+    header: list[str]
+    data_start: int  # Смещение первой записи после заголовка
+    header_digest: str
+    offset: int  # Конец последней записи, завершенной переводом строки
+    prefix_digest: str  # Хэш всего диапазона [data_start, offset)
+    rows: int  # Количество непустых записей до offset
+    # Хэш всего файла. Считается, только если у файла уже менялся один mtime
+    # (см. IncrementalAggregator), иначе None
+    digest: str | None
+    state: Any = field(repr=False)
+
+
+@dataclass
+class _FilePlan:
+    """План чтения одного файла: с контрольной точки или с начала."""
+
+    file_path: str
+    stat: os.stat_result
+    checkpoint: FileCheckpoint | None
+    header: list[str]
+    data_start: int
+    start: int  # Смещение, с которого читаются новые записи
+    rows: int  # Количество непустых записей до start
+    stable_end: int  # Конец последней завершенной строки файла
+    chunks: list[FileChunk]
+    has_tail: bool  # Последний фрагмент - недописанная строка в конце файла
+    whole_file: bool = False  # Сжатый файл или снимок читается заново целиком
+    hash_file: bool = False  # Сохранить с контрольной точкой хэш всего файла
+    # Хэш проверенного диапазона [data_start, start) выросшего файла
+    prefix_hash: Any = None
+
+    @property
+    def tasks(self) -> list[str | FileChunk]:
+        """Задачи чтения файла для ParallelAggregator.run."""
+        if self.whole_file:
+            return [self.file_path]
+        return list(self.chunks)
+
+
+class IncrementalAggregator:
+    """
+    Агрегирует файлы, дочитывая только записи, добавленные с прошлого запуска.
+
+    Для каждого файла в кэше хранится FileCheckpoint. При следующем запуске:
+
+    - файл не изменился - используется сохраненное состояние;
+    - файл вырос, а хэши заголовка и всей прочитанной части совпали -
+      читаются только новые байты с offset, их состояние объединяется
+      с сохраненным. Прочитанная часть хэшируется целиком (это быстрее
+      разбора CSV), поэтому правка внутри нее находится всегда; хэш
+      продолжается новыми байтами и сохраняется с новой контрольной точкой;
+    - изменился только mtime - сравнивается хэш всего файла. Хэш не
+      считается заранее (при первом чтении файл не читается второй раз):
+      если его нет, файл читается заново, и хэш сохраняется для следующих
+      изменений mtime;
+    - файл уменьшился или отпечатки не совпали - файл читается заново.
+
+    Сжатый файл и снимок нельзя дочитать с середины: если они изменились,
+    они читаются заново целиком.
+
+    Строка в конце файла без перевода строки (ее могут дописывать прямо
+    сейчас) и запись, которую закрыл только конец файла внутри кавычек,
+    учитываются в результате, но не в контрольной точке.
+    """
+
+    def __init__(
+        self,
+        reader: CSVProductReader,
+        cache: CheckpointCache,
+        jobs: int = 1,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        self.reader = reader
+        self.cache = cache
+        self.chunk_size = chunk_size
+        self.parallel = ParallelAggregator(reader, jobs, chunk_size)
+
+    def aggregate_each(
+        self,
+        calculator: StatisticsCalculator,
+        file_paths: Sequence[str],
+        key: str,
+    ) -> Iterator[Any]:
+        """
+        Агрегирует файлы, используя и обновляя контрольные точки.
+
+        :param calculator: Калькулятор статистик
+        :param file_paths: Пути к CSV файлам
+        :param key: Ключ расчета в кэше
+
+        :return: Частичные состояния файлов в порядке file_paths
+        """
+        plans = [self._plan_file(file_path, key) for file_path in file_paths]
+        tasks = [task for plan in plans for task in plan.tasks]
+        results = self.parallel.run(calculator, tasks)
+
+        for plan in plans:
+            chunk_results = [next(results) for _ in plan.tasks]
+            yield self._finish_file(calculator, plan, chunk_results, key)
+
+    def _plan_file(self, file_path: str, key: str) -> _FilePlan:
+        """Определяет, с какого смещения нужно читать файл."""
+        try:
+            stat = os.stat(file_path)
+        except FileNotFoundError:
+            raise FileNotFoundError("File %s not found" % file_path) from None
+
+        if not is_splittable(file_path):
+            return self._plan_whole_file(file_path, key, stat)
+
+        checkpoint, touched = self._load_checkpoint(file_path, key, stat)
+        prefix_hash = None
+        if checkpoint is not None and stat.st_size > checkpoint.size:
+            prefix_hash = self._verify_prefix(file_path, checkpoint)
+            if prefix_hash is None:
+                checkpoint = None
+        if checkpoint is not None:
+            header, data_start = checkpoint.header, checkpoint.data_start
+            start, rows = checkpoint.offset, checkpoint.rows
+            if start < stat.st_size:
+                debug_print("Кэш: файл %s дочитывается с позиции %d", file_path, start)
+        else:
+            debug_print("Обработка файла: %s", file_path)
+            header, data_start = self.reader.read_header(file_path)
+            start, rows = data_start, 0
+
+        with open(file_path, "rb") as file:
+            stable_end = last_line_end(file, start, stat.st_size)
+
+        chunks = []
+        if stable_end > start:
+            chunks = self.reader.split_range(
+                file_path, header, start, stable_end, self.chunk_size
+            )
+        has_tail = stat.st_size > stable_end
+        if has_tail:
+            chunks.append(FileChunk(file_path, header, stable_end, stat.st_size))
+
+        return _FilePlan(
+            file_path,
+            stat,
+            checkpoint,
+            header,
+            data_start,
+            start,
+            rows,
+            stable_end,
+            chunks,
+            has_tail,
+            hash_file=touched,
+            prefix_hash=prefix_hash,
+        )
+
+    def _plan_whole_file(
+        self, file_path: str, key: str, stat: os.stat_result
+    ) -> _FilePlan:
+        """
+        Сжатый файл или снимок используется из кэша, только если он
+        не изменился.
+        """
+        checkpoint, touched = self._load_checkpoint(
+            file_path, key, stat, resumable=False
+        )
+        if checkpoint is None:
+            debug_print("Обработка файла: %s", file_path)
+            return _FilePlan(
+                file_path,
+                stat,
+                None,
+                [],
+                0,
+                0,
+                0,
+                stat.st_size,
+                [],
+                False,
+                whole_file=True,
+                hash_file=touched,
+            )
+
+        return _FilePlan(
+            file_path,
+            stat,
+            checkpoint,
+            checkpoint.header,
+            checkpoint.data_start,
+            checkpoint.offset,
+            checkpoint.rows,
+            stat.st_size,
+            [],
+            False,
+        )
+
+    def _load_checkpoint(
+        self, file_path: str, key: str, stat: os.stat_result, resumable: bool = True
+    ) -> tuple[FileCheckpoint | None, bool]:
+        """
+        Возвращает контрольную точку файла, если с ней можно продолжить чтение.
+
+        :param resumable: Можно ли дочитать выросший файл с контрольной точки
+
+        :return: Контрольная точка или None и признак того, что у файла
+            с прошлого запуска изменился только mtime
+        """
+        checkpoint = self.cache.load(file_path, key)
+        if not isinstance(checkpoint, FileCheckpoint):
+            return None, False
+
+        if stat.st_size == checkpoint.size:
+            if stat.st_mtime_ns == checkpoint.mtime_ns:
+                debug_print("Кэш: используется результат для файла %s", file_path)
+                return checkpoint, False
+            if checkpoint.digest is not None and (
+                file_digest(file_path) == checkpoint.digest
+            ):
+                debug_print("Кэш: содержимое файла %s не изменилось", file_path)
+                return checkpoint, True
+            debug_print("Кэш: файл %s изменен, полное чтение", file_path)
+            return None, True
+
+        if stat.st_size < checkpoint.size:
+            debug_print("Кэш: файл %s усечен, полное чтение", file_path)
+            return None, False
+
+        if not resumable:
+            debug_print("Кэш: файл %s изменен, полное чтение", file_path)
+            return None, False
+
+        # Прочитанную часть выросшего файла проверяет _verify_prefix
+        return checkpoint, False
+
+    def _verify_prefix(self, file_path: str, checkpoint: FileCheckpoint) -> Any:
+        """
+        Проверяет, что заголовок и прочитанная часть файла не изменились.
+
+        :param file_path: Путь к файлу
+        :param checkpoint: Контрольная точка файла
+
+        :return: Хэш диапазона [data_start, offset) для продолжения
+            или None, если файл перезаписан
+        """
+        with open(file_path, "rb") as file:
+            header_digest = range_hash(file, 0, checkpoint.data_start).hexdigest()
+            prefix_hash = range_hash(file, checkpoint.data_start, checkpoint.offset)
+
+        if (header_digest, prefix_hash.hexdigest()) != (
+            checkpoint.header_digest,
+            checkpoint.prefix_digest,
+        ):
+            debug_print("Кэш: файл %s перезаписан, полное чтение", file_path)
+            return None
+        return prefix_hash
+
+    def _finish_file(
+        self,
+        calculator: StatisticsCalculator,
+        plan: _FilePlan,
+        results: list[Any],
+        key: str,
+    ) -> Any:
+        """
+        Объединяет сохраненное состояние с новыми записями файла
+        и сохраняет новую контрольную точку.
+
+        :param results: ChunkResult фрагментов или состояние файла целиком
+
+        :return: Частичное состояние файла, включая недописанную строку
+        """
+        if plan.whole_file:
+            (state,) = results
+            self._store_checkpoint(plan, key, plan.stable_end, 0, state)
+            return state
+
+        if plan.checkpoint is not None:
+            state = plan.checkpoint.state
+        else:
+            state = calculator.create_state()
+        tail_states = []
+        offset, rows = plan.start, plan.rows
+        new_rows = processed_rows = 0
+        open_record = -1
+
+        merged = self.parallel.iter_merged(calculator, results, plan.rows)
+        for index, (chunk_state, chunk, _) in enumerate(merged):
+            new_rows += chunk.rows
+            processed_rows += chunk.processed
+            if open_record >= 0 or (plan.has_tail and index == len(results) - 1):
+                # Все после незакрытой записи (фрагменты, перечитанные
+                # с конца файла) и недописанная строка - хвост
+                tail_states.append(chunk_state)
+                continue
+            if chunk.open_record >= 0:
+                # Последнюю запись закрыл только конец файла внутри кавычек.
+                # Ее могут дописать, поэтому, как недописанная строка, она
+                # учитывается в результате, но не в контрольной точке
+                open_record = chunk.open_record
+                record_state, _, _ = self.parallel.read_chunk(
+                    calculator, chunk, open_record, chunk.end
+                )
+                tail_states.append(record_state)
+                chunk_state, chunk, _ = self.parallel.read_chunk(
+                    calculator, chunk, chunk.start, open_record
+                )
+            state = calculator.merge(state, chunk_state)
+            offset = chunk.end
+            rows += chunk.rows
+
+        if results:
+            debug_print(
+                "Файл %s: обработано %d строк, пропущено %d строк",
+                plan.file_path,
+                processed_rows,
+                new_rows - processed_rows,
+            )
+
+        # Запись, начатая до stable_end, но не завершенная к концу файла
+        # (перевод строки в кавычках), не сохраняется в контрольной точке
+        if offset <= plan.stable_end:
+            self._store_checkpoint(plan, key, offset, rows, state)
+
+        for tail_state in tail_states:
+            state = calculator.merge(state, tail_state)
+        return state
+
+    def _store_checkpoint(
+        self, plan: _FilePlan, key: str, offset: int, rows: int, state: Any
+    ) -> None:
+        """Сохраняет контрольную точку, если файл не менялся во время чтения."""
+        stat, checkpoint = plan.stat, plan.checkpoint
+        if checkpoint is not None and (checkpoint.size, checkpoint.mtime_ns) == (
+            stat.st_size,
+            stat.st_mtime_ns,
+        ):
+            return  # Контрольная точка уже актуальна
+
+        try:
+            digest: str | None = None
+            if checkpoint is not None and checkpoint.size == stat.st_size:
+                digest = checkpoint.digest
+            elif plan.hash_file:
+                # У файла менялся только mtime: при следующем таком изменении
+                # он сравнивается по хэшу, а не читается заново
+                digest = file_digest(plan.file_path)
+
+            header_digest = prefix_digest = ""
+            if checkpoint is not None and offset == checkpoint.offset:
+                # Прочитанная часть не выросла и уже проверена
+                header_digest = checkpoint.header_digest
+                prefix_digest = checkpoint.prefix_digest
+            elif not plan.whole_file:
+                # Сжатый файл и снимок не дочитываются: хэши им не нужны
+                with open(plan.file_path, "rb") as file:
+                    header_digest = range_hash(file, 0, plan.data_start).hexdigest()
+                    if plan.prefix_hash is not None:
+                        prefix_hash = range_hash(
+                            file, plan.start, offset, plan.prefix_hash.copy()
+                        )
+                    else:
+                        prefix_hash = range_hash(file, plan.data_start, offset)
+                    prefix_digest = prefix_hash.hexdigest()
+            current = os.stat(plan.file_path)
+        except OSError:
+            return
+
+        if (current.st_size, current.st_mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+            debug_print("Кэш: файл %s изменился во время чтения", plan.file_path)
+            return
+
+        self.cache.store(
+            plan.file_path,
+            key,
+            FileCheckpoint(
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                header=plan.header,
+                data_start=plan.data_start,
+                header_digest=header_digest,
+                offset=offset,
+                prefix_digest=prefix_digest,
+                rows=rows,
+                digest=digest,
+                state=state,
+            ),
+        )
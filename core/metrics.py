@@ -0,0 +1,394 @@
+"""
+Модуль для сбора метрик анализа: время этапов и счетчики по файлам.
+
+Как и debug-режим, метрики включаются глобально (set_metrics). По умолчанию
+активен NullMetrics, методы которого ничего не делают, поэтому
+инструментированный код почти не замедляется. Метрики дочерних процессов
+собираются отдельно (collect_metrics) и объединяются в родительском (merge).
+"""
+
+import contextlib
+import json
+import threading
+import time
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+# Этапы анализа. Чтение включает разбор, проверку и преобразование строк:
+# читатели выполняют их в одном цикле по записям
+STAGES = ("read", "aggregate", "finalize", "render")
+
+# Количество элементов, время получения которых измеряется одним замером
+_TIMED_BATCH = 1024
+
+_PROMETHEUS_PREFIX = "brand_rating"
+
+
+@dataclass
+class StageMetrics:
+    """Время этапа: реальное и процессорное (без вложенных этапов)."""
+
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+
+
+@dataclass
+class FileMetrics:
+    """Счетчики одного файла."""
+
+    bytes_read: int = 0
+    rows_processed: int = 0
+    rows_skipped: dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    @property
+    def skipped_total(self) -> int:
+        """Количество пропущенных строк по всем причинам."""
+        return sum(self.rows_skipped.values())
+
+    @property
+    def rows_per_second(self) -> float | None:
+        """Скорость обработки строк файла (None, если время не измерено)."""
+        if not self.seconds:
+            return None
+        return (self.rows_processed + self.skipped_total) / self.seconds
+
+
+class Metrics:
+    """
+    Сборщик метрик анализа.
+
+    Время этапа (stage, timed) считается без времени вложенных этапов,
+    поэтому сумма этапов равна общему времени. Счетчики файлов
+    накапливаются: фрагменты одного файла суммируются.
+    """
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self.stages: dict[str, StageMetrics] = {}
+        self.files: dict[str, FileMetrics] = {}
+        self._lock = threading.Lock()
+        # Время вложенных этапов текущего этапа: [реальное, процессорное]
+        self._nested = [0.0, 0.0]
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """
+        Измеряет время блока как этап name.
+
+        :param name: Название этапа
+        """
+        outer = self._nested
+        self._nested = [0.0, 0.0]
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            nested, self._nested = self._nested, outer
+            self._add_stage(name, wall - nested[0], cpu - nested[1])
+            outer[0] += wall
+            outer[1] += cpu
+
+    def timed(self, name: str, items: Iterable[T]) -> Iterator[T]:
+        """
+        Относит к этапу name время получения элементов items.
+
+        Время обработки элементов потребителем остается в текущем этапе.
+        Элементы получаются блоками по _TIMED_BATCH, чтобы замеры не
+        замедляли обработку.
+
+        :param name: Название этапа
+        :param items: Итерируемый источник (например, читатель продуктов)
+
+        :return: Итератор тех же элементов
+        """
+        iterator = iter(items)
+        while True:
+            with self.stage(name):
+                batch = list(islice(iterator, _TIMED_BATCH))
+            if not batch:
+                return
+            yield from batch
+
+    @contextlib.contextmanager
+    def file_timer(self, file_path: str) -> Iterator[None]:
+        """
+        Добавляет время блока ко времени обработки файла.
+
+        :param file_path: Путь к файлу
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._file(file_path).seconds += elapsed
+
+    def record_bytes(self, file_path: str, size: int) -> None:
+        """
+        Добавляет количество прочитанных байт файла.
+
+        :param file_path: Путь к файлу
+        :param size: Количество байт
+        """
+        with self._lock:
+            self._file(file_path).bytes_read += size
+
+    def record_rows(
+        self, file_path: str, processed: int, skipped: Mapping[str, int]
+    ) -> None:
+        """
+        Добавляет количество принятых и пропущенных строк файла.
+
+        :param file_path: Путь к файлу
+        :param processed: Количество принятых строк
+        :param skipped: Количество пропущенных строк по причинам
+        """
+        with self._lock:
+            metrics = self._file(file_path)
+            metrics.rows_processed += processed
+            for reason, count in skipped.items():
+                metrics.rows_skipped[reason] = (
+                    metrics.rows_skipped.get(reason, 0) + count
+                )
+
+    def merge(self, other: "Metrics") -> None:
+        """
+        Добавляет метрики другого сборщика (например, дочернего процесса).
+
+        :param other: Присоединяемые метрики (не изменяются)
+        """
+        for name, stage in other.stages.items():
+            self._add_stage(name, stage.wall_seconds, stage.cpu_seconds)
+        for file_path, metrics in other.files.items():
+            self.record_bytes(file_path, metrics.bytes_read)
+            self.record_rows(file_path, metrics.rows_processed, metrics.rows_skipped)
+            with self._lock:
+                self._file(file_path).seconds += metrics.seconds
+
+    def export(self, stats_format: str) -> str:
+        """
+        Возвращает метрики в одном из форматов core.options.STATS_FORMATS.
+
+        :param stats_format: text - сводка, json или prometheus
+
+        :raise ValueError: Если формат неизвестен
+        """
+        if stats_format == "text":
+            return self.summary()
+        if stats_format == "json":
+            return self.to_json()
+        if stats_format == "prometheus":
+            return self.to_prometheus()
+        raise ValueError("Unknown stats format: %s" % stats_format)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Возвращает метрики в виде словаря для JSON."""
+        return {
+            "stages": {
+                name: {
+                    "wall_seconds": stage.wall_seconds,
+                    "cpu_seconds": stage.cpu_seconds,
+                }
+                for name, stage in self.stages.items()
+            },
+            "files": {
+                file_path: {
+                    "bytes_read": metrics.bytes_read,
+                    "rows_processed": metrics.rows_processed,
+                    "rows_skipped": dict(metrics.rows_skipped),
+                    "seconds": metrics.seconds,
+                    "rows_per_second": metrics.rows_per_second,
+                }
+                for file_path, metrics in self.files.items()
+            },
+        }
+
+    def to_json(self) -> str:
+        """Возвращает метрики в JSON."""
+        return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+
+    def to_prometheus(self) -> str:
+        """Возвращает метрики в текстовом формате Prometheus."""
+        lines: list[str] = []
+
+        def family(name: str, help_text: str, samples: list[tuple[str, Any]]) -> None:
+            metric = "%s_%s" % (_PROMETHEUS_PREFIX, name)
+            lines.append("# HELP %s %s" % (metric, help_text))
+            lines.append("# TYPE %s gauge" % metric)
+            for labels, value in samples:
+                lines.append("%s{%s} %r" % (metric, labels, value))
+
+        stages = self.stages.items()
+        family(
+            "stage_wall_seconds",
+            "Wall time of the analysis stage.",
+            [(_labels(stage=name), stage.wall_seconds) for name, stage in stages],
+        )
+        family(
+            "stage_cpu_seconds",
+            "CPU time of the analysis stage.",
+            [(_labels(stage=name), stage.cpu_seconds) for name, stage in stages],
+        )
+
+        files = self.files.items()
+        family(
+            "file_bytes_read",
+            "Bytes read from the input file.",
+            [(_labels(file=path), metrics.bytes_read) for path, metrics in files],
+        )
+        family(
+            "file_rows_processed",
+            "Rows of the input file accepted as products.",
+            [(_labels(file=path), metrics.rows_processed) for path, metrics in files],
+        )
+        family(
+            "file_rows_skipped",
+            "Rows of the input file skipped, by reason.",
+            [
+                (_labels(file=path, reason=reason), count)
+                for path, metrics in files
+                for reason, count in sorted(metrics.rows_skipped.items())
+            ],
+        )
+        family(
+            "file_rows_per_second",
+            "Rows of the input file handled per second.",
+            [
+                (_labels(file=path), metrics.rows_per_second)
+                for path, metrics in files
+                if metrics.rows_per_second is not None
+            ],
+        )
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> str:
+        """Возвращает сводку метрик для чтения человеком."""
+        lines = ["Этапы:"]
+        for name, stage in self.stages.items():
+            lines.append(
+                "  %-10s %9.3f с  (CPU %.3f с)"
+                % (name, stage.wall_seconds, stage.cpu_seconds)
+            )
+
+        lines.append("Файлы:")
+        for file_path, metrics in self.files.items():
+            speed = metrics.rows_per_second
+            lines.append(
+                "  %s: %d байт, обработано %d строк, пропущено %d строк, %s"
+                % (
+                    file_path,
+                    metrics.bytes_read,
+                    metrics.rows_processed,
+                    metrics.skipped_total,
+                    "%.0f строк/с" % speed if speed is not None else "- строк/с",
+                )
+            )
+            for reason, count in sorted(metrics.rows_skipped.items()):
+                lines.append("    %s: %d" % (reason, count))
+        return "\n".join(lines)
+
+    def _add_stage(self, name: str, wall: float, cpu: float) -> None:
+        with self._lock:
+            stage = self.stages.setdefault(name, StageMetrics())
+            stage.wall_seconds += wall
+            stage.cpu_seconds += cpu
+
+    def _file(self, file_path: str) -> FileMetrics:
+        metrics = self.files.get(file_path)
+        if metrics is None:
+            metrics = self.files[file_path] = FileMetrics()
+        return metrics
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Блокировка не сериализуется: метрики передаются между процессами
+        return {"stages": self.stages, "files": self.files}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._nested = [0.0, 0.0]
+
+
+class NullMetrics(Metrics):
+    """Выключенные метрики: ничего не измеряют и не хранят."""
+
+    enabled = False
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        yield
+
+    def timed(self, name: str, items: Iterable[T]) -> Iterator[T]:
+        return iter(items)
+
+    @contextlib.contextmanager
+    def file_timer(self, file_path: str) -> Iterator[None]:
+        yield
+
+    def record_bytes(self, file_path: str, size: int) -> None:
+        pass
+
+    def record_rows(
+        self, file_path: str, processed: int, skipped: Mapping[str, int]
+    ) -> None:
+        pass
+
+    def merge(self, other: Metrics) -> None:
+        pass
+
+
+# Глобальный сборщик метрик
+_METRICS: Metrics = NullMetrics()
+
+
+def set_metrics(metrics: Metrics | None) -> None:
+    """
+    Устанавливает глобальный сборщик метрик.
+
+    :param metrics: Сборщик или None, чтобы выключить метрики
+    """
+    global _METRICS
+    _METRICS = metrics if metrics is not None else NullMetrics()
+
+
+def get_metrics() -> Metrics:
+    """Возвращает глобальный сборщик метрик (NullMetrics, если выключены)."""
+    return _METRICS
+
+
+@contextlib.contextmanager
+def collect_metrics() -> Iterator[Metrics]:
+    """
+    Временно заменяет глобальный сборщик новым.
+
+    Используется в дочерних процессах: собранные метрики возвращаются
+    родителю и объединяются через Metrics.merge.
+
+    :return: Новый сборщик метрик
+    """
+    previous = _METRICS
+    metrics = Metrics()
+    set_metrics(metrics)
+    try:
+        yield metrics
+    finally:
+        set_metrics(previous)
+
+
+def _labels(**labels: str) -> str:
+    return ",".join(
+        '%s="%s"' % (name, _escape_label(value)) for name, value in labels.items()
+    )
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
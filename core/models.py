@@ -2,12 +2,26 @@
 Data Transfer Objects (DTO) для проекта.
 """
 
+from array import array
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
+from typing import Any, TypeAlias, cast
 
+# Колонки CSV, из которых строится Product
+PRODUCT_COLUMNS = ("name", "brand", "price", "rating")
 
-@dataclass
+# Колонка ProductTable: array или память снимка (memoryview того же формата)
+Column: TypeAlias = "array[Any] | memoryview[Any]"
+
+
+@dataclass(frozen=True, slots=True)
 class Product:
-    """DTO для продукта."""
+    """
+    DTO для продукта.
+
+    Неизменяемый и без __dict__ (slots): экземпляр занимает в несколько раз
+    меньше памяти, чем обычный dataclass.
+    """
 
     name: str
     brand: str
@@ -21,15 +35,192 @@ class Product:
                 "Рейтинг должен быть от 0 до 5, получено: %.2f" % self.rating
             )
 
+    @classmethod
+    def from_validated(
+        cls, name: str, brand: str, price: float, rating: float
+    ) -> "Product":
+        """
+        Создает продукт из уже проверенных значений без повторной валидации.
+
+        :param name: Название продукта
+        :param brand: Бренд продукта
+        :param price: Цена продукта
+        :param rating: Рейтинг продукта от 0 до 5
+
+        :return: Объект Product
+        """
+        product = object.__new__(cls)
+        object.__setattr__(product, "name", name)
+        object.__setattr__(product, "brand", brand)
+        object.__setattr__(product, "price", price)
+        object.__setattr__(product, "rating", rating)
+        return product
+
+
+class ProductTable:
+    """
+    Компактное колоночное хранилище продуктов.
+
+    Названия и бренды кодируются словарями: каждая уникальная строка
+    хранится один раз, а строки таблицы ссылаются на нее целочисленным
+    кодом. Цены и рейтинги лежат в буферах array("d"). Калькуляторы могут
+    обходить колонки напрямую, не создавая объект на каждую строку;
+    итерация по таблице по-прежнему возвращает объекты Product.
+
+    Колонки таблицы, прочитанной из снимка, - memoryview над отображенным
+    в память файлом (без копирования); такая таблица только читается.
+    """
+
+    __slots__ = (
+        "names",
+        "brands",
+        "name_codes",
+        "brand_codes",
+        "prices",
+        "ratings",
+        "_name_index",
+        "_brand_index",
+    )
+
+    def __init__(self) -> None:
+        self.names: list[str] = []  # Словарь названий: код -> строка
+        self.brands: list[str] = []  # Словарь брендов: код -> строка
+        self.name_codes: Column = array("I")
+        self.brand_codes: Column = array("I")
+        self.prices: Column = array("d")
+        self.ratings: Column = array("d")
+        self._name_index: dict[str, int] = {}
+        self._brand_index: dict[str, int] = {}
+
+    @classmethod
+    def from_products(cls, products: Iterable[Product]) -> "ProductTable":
+        """
+        Создает таблицу из продуктов.
+
+        :param products: Продукты (список или генератор)
+
+        :return: Заполненная таблица
+        """
+        table = cls()
+        table.extend(products)
+        return table
+
+    @classmethod
+    def from_columns(
+        cls,
+        names: list[str],
+        brands: list[str],
+        name_codes: Column,
+        brand_codes: Column,
+        prices: Column,
+        ratings: Column,
+    ) -> "ProductTable":
+        """
+        Создает таблицу из готовых колонок (например, прочитанных из снимка).
+
+        :param names: Словарь уникальных названий: код -> строка
+        :param brands: Словарь уникальных брендов: код -> строка
+        :param name_codes: Коды названий строк, array("I") или memoryview "I"
+        :param brand_codes: Коды брендов строк, array("I") или memoryview "I"
+        :param prices: Цены строк, array("d") или memoryview "d"
+        :param ratings: Рейтинги строк, array("d") или memoryview "d"
+
+        :return: Таблица, использующая переданные колонки без копирования
+        """
+        table = cls()
+        table.names, table.brands = names, brands
+        table.name_codes, table.brand_codes = name_codes, brand_codes
+        table.prices, table.ratings = prices, ratings
+        table._name_index = {name: code for code, name in enumerate(names)}
+        table._brand_index = {brand: code for code, brand in enumerate(brands)}
+        return table
+
+    def append(self, name: str, brand: str, price: float, rating: float) -> None:
+        """
+        Добавляет строку с уже проверенными значениями.
+
+        :param name: Название продукта
+        :param brand: Бренд продукта
+        :param price: Цена продукта
+        :param rating: Рейтинг продукта
+        """
+        # Дописываются только таблицы, построенные append и extend
+        cast(array, self.name_codes).append(
+            self._encode(name, self.names, self._name_index)
+        )
+        cast(array, self.brand_codes).append(
+            self._encode(brand, self.brands, self._brand_index)
+        )
+        cast(array, self.prices).append(price)
+        cast(array, self.ratings).append(rating)
+
+    def extend(self, products: Iterable[Product]) -> None:
+        """
+        Добавляет продукты в таблицу.
+
+        :param products: Продукты (список или генератор)
+        """
+        for product in products:
+            self.append(product.name, product.brand, product.price, product.rating)
+
+    @staticmethod
+    def _encode(value: str, values: list[str], index: dict[str, int]) -> int:
+        code = index.get(value)
+        if code is None:
+            code = index[value] = len(values)
+            values.append(value)
+        return code
+
+    def __len__(self) -> int:
+        return len(self.ratings)
+
+    def __getitem__(self, row: int) -> Product:
+        return Product.from_validated(
+            self.names[self.name_codes[row]],
+            self.brands[self.brand_codes[row]],
+            self.prices[row],
+            self.ratings[row],
+        )
+
+    def __iter__(self) -> Iterator[Product]:
+        names, brands = self.names, self.brands
+        for name_code, brand_code, price, rating in zip(
+            self.name_codes, self.brand_codes, self.prices, self.ratings, strict=True
+        ):
+            yield Product.from_validated(
+                names[name_code], brands[brand_code], price, rating
+            )
+
 
 @dataclass
 class BrandStatistics:
-    """DTO для статистики бренда."""
+    """
+    DTO для статистики бренда.
+
+    Дополнительные метрики заполняются только калькуляторами, которые
+    их считают, иначе равны None.
+    """
 
     brand: str
     average_rating: float
     product_count: int
+    median_rating: float | None = None
+    p90_rating: float | None = None
+    distinct_products: int | None = None
+    price_band: str | None = None
+    weighted_rating: float | None = None
+    min_price: float | None = None
+    max_price: float | None = None
+    average_price: float | None = None
 
     def __post_init__(self) -> None:
-        """Округление рейтинга после инициализации."""
+        """Округление рейтингов и средней цены после инициализации."""
         self.average_rating = round(self.average_rating, 2)
+        if self.median_rating is not None:
+            self.median_rating = round(self.median_rating, 2)
+        if self.p90_rating is not None:
+            self.p90_rating = round(self.p90_rating, 2)
+        if self.weighted_rating is not None:
+            self.weighted_rating = round(self.weighted_rating, 2)
+        if self.average_price is not None:
+            self.average_price = round(self.average_price, 2)
@@ -0,0 +1,41 @@
+"""
+Имена и значения по умолчанию настроек анализа.
+
+Модуль не импортирует реализации: из него main.py строит варианты
+аргументов командной строки, поэтому --help и --list-reports не загружают
+читателей, калькуляторы и кэш. Реестры реализаций (READERS, ACCUMULATORS,
+CalculatorFactory) используют эти имена.
+"""
+
+import os
+
+# Режимы чтения CSV (core.reader.READERS)
+READER_TYPES = ("default", "fast", "mmap")
+DEFAULT_READER = "default"
+
+# Движки расчета статистик: встроенный и модули дополнительных движков.
+# Модули импортируются только при запросе движка, т.к. требуют внешних библиотек.
+DEFAULT_ENGINE = "python"
+ENGINE_MODULES = {
+    "numpy": "core.numpy_engine",
+}
+
+# Аккумуляторы сумм рейтингов (core.accumulators.ACCUMULATORS)
+ACCUMULATOR_TYPES = ("float", "neumaier", "fsum", "welford")
+DEFAULT_ACCUMULATOR = "fsum"
+
+# Форматы вывода метрик (Metrics.export)
+STATS_FORMATS = ("text", "json", "prometheus")
+
+
+def default_cache_dir() -> str:
+    """Возвращает каталог кэша по умолчанию (с учетом XDG_CACHE_HOME)."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "brand-rating-analyzer")
+
+
+def get_available_engines() -> list[str]:
+    """Возвращает список движков расчета."""
+    return [DEFAULT_ENGINE, *ENGINE_MODULES]
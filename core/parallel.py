@@ -0,0 +1,316 @@
+"""
+Модуль для параллельной агрегации данных из нескольких файлов.
+"""
+
+import os
+from collections import Counter
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import replace
+from functools import partial
+from typing import Any
+
+from core.calculator import StatisticsCalculator
+from core.debug import debug_print, is_debug_enabled, sampled_debug_print
+from core.metrics import Metrics, collect_metrics, get_metrics
+from core.reader import CSVProductReader, FileChunk, is_splittable
+
+# Файлы больше этого размера делятся на фрагменты для разных процессов
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024
+
+ChunkResult = tuple[Any, FileChunk, list[tuple[int, str]] | None]
+
+
+def _aggregate_file(
+    reader: CSVProductReader, calculator: StatisticsCalculator, file_path: str
+) -> Any:
+    """
+    Считает частичное состояние калькулятора по одному файлу.
+    Выполняется в дочернем процессе.
+
+    :param reader: Читатель файлов
+    :param calculator: Калькулятор, состояние которого заполняется
+    :param file_path: Путь к файлу
+
+    :return: Частичное состояние калькулятора
+    """
+    state = calculator.create_state()
+    for products in reader.iter_file_products([file_path]):
+        calculator.accumulate(state, products)
+    return state
+
+
+def _aggregate_chunk(
+    reader: CSVProductReader, calculator: StatisticsCalculator, chunk: FileChunk
+) -> ChunkResult:
+    """
+    Считает частичное состояние калькулятора по фрагменту файла.
+    Выполняется в дочернем процессе.
+
+    :param reader: Читатель файлов
+    :param calculator: Калькулятор, состояние которого заполняется
+    :param chunk: Фрагмент файла
+
+    :return: Частичное состояние, заполненный фрагмент, номера пропущенных
+        строк относительно начала фрагмента и причины пропуска (только
+        в debug-режиме или со включенными метриками)
+    """
+    metrics = get_metrics()
+    state = calculator.create_state()
+    skipped: list[tuple[int, str]] | None = (
+        [] if is_debug_enabled() or metrics.enabled else None
+    )
+    with metrics.file_timer(chunk.file_path):
+        products = reader.iter_chunk(chunk, skipped)
+        calculator.accumulate(state, metrics.timed("read", products))
+    return state, chunk, skipped
+
+
+def _aggregate_task(
+    reader: CSVProductReader,
+    calculator: StatisticsCalculator,
+    task: str | FileChunk,
+) -> Any:
+    if isinstance(task, FileChunk):
+        return _aggregate_chunk(reader, calculator, task)
+    return _aggregate_file(reader, calculator, task)
+
+
+def _aggregate_task_with_metrics(
+    reader: CSVProductReader,
+    calculator: StatisticsCalculator,
+    task: str | FileChunk,
+) -> tuple[Any, Metrics]:
+    """
+    Выполняет задачу, собирая метрики дочернего процесса отдельно:
+    они возвращаются вместе с результатом и объединяются в родительском.
+    """
+    with collect_metrics() as metrics:
+        return _aggregate_task(reader, calculator, task), metrics
+
+
+class ParallelAggregator:
+    """
+    Распределяет файлы и фрагменты больших файлов по процессам.
+
+    Каждый процесс возвращает компактное частичное состояние калькулятора
+    (например, сумму и количество по брендам), а не список продуктов.
+    Родительский процесс объединяет состояния в порядке файлов.
+    """
+
+    def __init__(
+        self,
+        reader: CSVProductReader,
+        jobs: int,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        self.reader = reader
+        self.jobs = jobs
+        self.chunk_size = chunk_size
+
+    def aggregate(
+        self, calculator: StatisticsCalculator, file_paths: Sequence[str]
+    ) -> Any:
+        """
+        Параллельно агрегирует данные файлов.
+
+        :param calculator: Калькулятор статистик
+        :param file_paths: Пути к файлам
+
+        :return: Объединенное частичное состояние калькулятора
+        """
+        state = calculator.create_state()
+        for file_state in self.aggregate_each(calculator, file_paths):
+            state = calculator.merge(state, file_state)
+        return state
+
+    def aggregate_each(
+        self, calculator: StatisticsCalculator, file_paths: Sequence[str]
+    ) -> Iterator[Any]:
+        """
+        Параллельно агрегирует данные файлов, возвращая состояние каждого файла.
+
+        :param calculator: Калькулятор статистик
+        :param file_paths: Пути к файлам
+
+        :return: Частичные состояния файлов в порядке file_paths
+        """
+        plan = self._plan_tasks(file_paths)
+        tasks: list[str | FileChunk] = []
+        for item in plan:
+            tasks.extend(item if isinstance(item, list) else [item])
+
+        results = self.run(calculator, tasks)
+        for item in plan:
+            if isinstance(item, list):
+                chunk_results = [next(results) for _ in item]
+                yield self._merge_chunks(calculator, chunk_results)
+            else:
+                yield next(results)
+
+    def run(
+        self, calculator: StatisticsCalculator, tasks: Sequence[str | FileChunk]
+    ) -> Iterator[Any]:
+        """
+        Выполняет задачи (файлы целиком и фрагменты файлов) в процессах.
+
+        При jobs <= 1 или единственной задаче процессы не создаются.
+
+        :param calculator: Калькулятор статистик
+        :param tasks: Пути к файлам и фрагменты файлов
+
+        :return: Результаты задач в порядке tasks: состояние для файла,
+            ChunkResult для фрагмента
+        """
+        run_task = partial(_aggregate_task, self.reader, calculator)
+        workers = max(1, min(self.jobs, len(tasks)))
+        if workers == 1:
+            yield from map(run_task, tasks)
+            return
+
+        # concurrent.futures импортируется, только когда нужны процессы
+        from concurrent.futures import ProcessPoolExecutor
+
+        debug_print("Обработка %d задач в %d процессах", len(tasks), workers)
+        metrics = get_metrics()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            if not metrics.enabled:
+                yield from executor.map(run_task, tasks)
+                return
+
+            run_measured = partial(
+                _aggregate_task_with_metrics, self.reader, calculator
+            )
+            for result, task_metrics in executor.map(run_measured, tasks):
+                metrics.merge(task_metrics)
+                yield result
+
+    def _plan_tasks(self, file_paths: Iterable[str]) -> list[str | list[FileChunk]]:
+        """
+        Делит большие файлы на фрагменты, остальные обрабатываются целиком.
+        Сжатые файлы и снимки (см. is_splittable) всегда обрабатываются целиком.
+
+        :param file_paths: Пути к файлам
+
+        :return: Для каждого файла - путь или список его фрагментов
+        """
+        plan: list[str | list[FileChunk]] = []
+
+        for file_path in file_paths:
+            try:
+                size = os.path.getsize(file_path)
+            except OSError:
+                size = 0  # Ошибку сообщит обработка файла целиком
+
+            if size <= self.chunk_size or not is_splittable(file_path):
+                plan.append(file_path)
+                continue
+
+            debug_print("Обработка файла: %s", file_path)
+            chunks = self.reader.split_file(file_path, self.chunk_size)
+            debug_print("Файл %s разделен на %d фрагментов", file_path, len(chunks))
+            plan.append(chunks)
+
+        return plan
+
+    def _merge_chunks(
+        self, calculator: StatisticsCalculator, results: list[ChunkResult]
+    ) -> Any:
+        """
+        Объединяет результаты фрагментов одного файла.
+
+        :param calculator: Калькулятор статистик
+        :param results: Результаты фрагментов файла по порядку
+
+        :return: Частичное состояние файла
+        """
+        state = calculator.create_state()
+        rows = processed_rows = 0
+
+        for chunk_state, chunk, _ in self.iter_merged(calculator, results):
+            state = calculator.merge(state, chunk_state)
+            rows += chunk.rows
+            processed_rows += chunk.processed
+
+        debug_print(
+            "Файл %s: обработано %d строк, пропущено %d строк",
+            results[0][1].file_path,
+            processed_rows,
+            rows - processed_rows,
+        )
+        return state
+
+    def read_chunk(
+        self, calculator: StatisticsCalculator, chunk: FileChunk, start: int, limit: int
+    ) -> ChunkResult:
+        """
+        Заново читает записи фрагмента, начинающиеся в [start, limit),
+        в текущем процессе.
+
+        :param calculator: Калькулятор статистик
+        :param chunk: Фрагмент файла, заголовок которого используется
+        :param start: Начало записи, с которого читается фрагмент
+        :param limit: Граница начал читаемых записей
+
+        :return: Результат нового фрагмента
+        """
+        retry = replace(
+            chunk, start=start, limit=limit, end=-1, rows=0, processed=0, open_record=-1
+        )
+        return _aggregate_chunk(self.reader, calculator, retry)
+
+    def iter_merged(
+        self,
+        calculator: StatisticsCalculator,
+        results: Iterable[ChunkResult],
+        rows_before: int = 0,
+    ) -> Iterator[ChunkResult]:
+        """
+        Проверяет стыковку результатов фрагментов одного файла.
+
+        Фрагмент, начало которого не совпало с концом предыдущего (граница
+        пришлась на перевод строки внутри кавычек), перечитывается с
+        настоящего начала записи. Номера пропущенных строк пересчитываются
+        в номера строк файла, а счетчики фрагментов добавляются в метрики.
+
+        :param calculator: Калькулятор статистик
+        :param results: Результаты идущих подряд фрагментов файла
+        :param rows_before: Количество непустых записей файла до первого фрагмента
+
+        :return: Результаты фрагментов, прочитанных с верных начал записей
+        """
+        metrics = get_metrics()
+        skip_reasons: Counter[str] = Counter()
+        expected_start = -1
+
+        for chunk_state, chunk, skipped in results:
+            if expected_start < 0:
+                expected_start = chunk.start
+
+            if chunk.start != expected_start:
+                debug_print(
+                    "Граница фрагмента %d файла %s внутри записи, перечитывание с %d",
+                    chunk.start,
+                    chunk.file_path,
+                    expected_start,
+                )
+                chunk_state, chunk, skipped = self.read_chunk(
+                    calculator, chunk, expected_start, chunk.limit
+                )
+
+            chunk_reasons: Counter[str] = Counter()
+            for row_num, reason in skipped or []:
+                chunk_reasons[reason] += 1
+                sampled_debug_print(
+                    skip_reasons[reason] + chunk_reasons[reason],
+                    reason,
+                    "Предупреждение: Пропуск пустой строки %d в файле %s",
+                    row_num + rows_before + 2,  # 1st - headers
+                    chunk.file_path,
+                )
+            skip_reasons.update(chunk_reasons)
+            metrics.record_bytes(chunk.file_path, chunk.end - chunk.start)
+            metrics.record_rows(chunk.file_path, chunk.processed, chunk_reasons)
+
+            rows_before += chunk.rows
+            expected_start = chunk.end
+            yield chunk_state, chunk, skipped
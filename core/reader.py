@@ -3,29 +3,124 @@
 """
 
 import csv
+import io
+import mmap
+import os
 from abc import ABC, abstractmethod
-from collections.abc import Sequence
-
-from core.debug import debug_print
-from core.models import Product
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from itertools import chain, pairwise
+from math import nan
+from typing import Any
+
+from core.debug import debug_print, sampled_debug_print
+from core.metrics import get_metrics
+from core.models import PRODUCT_COLUMNS, Product, ProductTable
+from core.snapshot import is_snapshot, read_snapshot
+from core.utils.brands import BrandNormalizer
+from core.utils.compression import decompress_input, is_compressed, open_input
 from core.utils.converters import DataConverter
-from core.utils.validators import DataValidator
+from core.utils.records import RecordLines, next_line_start, row_to_dict
+from core.utils.validators import (
+    SKIP_EMPTY_ROW,
+    SKIP_INVALID_RATING,
+    SKIP_MISSING_FIELD,
+    DataValidator,
+    RowValidationError,
+    skip_reason,
+)
+
+
+@dataclass
+class FileChunk:
+    """
+    Фрагмент CSV файла: записи, начинающиеся в диапазоне байтов [start, limit).
+
+    Поля end и rows заполняются при чтении фрагмента.
+    """
+
+    file_path: str
+    header: list[str]
+    start: int
+    limit: int
+    end: int = -1  # Смещение конца последней прочитанной записи
+    rows: int = 0  # Количество непустых записей
+    processed: int = 0  # Количество принятых продуктов
+    # Начало последней записи, если ее закрыл только конец файла внутри
+    # кавычек (запись еще могут дописать), иначе -1
+    open_record: int = -1
 
 
 class FileReader(ABC):
     """Абстрактный базовый класс для чтения файлов."""
 
     @abstractmethod
-    def read(self, file_paths: list[str]) -> list[Product]:
+    def iter_products(self, file_paths: Iterable[str]) -> Iterator[Product]:
+        """Лениво возвращает продукты из файлов по одному."""
         pass
 
+    def read(self, file_paths: list[str]) -> list[Product]:
+        """Читает все продукты из файлов в список."""
+        return list(self.iter_products(file_paths))
+
+    def read_table(self, file_paths: Iterable[str]) -> ProductTable:
+        """Читает все продукты из файлов в компактную колоночную таблицу."""
+        return ProductTable.from_products(self.iter_products(file_paths))
+
 
 class CSVProductReader(FileReader):
-    """Реализация чтения CSV файлов с продуктами."""
+    """
+    Реализация чтения CSV файлов с продуктами.
+
+    Читаются, проверяются и преобразуются только колонки columns
+    (проекция): остальные поля продукта не требуются в заголовке и
+    заполняются значениями по умолчанию (name и brand - "", price и
+    rating - nan).
+
+    Сжатые файлы (gzip, bz2, xz, zstd) распаковываются потоково в фоновом
+    потоке; сжатие определяется по расширению или сигнатуре файла.
+    Снимки (core.snapshot) определяются по сигнатуре и читаются через mmap
+    без разбора строк. Бренды приводятся к каноническому виду через кэш
+    BrandNormalizer (core.utils.brands) с учетом псевдонимов.
+    """
+
+    def __init__(
+        self,
+        validator: DataValidator,
+        converter: DataConverter,
+        columns: Iterable[str] = PRODUCT_COLUMNS,
+        normalizer: BrandNormalizer | None = None,
+    ):
+        """
+        :param validator: Валидатор данных
+        :param converter: Конвертер данных
+        :param columns: Читаемые колонки из PRODUCT_COLUMNS
+        :param normalizer: Нормализация брендов (по умолчанию - без псевдонимов)
+
+        :raise ValueError: Если колонка не является полем продукта
+        """
+        columns = set(columns)
+        unknown = columns.difference(PRODUCT_COLUMNS)
+        if unknown:
+            raise ValueError("Unknown product columns: %s" % sorted(unknown))
 
-    def __init__(self, validator: DataValidator, converter: DataConverter):
         self.validator = validator
         self.converter = converter
+        self.normalizer = normalizer if normalizer is not None else BrandNormalizer()
+        self.columns = tuple(column for column in PRODUCT_COLUMNS if column in columns)
+
+    def with_columns(self, columns: Iterable[str]) -> "CSVProductReader":
+        """
+        Возвращает такой же читатель с другой проекцией колонок
+        и общим кэшем нормализации брендов.
+
+        :param columns: Читаемые колонки из PRODUCT_COLUMNS
+
+        :return: Новый объект читателя
+        """
+        return type(self)(self.validator, self.converter, columns, self.normalizer)
 
     def read(self, file_paths: list[str]) -> list[Product]:
         """
@@ -39,14 +134,104 @@ class CSVProductReader(FileReader):
             FileNotFoundError: Если файл не найден
             ValueError: Если данные некорректны
         """
-        products: list[Product] = []
+        products = list(self.iter_products(file_paths))
+
+        debug_print("Всего прочитано %d записей о продуктах", len(products))
+        return products
+
+    def iter_products(self, file_paths: Iterable[str]) -> Iterator[Product]:
+        """
+        Потоково читает продукты из одного или нескольких CSV файлов.
+        В памяти одновременно находится только текущая строка файла.
+
+        :param file_paths: Пути к CSV файлам
+
+        :return: Итератор объектов Product
 
+        :raises
+            FileNotFoundError: Если файл не найден
+            ValueError: Если данные некорректны
+        """
+        metrics = get_metrics()
         for file_path in file_paths:
-            debug_print("Обработка файла: %s" % file_path)
-            products.extend(self._read_single_file(file_path))
+            debug_print("Обработка файла: %s", file_path)
+            with metrics.file_timer(file_path):
+                if is_snapshot(file_path):
+                    yield from self.read_snapshot(file_path)
+                else:
+                    yield from self._iter_single_file(file_path)
+            metrics.record_bytes(file_path, os.path.getsize(file_path))
+
+    def iter_file_products(
+        self, file_paths: Iterable[str]
+    ) -> Iterator[Iterable[Product]]:
+        """
+        Возвращает продукты каждого файла для StatisticsCalculator.accumulate:
+        снимок - таблицей ProductTable (калькуляторы обходят ее колонки, не
+        создавая объекты на строку), CSV - ленивым итератором. Время чтения
+        относится к этапу read метрик.
 
-        debug_print("Всего прочитано %d записей о продуктах" % len(products))
-        return products
+        :param file_paths: Пути к CSV файлам и снимкам
+
+        :return: Итератор продуктов файлов в порядке file_paths
+        """
+        metrics = get_metrics()
+        for file_path in file_paths:
+            if not is_snapshot(file_path):
+                yield metrics.timed("read", self.iter_products([file_path]))
+                continue
+
+            debug_print("Обработка файла: %s", file_path)
+            with metrics.file_timer(file_path), metrics.stage("read"):
+                table = self.read_snapshot(file_path)
+            metrics.record_bytes(file_path, os.path.getsize(file_path))
+            yield table
+
+    def read_snapshot(self, file_path: str) -> ProductTable:
+        """
+        Читает колонки проекции из снимка (см. core.snapshot).
+
+        Бренды снимка проходят через normalizer так же, как бренды CSV:
+        словарь брендов нормализуется по одному разу на бренд, а коды
+        брендов, совпавших после псевдонимов, объединяются.
+
+        :param file_path: Путь к файлу снимка
+
+        :return: Таблица продуктов снимка
+
+        :raises
+            FileNotFoundError: Если файл не найден
+            ValueError: Если снимок поврежден
+        """
+        with self._reading_errors(file_path):
+            table = read_snapshot(file_path, self.columns)
+        self._report_file_rows(file_path, len(table), {})
+        return self._normalize_table_brands(table)
+
+    def _normalize_table_brands(self, table: ProductTable) -> ProductTable:
+        """
+        Приводит словарь брендов таблицы к каноническому виду.
+
+        :param table: Таблица продуктов
+
+        :return: Таблица с нормализованными брендами
+        """
+        brands = [self.normalizer.normalize(brand) for brand in table.brands]
+        codes: dict[str, int] = {}
+        remap = [codes.setdefault(brand, len(codes)) for brand in brands]
+
+        brand_codes = table.brand_codes
+        if len(codes) < len(brands):
+            # Несколько брендов снимка - псевдонимы одного бренда
+            brand_codes = array("I", [remap[code] for code in brand_codes])
+        return ProductTable.from_columns(
+            table.names,
+            list(codes),
+            table.name_codes,
+            brand_codes,
+            table.prices,
+            table.ratings,
+        )
 
     def _read_single_file(self, file_path: str) -> list[Product]:
         """
@@ -56,26 +241,194 @@ class CSVProductReader(FileReader):
 
         :return: Список объектов Product из файла
         """
+        return list(self._iter_single_file(file_path))
 
-        try:
-            with open(file_path, "r", encoding="utf-8") as file:
-                reader = csv.DictReader(file)
+    def _iter_single_file(self, file_path: str) -> Iterator[Product]:
+        """
+        Потоково читает данные из одного CSV файла.
+
+        :param file_path: Путь к CSV файлу
+
+        :return: Итератор объектов Product из файла
+        """
+
+        with self._reading_errors(file_path):
+            with open_input(file_path) as binary:
+                file = io.TextIOWrapper(binary, encoding="utf-8")
+                yield from self._iter_text(file, file_path)
+
+    def iter_stream(self, file: Iterable[str], file_path: str) -> Iterator[Product]:
+        """
+        Потоково читает продукты из уже открытого текстового потока CSV.
+
+        :param file: Строки CSV (текстовый файл или поток), начиная с заголовка
+        :param file_path: Имя источника для сообщений
+
+        :return: Итератор объектов Product
+        """
+        with self._reading_errors(file_path):
+            yield from self._iter_text(file, file_path)
+
+    def iter_binary_stream(
+        self, file: "io.BufferedReader[Any]", file_path: str
+    ) -> Iterator[Product]:
+        """
+        Потоково читает продукты из бинарного потока CSV. Сжатый поток
+        (см. core.utils.compression) распаковывается по ходу чтения.
+
+        :param file: Буферизованный бинарный поток, начиная с начала файла
+        :param file_path: Имя источника для сообщений и определения сжатия
+
+        :return: Итератор объектов Product
+        """
+        with self._reading_errors(file_path):
+            with decompress_input(file, file_path) as binary:
+                text = io.TextIOWrapper(binary, encoding="utf-8")
+                yield from self._iter_text(text, file_path)
 
-                if not reader.fieldnames:
+    def _iter_text(self, file: Iterable[str], file_path: str) -> Iterator[Product]:
+        reader = csv.DictReader(file)
+
+        if not reader.fieldnames:
+            raise ValueError("File %s has no headers" % file_path)
+
+        self._validate_headers(reader.fieldnames, file_path)
+        yield from self._process_rows(reader, file_path)
+
+    def split_file(self, file_path: str, chunk_size: int) -> list[FileChunk]:
+        """
+        Делит CSV файл на фрагменты примерно по chunk_size байт.
+
+        Границы фрагментов выравниваются по началам строк. Если перевод строки
+        оказался внутри поля в кавычках, граница неверна: это видно после
+        чтения предыдущего фрагмента (его end не совпадет со start следующего),
+        и следующий фрагмент нужно перечитать с end.
+
+        :param file_path: Путь к CSV файлу
+        :param chunk_size: Желаемый размер фрагмента в байтах
+
+        :return: Список фрагментов файла (хотя бы один)
+        """
+        header, data_start = self.read_header(file_path)
+        size = os.path.getsize(file_path)
+        return self.split_range(file_path, header, data_start, size, chunk_size)
+
+    def read_header(self, file_path: str) -> tuple[list[str], int]:
+        """
+        Читает и проверяет заголовок CSV файла.
+
+        :param file_path: Путь к CSV файлу
+
+        :return: Колонки заголовка и смещение первой записи после него
+        """
+        with self._reading_errors(file_path):
+            with open(file_path, "rb") as file:
+                lines = RecordLines(file, 0)
+                header = next(csv.reader(lines), None)
+
+                if not header:
                     raise ValueError("File %s has no headers" % file_path)
 
-                self._validate_headers(reader.fieldnames, file_path)
-                return self._process_rows(reader, file_path)
+                self._validate_headers(header, file_path)
+                return header, lines.position
+
+    def split_range(
+        self,
+        file_path: str,
+        header: list[str],
+        start: int,
+        limit: int,
+        chunk_size: int,
+    ) -> list[FileChunk]:
+        """
+        Делит диапазон байтов [start, limit) CSV файла на фрагменты
+        примерно по chunk_size байт (см. split_file).
+
+        :param file_path: Путь к CSV файлу
+        :param header: Заголовок файла
+        :param start: Смещение начала записи
+        :param limit: Конец диапазона
+        :param chunk_size: Желаемый размер фрагмента в байтах
+
+        :return: Список фрагментов диапазона (хотя бы один)
+        """
+        bounds = [start]
+        with self._reading_errors(file_path):
+            with open(file_path, "rb") as file:
+                for offset in range(start + chunk_size, limit, chunk_size):
+                    candidate = next_line_start(file, offset)
+                    if bounds[-1] < candidate < limit:
+                        bounds.append(candidate)
+        bounds.append(max(limit, bounds[-1]))
+
+        return [
+            FileChunk(file_path, header, chunk_start, chunk_limit)
+            for chunk_start, chunk_limit in pairwise(bounds)
+        ]
+
+    def iter_chunk(
+        self, chunk: FileChunk, skipped: list[tuple[int, str]] | None = None
+    ) -> Iterator[Product]:
+        """
+        Потоково читает записи фрагмента файла.
+
+        Последняя запись дочитывается целиком, даже если выходит за
+        chunk.limit. Валидация и пропуск строк такие же, как при чтении
+        всего файла, но номера пропущенных строк отсчитываются от начала
+        фрагмента с нуля: номера в файле вычисляются после объединения
+        фрагментов по chunk.rows.
+
+        :param chunk: Фрагмент файла; поля end, rows и processed заполняются
+        :param skipped: Список для номеров и причин пропуска строк или None
+
+        :return: Итератор объектов Product
+        """
+        with self._reading_errors(chunk.file_path):
+            with open(chunk.file_path, "rb") as file:
+                lines = RecordLines(file, chunk.start)
+                records = self._iter_chunk_records(chunk, lines)
+
+                for product in self._process_records(
+                    records, chunk.header, chunk.file_path, start_row=0, skipped=skipped
+                ):
+                    chunk.processed += 1
+                    yield product
+
+    @staticmethod
+    def _iter_chunk_records(
+        chunk: FileChunk, lines: RecordLines
+    ) -> Iterator[list[str]]:
+        records = csv.reader(lines)
+        chunk.end = chunk.start
+
+        while lines.position < chunk.limit:
+            record_start = lines.position
+            row = next(records, None)
+            if row is None:
+                break
+
+            chunk.end = lines.position
+            if lines.exhausted:
+                chunk.open_record = record_start
+            if not row:  # Пустые строки пропускаются, как в csv.DictReader
+                continue
+
+            chunk.rows += 1
+            yield row
 
+    @staticmethod
+    @contextmanager
+    def _reading_errors(file_path: str) -> Iterator[None]:
+        """Приводит ошибки чтения файла к FileNotFoundError и ValueError."""
+        try:
+            yield
         except FileNotFoundError:
             raise FileNotFoundError("File %s not found" % file_path) from None
         except Exception as e:
             raise ValueError("Error reading file %s: %s" % (file_path, e)) from e
 
-    @staticmethod
-    def _validate_headers(headers: Sequence[str], file_path: str) -> None:
-        required_columns = ["name", "brand", "price", "rating"]
-        missing = [col for col in required_columns if col not in headers]
+    def _validate_headers(self, headers: Sequence[str], file_path: str) -> None:
+        missing = [col for col in self.columns if col not in headers]
 
         if missing:
             raise ValueError(
@@ -83,56 +436,455 @@ class CSVProductReader(FileReader):
                 "Found: %s" % (file_path, missing, headers)
             )
 
-    def _process_rows(self, reader: csv.DictReader, file_path: str) -> list[Product]:
-        products = []
+    def _process_records(
+        self,
+        records: Iterable[list[str]],
+        header: Sequence[str],
+        file_path: str,
+        start_row: int = 2,  # 1st line - headers
+        skipped: list[tuple[int, str]] | None = None,
+    ) -> Iterator[Product]:
+        """
+        Обрабатывает записи csv.reader так же, как строки csv.DictReader.
+
+        :param records: Записи файла без заголовка
+        :param header: Заголовок файла
+        :param file_path: Путь к файлу для сообщений
+        :param start_row: Номер первой непустой записи
+        :param skipped: Список для номеров и причин пропуска строк или None
+
+        :return: Итератор объектов Product
+        """
+        rows = (row_to_dict(header, record) for record in records if record)
+        return self._process_rows(rows, file_path, start_row, skipped)
+
+    def _process_rows(
+        self,
+        reader: Iterable[dict],
+        file_path: str,
+        start_row: int = 2,  # 1st line - headers
+        skipped: list[tuple[int, str]] | None = None,
+    ) -> Iterator[Product]:
         processed_rows = 0
-        skipped_rows = 0
+        skip_reasons: dict[str, int] = {}
 
-        for row_num, row in enumerate(reader, start=2):  # 1st line - headers
+        for row_num, row in enumerate(reader, start=start_row):
             try:
                 if self.validator.is_empty_row(row):
-                    debug_print(
-                        "Предупреждение: Пропуск пустой строки %d в файле %s"
-                        % (row_num, file_path)
+                    self._report_skipped_row(
+                        row_num, file_path, skipped, SKIP_EMPTY_ROW, skip_reasons
                     )
-                    skipped_rows += 1
                     continue
 
                 product = self._create_product_from_row(row)
-                products.append(product)
-                processed_rows += 1
 
-            except (ValueError, KeyError):
-                debug_print(
-                    "Предупреждение: Пропуск пустой строки %d в файле %s"
-                    % (row_num, file_path)
+            except (ValueError, KeyError) as e:
+                self._report_skipped_row(
+                    row_num, file_path, skipped, skip_reason(e), skip_reasons
                 )
-                skipped_rows += 1
                 continue
 
+            processed_rows += 1
+            yield product
+
+        if skipped is None:
+            self._report_file_rows(file_path, processed_rows, skip_reasons)
+
+    @staticmethod
+    def _report_skipped_row(
+        row_num: int,
+        file_path: str,
+        skipped: list[tuple[int, str]] | None,
+        reason: str,
+        skip_reasons: dict[str, int],
+    ) -> None:
+        """
+        Сообщает о пропущенной строке или откладывает сообщение,
+        сохраняя номер строки и причину пропуска в skipped.
+        """
+        count = skip_reasons[reason] = skip_reasons.get(reason, 0) + 1
+        if skipped is not None:
+            skipped.append((row_num, reason))
+            return
+
+        # Сообщения о пропуске выводятся для первых строк каждой причины
+        sampled_debug_print(
+            count,
+            reason,
+            "Предупреждение: Пропуск пустой строки %d в файле %s",
+            row_num,
+            file_path,
+        )
+
+    @staticmethod
+    def _record_skip_reason(
+        error: Exception,
+        fields: Sequence[Any],
+        name_index: int | None,
+        brand_index: int | None,
+    ) -> str:
+        """
+        Возвращает причину пропуска записи так же, как ее определяет
+        _process_rows: пустая запись, затем пустые name и brand, затем
+        ошибка преобразования. Вызывается только для пропускаемых записей.
+        """
+        if not any(field.strip() for field in fields):
+            return SKIP_EMPTY_ROW
+        for index in (name_index, brand_index):
+            if index is not None and (
+                index >= len(fields) or not fields[index].strip()
+            ):
+                return SKIP_MISSING_FIELD
+        return skip_reason(error)
+
+    @staticmethod
+    def _report_file_rows(
+        file_path: str, processed_rows: int, skip_reasons: dict[str, int]
+    ) -> None:
+        """Сообщает количество принятых и пропущенных строк файла."""
         debug_print(
-            "Файл %s: обработано %d строк, пропущено %d строк"
-            % (file_path, processed_rows, skipped_rows)
+            "Файл %s: обработано %d строк, пропущено %d строк",
+            file_path,
+            processed_rows,
+            sum(skip_reasons.values()),
         )
-        return products
+        get_metrics().record_rows(file_path, processed_rows, skip_reasons)
 
     def _create_product_from_row(self, row: dict) -> Product:
-        raw_data = {
-            "name": row.get("name"),
-            "brand": row.get("brand"),
-            "price": row.get("price"),
-            "rating": row.get("rating"),
-        }
+        columns = self.columns
+        raw_data = {column: row.get(column) for column in columns}
 
-        self.validator.validate_required_fields(raw_data)
+        self.validator.validate_required_fields(raw_data, columns)
 
         processed_data: dict[str, str | float] = {
-            "name": self.converter.safe_strip(raw_data["name"]),
-            "brand": self.converter.safe_strip(raw_data["brand"]).lower(),
-            "price": self.converter.safe_float(raw_data["price"]),
-            "rating": self.converter.safe_float(raw_data["rating"]),
+            "name": self.converter.safe_strip(raw_data.get("name")),
+            "brand": self.normalizer.normalize(raw_data.get("brand") or ""),
+            "price": nan,
+            "rating": nan,
         }
+        for column in ("price", "rating"):
+            if column in columns:
+                processed_data[column] = self.converter.safe_float(raw_data[column])
+
+        if "rating" in columns:
+            self.validator.validate_rating(processed_data["rating"])  # type: ignore
+
+        return Product.from_validated(**processed_data)  # type: ignore
+
+    def _column_indexes(self, header: Sequence[str]) -> list[int | None]:
+        """
+        Возвращает индексы колонок PRODUCT_COLUMNS в заголовке,
+        None - для колонок вне проекции.
+        """
+        # Как и в словаре csv.DictReader, при повторе колонки берется последняя
+        indexes = {column: index for index, column in enumerate(header)}
+        return [
+            indexes[column] if column in self.columns else None
+            for column in PRODUCT_COLUMNS
+        ]
+
+
+class FastCSVProductReader(CSVProductReader):
+    """
+    Быстрое чтение CSV файлов с продуктами.
+
+    Индексы колонок определяются один раз по заголовку, записи csv.reader
+    обрабатываются без промежуточных словарей, а проверка и преобразование
+    значений выполняются за один проход. Принятые и пропущенные строки
+    совпадают с CSVProductReader.
+    """
+
+    def iter_binary_stream(
+        self, file: "io.BufferedReader[Any]", file_path: str
+    ) -> Iterator[Product]:
+        """
+        Потоково читает продукты из бинарного потока CSV. Сжатый поток
+        (см. core.utils.compression) распаковывается по ходу чтения.
+
+        :param file: Буферизованный бинарный поток, начиная с начала файла
+        :param file_path: Имя источника для сообщений и определения сжатия
+
+        :return: Итератор объектов Product
+        """
+        with self._reading_errors(file_path):
+            with decompress_input(file, file_path) as binary:
+                text = io.TextIOWrapper(binary, encoding="utf-8")
+                yield from self._iter_text(text, file_path)
+
+    def _iter_text(self, file: Iterable[str], file_path: str) -> Iterator[Product]:
+        records = csv.reader(file)
+        header = next(records, None)
+
+        if not header:
+            raise ValueError("File %s has no headers" % file_path)
+
+        self._validate_headers(header, file_path)
+        yield from self._process_records(records, header, file_path)
+
+    def _process_records(
+        self,
+        records: Iterable[list[str]],
+        header: Sequence[str],
+        file_path: str,
+        start_row: int = 2,  # 1st line - headers
+        skipped: list[tuple[int, str]] | None = None,
+    ) -> Iterator[Product]:
+        name_index, brand_index, price_index, rating_index = self._column_indexes(
+            header
+        )
+        # Бренд из кэша нормализации без вызова метода (см. BrandNormalizer)
+        lookup, normalize = self.normalizer.lookup, self.normalizer.normalize
+
+        processed_rows = 0
+        skip_reasons: dict[str, int] = {}
+        row_num = start_row - 1
+
+        for record in records:
+            if not record:  # Пустые строки пропускаются, как в csv.DictReader
+                continue
+            row_num += 1
+
+            try:
+                name = record[name_index].strip() if name_index is not None else ""
+                if brand_index is not None:
+                    raw_brand = record[brand_index]
+                    brand = lookup(raw_brand) or normalize(raw_brand)
+                else:
+                    brand = ""
+                if (not name and name_index is not None) or (
+                    not brand and brand_index is not None
+                ):
+                    raise RowValidationError(
+                        "Product name and brand cannot be empty", SKIP_MISSING_FIELD
+                    )
+
+                # float() сам отбрасывает пробелы, как DataConverter.safe_float
+                price = float(record[price_index]) if price_index is not None else nan
+                if rating_index is not None:
+                    rating = float(record[rating_index])
+                    if not 0 <= rating <= 5:
+                        raise RowValidationError(
+                            "Rating must be between 0 and 5", SKIP_INVALID_RATING
+                        )
+                else:
+                    rating = nan
+
+            except (ValueError, IndexError) as e:
+                reason = self._record_skip_reason(e, record, name_index, brand_index)
+                self._report_skipped_row(
+                    row_num, file_path, skipped, reason, skip_reasons
+                )
+                continue
 
-        self.validator.validate_rating(processed_data["rating"])  # type: ignore
+            processed_rows += 1
+            yield Product.from_validated(name, brand, price, rating)
+
+        if skipped is None:
+            self._report_file_rows(file_path, processed_rows, skip_reasons)
+
+
+class MmapCSVProductReader(CSVProductReader):
+    """
+    Чтение CSV файлов с продуктами через mmap без декодирования всего файла.
+
+    Строки ищутся в отображенном в память файле по b"\\n". Строка без
+    кавычек, \\r и NUL делится по b"," как байты, и из UTF-8 декодируются
+    только нужные поля (ASCII строка) или вся строка (иначе). Строки с
+    кавычками, а также записи с переводом строки внутри поля разбираются
+    csv.reader. Принятые и пропущенные строки совпадают с CSVProductReader.
+    """
+
+    def _iter_single_file(self, file_path: str) -> Iterator[Product]:
+        if is_compressed(file_path):
+            # Сжатый файл нельзя отобразить в память: он читается потоково
+            yield from super()._iter_single_file(file_path)
+            return
+
+        header, data_start = self.read_header(file_path)
+        chunk = FileChunk(file_path, header, data_start, -1)
+        yield from self._iter_mapped(chunk, start_row=2, skipped=None)
+
+    def iter_chunk(
+        self, chunk: FileChunk, skipped: list[tuple[int, str]] | None = None
+    ) -> Iterator[Product]:
+        for product in self._iter_mapped(chunk, start_row=0, skipped=skipped):
+            chunk.processed += 1
+            yield product
+
+    def _iter_mapped(
+        self, chunk: FileChunk, start_row: int, skipped: list[tuple[int, str]] | None
+    ) -> Iterator[Product]:
+        """
+        Отображает файл фрагмента в память и читает записи,
+        начинающиеся в [chunk.start, chunk.limit); limit < 0 - до конца файла.
+        """
+        with self._reading_errors(chunk.file_path):
+            with open(chunk.file_path, "rb") as file:
+                if os.fstat(file.fileno()).st_size == 0:
+                    return
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    if chunk.limit < 0:
+                        chunk.limit = len(data)
+                    yield from self._scan_products(data, chunk, start_row, skipped)
+
+    def _scan_products(
+        self,
+        data: mmap.mmap,
+        chunk: FileChunk,
+        start_row: int,
+        skipped: list[tuple[int, str]] | None,
+    ) -> Iterator[Product]:
+        name_index, brand_index, price_index, rating_index = self._column_indexes(
+            chunk.header
+        )
+        # Бренд из кэша нормализации без вызова метода (см. BrandNormalizer)
+        lookup, normalize = self.normalizer.lookup, self.normalizer.normalize
+
+        file_path = chunk.file_path
+        processed_rows = 0
+        skip_reasons: dict[str, int] = {}
+        row_num = start_row - 1
+
+        # Поля записи - bytes (ASCII строка) или str
+        name: Any
+        brand: Any
+        price: Any
+        rating: Any
+
+        for fields in chain.from_iterable(self._iter_mapped_batches(data, chunk)):
+            row_num += 1
+
+            try:
+                name = fields[name_index] if name_index is not None else ""
+                brand = fields[brand_index] if brand_index is not None else ""
+                price = fields[price_index] if price_index is not None else nan
+                rating = fields[rating_index] if rating_index is not None else nan
+
+                if type(fields[0]) is bytes:
+                    # Поля ASCII строки: декодируются только нужные
+                    name = name.decode("ascii") if name else ""
+                    try:
+                        price = float(price)
+                        rating = float(rating)
+                    except ValueError:
+                        # float(bytes) пропускает не все пробельные символы str
+                        price = float(_decode_ascii(price))
+                        rating = float(_decode_ascii(rating))
+                else:
+                    price = float(price)
+                    rating = float(rating)
+
+                name = name.strip()
+                if brand_index is not None:
+                    brand = lookup(brand) or normalize(brand)
+                if (not name and name_index is not None) or (
+                    not brand and brand_index is not None
+                ):
+                    raise RowValidationError(
+                        "Product name and brand cannot be empty", SKIP_MISSING_FIELD
+                    )
+                if rating_index is not None and not 0 <= rating <= 5:
+                    raise RowValidationError(
+                        "Rating must be between 0 and 5", SKIP_INVALID_RATING
+                    )
+
+            except (ValueError, IndexError) as e:
+                reason = self._record_skip_reason(e, fields, name_index, brand_index)
+                self._report_skipped_row(
+                    row_num, file_path, skipped, reason, skip_reasons
+                )
+                continue
+
+            processed_rows += 1
+            yield Product.from_validated(name, brand, price, rating)
+
+        if skipped is None:
+            self._report_file_rows(file_path, processed_rows, skip_reasons)
+
+    @staticmethod
+    def _iter_mapped_batches(
+        data: mmap.mmap, chunk: FileChunk
+    ) -> Iterator[list[list[Any]]]:
+        """
+        Возвращает пачками непустые записи, начинающиеся в
+        [chunk.start, chunk.limit).
+
+        Файл просматривается блоками по целым строкам. Блок без кавычек,
+        NUL и одиночных \\r делится на строки и поля методом split: поля
+        ASCII блока остаются байтами, остальные блоки декодируются целиком.
+        Строки прочих блоков разбираются по одной, при необходимости csv.reader.
+        """
+        size = len(data)
+        find = data.find
+        position = chunk.end = chunk.start
+
+        while position < chunk.limit:
+            newline = find(b"\n", min(position + _MMAP_BLOCK_SIZE, chunk.limit) - 1)
+            end = size if newline < 0 else newline + 1
+            block = data[position:end]
+            if b"\r" in block:
+                block = block.replace(b"\r\n", b"\n")
+
+            if b'"' not in block and b"\r" not in block and b"\0" not in block:
+                batch: list[list[Any]]
+                if block.isascii():
+                    batch = [line.split(b",") for line in block.split(b"\n") if line]
+                else:
+                    text = block.decode("utf-8")
+                    batch = [line.split(",") for line in text.split("\n") if line]
+
+                # Пустые строки пропускаются, как в csv.DictReader
+                position = chunk.end = end
+                chunk.rows += len(batch)
+                yield batch
+                continue
 
-        return Product(**processed_data)  # type: ignore
+            while position < end:
+                newline = find(b"\n", position, end)
+                line_end = end if newline < 0 else newline + 1
+                line = data[position : line_end if newline < 0 else newline]
+                if line[-1:] == b"\r":
+                    line = line[:-1]
+
+                fields: list[Any]
+                if b'"' in line or b"\r" in line or b"\0" in line:
+                    lines = RecordLines(data, position)
+                    fields = next(csv.reader(lines), [])
+                    line_end = lines.position
+                    if lines.exhausted and fields:
+                        chunk.open_record = position
+                elif line.isascii():
+                    fields = line.split(b",") if line else []
+                else:
+                    fields = line.decode("utf-8").split(",")
+
+                position = chunk.end = line_end
+                if fields:
+                    chunk.rows += 1
+                    yield [fields]
+
+
+def is_splittable(file_path: str) -> bool:
+    """
+    Возвращает True, если записи файла можно читать с произвольного
+    смещения (фрагментами или дочитывая с контрольной точки). Сжатые
+    файлы и снимки читаются только целиком.
+    """
+    return not is_compressed(file_path) and not is_snapshot(file_path)
+
+
+def _decode_ascii(value: bytes | float) -> str | float:
+    """Декодирует поле ASCII строки; nan колонки вне проекции не меняется."""
+    return value.decode("ascii") if isinstance(value, bytes) else value
+
+
+# Размер блока, который MmapCSVProductReader просматривает за один раз
+_MMAP_BLOCK_SIZE = 1024 * 1024
+
+
+# Доступные реализации чтения CSV по имени режима
+READERS: dict[str, type[CSVProductReader]] = {
+    "default": CSVProductReader,
+    "fast": FastCSVProductReader,
+    "mmap": MmapCSVProductReader,
+}
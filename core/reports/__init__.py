@@ -1,12 +1,64 @@
 """
 Модуль системы отчетов с использованием абстрактных классов.
+
+Отчеты регистрируются по путям импорта: модуль отчета (и его зависимости,
+например tabulate) импортируется только при создании отчета.
 """
 
-from .average_rating import AverageRatingReport
+import importlib
+from typing import Any
+
 from .base import Report, ReportFactory
+from .formats import (
+    CSVReportWriter,
+    GridReportWriter,
+    JSONLinesReportWriter,
+    ParquetReportWriter,
+    ReportWriter,
+    ReportWriterFactory,
+)
+
+# Отчеты: тип - модуль пакета и класс отчета
+_REPORTS = {
+    "average-rating": ("average_rating", "AverageRatingReport"),
+    "rating-percentiles": ("rating_percentiles", "RatingPercentilesReport"),
+    "distinct-products": ("distinct_products", "DistinctProductsReport"),
+    "price-bands": ("price_bands", "PriceBandsReport"),
+    "price-weighted-rating": ("price_weighted_rating", "PriceWeightedRatingReport"),
+    "price-range": ("price_range", "PriceRangeReport"),
+}
 
 # Регистрируем отчеты
-ReportFactory.register("average-rating", AverageRatingReport)
+for _report_type, (_module, _class_name) in _REPORTS.items():
+    ReportFactory.register_lazy(
+        _report_type, "%s.%s:%s" % (__name__, _module, _class_name)
+    )
+
+# Регистрируем форматы вывода
+ReportWriterFactory.register("grid", GridReportWriter)
+ReportWriterFactory.register("csv", CSVReportWriter)
+ReportWriterFactory.register("jsonl", JSONLinesReportWriter)
+ReportWriterFactory.register("parquet", ParquetReportWriter)
+
+
+def __getattr__(name: str) -> Any:
+    """Импортирует класс отчета при первом обращении (from core.reports import ...)."""
+    for module, class_name in _REPORTS.values():
+        if class_name == name:
+            return getattr(importlib.import_module("." + module, __name__), name)
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
 
 # Для обратной совместимости
-__all__ = ["Report", "ReportFactory", "AverageRatingReport"]
+__all__ = [
+    "Report",
+    "ReportFactory",
+    "AverageRatingReport",
+    "RatingPercentilesReport",
+    "DistinctProductsReport",
+    "PriceBandsReport",
+    "PriceWeightedRatingReport",
+    "PriceRangeReport",
+    "ReportWriter",
+    "ReportWriterFactory",
+]
@@ -2,16 +2,23 @@
 Базовые классы для системы отчетов.
 """
 
+import importlib
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from typing import TYPE_CHECKING, Any
 
-from core.models import BrandStatistics
+if TYPE_CHECKING:
+    from core.models import BrandStatistics
 
 
 class Report(ABC):
     """Абстрактный базовый класс для всех отчетов."""
 
+    # Поля BrandStatistics в машиночитаемых форматах вывода
+    columns: tuple[str, ...] = ("brand", "average_rating", "product_count")
+
     @abstractmethod
-    def generate(self, data: list[BrandStatistics]) -> str:
+    def generate(self, data: list["BrandStatistics"]) -> str:
         """Генерирует отчет на основе данных."""
         pass
 
@@ -21,24 +28,71 @@ class Report(ABC):
         """Возвращает название отчета."""
         pass
 
+    def iter_rows(self, data: Iterable["BrandStatistics"]) -> Iterator[tuple[Any, ...]]:
+        """
+        Возвращает строки отчета по одной (значения колонок columns).
+
+        :param data: Статистики брендов в порядке отчета
+        :return: Итератор кортежей значений
+        """
+        columns = self.columns
+        for stats in data:
+            yield tuple(getattr(stats, column) for column in columns)
+
 
 class ReportFactory:
-    """Фабрика для создания отчетов."""
+    """
+    Фабрика для создания отчетов.
+
+    Отчет можно зарегистрировать по пути импорта (register_lazy): модуль
+    отчета импортируется только при первом создании отчета, поэтому
+    список отчетов доступен без импорта их реализаций.
+    """
 
-    _reports: dict[str, type[Report]] = {}
+    # Класс отчета или путь импорта "модуль:Класс"
+    _reports: dict[str, type[Report] | str] = {}
 
     @classmethod
     def create(cls, report_type: str) -> Report:
         """Создает отчет по типу."""
+        return cls.get_report_class(report_type)()
+
+    @classmethod
+    def get_report_class(cls, report_type: str) -> type[Report]:
+        """
+        Возвращает класс отчета, импортируя его модуль при необходимости.
+
+        :param report_type: Тип отчета
+
+        :return: Класс отчета
+
+        :raise ValueError: Если тип отчета неизвестен
+        """
         if report_type not in cls._reports:
             raise ValueError("Unknown report type: %s" % report_type)
-        return cls._reports[report_type]()
+
+        report_class = cls._reports[report_type]
+        if isinstance(report_class, str):
+            module_name, _, class_name = report_class.partition(":")
+            report_class = getattr(importlib.import_module(module_name), class_name)
+            cls._reports[report_type] = report_class
+        return report_class
 
     @classmethod
     def register(cls, report_type: str, report_class: type[Report]) -> None:
         """Регистрирует новый тип отчета."""
         cls._reports[report_type] = report_class
 
+    @classmethod
+    def register_lazy(cls, report_type: str, import_path: str) -> None:
+        """
+        Регистрирует тип отчета без импорта его модуля.
+
+        :param report_type: Тип отчета
+        :param import_path: Путь к классу отчета: "модуль:Класс"
+        """
+        cls._reports[report_type] = import_path
+
     @classmethod
     def get_available_reports(cls) -> list[str]:
         """Возвращает список доступных отчетов."""
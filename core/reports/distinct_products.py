@@ -0,0 +1,30 @@
+from core.models import BrandStatistics
+
+from .base import Report
+
+
+class DistinctProductsReport(Report):
+    """Отчет по количеству уникальных продуктов брендов."""
+
+    columns = ("brand", "distinct_products", "product_count")
+
+    @property
+    def name(self) -> str:
+        return "distinct-products"
+
+    def generate(self, data: list[BrandStatistics]) -> str:
+        from tabulate import tabulate
+
+        table_data = []
+        for index, stats in enumerate(data, start=1):
+            table_data.append(
+                [index, stats.brand, stats.distinct_products, stats.product_count]
+            )
+
+        return tabulate(
+            table_data,
+            headers=["", "brand", "distinct products", "products"],
+            tablefmt="grid",
+            stralign="center",
+            numalign="center",
+        )
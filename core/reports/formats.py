@@ -0,0 +1,185 @@
+"""
+Форматы вывода отчетов: таблица для чтения человеком и машиночитаемые
+форматы, которые записываются в поток построчно.
+"""
+
+import contextlib
+import csv
+import importlib
+import json
+import os
+import sys
+from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from typing import IO, TYPE_CHECKING, Any
+
+from .base import Report
+
+if TYPE_CHECKING:
+    from core.models import BrandStatistics
+
+DEFAULT_FORMAT = "grid"
+
+# Количество строк в одном блоке (row group) Parquet
+_PARQUET_BATCH_ROWS = 64 * 1024
+
+
+class ReportWriter(ABC):
+    """
+    Абстрактный базовый класс для форматов вывода отчета.
+
+    Машиночитаемые форматы выводят колонки Report.columns и пишут строки
+    в поток по мере получения, не собирая весь отчет в одну строку.
+    """
+
+    # Формат пишет в бинарный поток
+    binary = False
+
+    @abstractmethod
+    def write(
+        self, report: Report, data: Iterable["BrandStatistics"], output: IO[Any]
+    ) -> None:
+        """
+        Записывает отчет в поток.
+
+        :param report: Отчет, определяющий колонки и таблицу
+        :param data: Статистики брендов в порядке отчета
+        :param output: Текстовый (или бинарный, если binary) поток
+        """
+        pass
+
+
+class GridReportWriter(ReportWriter):
+    """Таблица отчета (Report.generate), как при выводе по умолчанию."""
+
+    def write(
+        self, report: Report, data: Iterable["BrandStatistics"], output: IO[Any]
+    ) -> None:
+        output.write(report.generate(list(data)))
+        output.write("\n")
+
+
+class CSVReportWriter(ReportWriter):
+    """CSV с заголовком из названий колонок."""
+
+    def write(
+        self, report: Report, data: Iterable["BrandStatistics"], output: IO[Any]
+    ) -> None:
+        writer = csv.writer(output, lineterminator="\n")
+        writer.writerow(report.columns)
+        writer.writerows(report.iter_rows(data))
+
+
+class JSONLinesReportWriter(ReportWriter):
+    """JSON Lines: объект на строку."""
+
+    def write(
+        self, report: Report, data: Iterable["BrandStatistics"], output: IO[Any]
+    ) -> None:
+        columns = report.columns
+        for row in report.iter_rows(data):
+            output.write(
+                json.dumps(dict(zip(columns, row, strict=True)), ensure_ascii=False)
+            )
+            output.write("\n")
+
+
+class ParquetReportWriter(ReportWriter):
+    """
+    Parquet (требует pyarrow). Строки записываются блоками по
+    _PARQUET_BATCH_ROWS, поэтому в памяти не больше одного блока.
+    """
+
+    binary = True
+
+    def __init__(self) -> None:
+        """
+        :raise ValueError: Если pyarrow не установлен
+        """
+        # Проверяется при создании, до чтения данных
+        try:
+            self._pa = importlib.import_module("pyarrow")
+            self._pq = importlib.import_module("pyarrow.parquet")
+        except ImportError as e:
+            raise ValueError("Format parquet requires pyarrow: %s" % e) from None
+
+    def write(
+        self, report: Report, data: Iterable["BrandStatistics"], output: IO[Any]
+    ) -> None:
+        pa, pq = self._pa, self._pq
+        columns = report.columns
+        rows = report.iter_rows(data)
+        writer = None
+        try:
+            while batch := list(islice(rows, _PARQUET_BATCH_ROWS)):
+                table = pa.Table.from_pylist(
+                    [dict(zip(columns, row, strict=True)) for row in batch]
+                )
+                if writer is None:
+                    writer = pq.ParquetWriter(output, table.schema)
+                writer.write_table(table)
+            if writer is None:
+                # Пустой отчет: файл только со схемой
+                empty = pa.Table.from_pydict({column: [] for column in columns})
+                writer = pq.ParquetWriter(output, empty.schema)
+        finally:
+            if writer is not None:
+                writer.close()
+
+
+class ReportWriterFactory:
+    """Фабрика форматов вывода отчетов."""
+
+    _writers: dict[str, type[ReportWriter]] = {}
+
+    @classmethod
+    def create(cls, output_format: str) -> ReportWriter:
+        """Создает формат вывода по названию."""
+        if output_format not in cls._writers:
+            raise ValueError("Unknown output format: %s" % output_format)
+        return cls._writers[output_format]()
+
+    @classmethod
+    def register(cls, output_format: str, writer_class: type[ReportWriter]) -> None:
+        """Регистрирует новый формат вывода."""
+        cls._writers[output_format] = writer_class
+
+    @classmethod
+    def get_available_formats(cls) -> list[str]:
+        """Возвращает список доступных форматов."""
+        return list(cls._writers.keys())
+
+
+@contextlib.contextmanager
+def open_output(path: str | None, binary: bool = False) -> Iterator[IO[Any]]:
+    """
+    Открывает поток вывода отчета: файл или стандартный вывод.
+
+    :param path: Путь к файлу или None для stdout
+    :param binary: Открыть бинарный поток
+    """
+    if path is None:
+        stream: IO[Any] = sys.stdout.buffer if binary else sys.stdout
+        yield stream
+        stream.flush()
+        return
+
+    if binary:
+        with open(path, "wb") as file:
+            yield file
+    else:
+        with open(path, "w", encoding="utf-8", newline="") as text:
+            yield text
+
+
+def report_output_path(path: str, report_type: str) -> str:
+    """
+    Возвращает путь к файлу одного из нескольких отчетов: имя отчета
+    добавляется перед расширением (report.csv -> report.average-rating.csv).
+
+    :param path: Общий путь вывода отчетов
+    :param report_type: Тип отчета
+    """
+    root, extension = os.path.splitext(path)
+    return "%s.%s%s" % (root, report_type, extension)
@@ -0,0 +1,43 @@
+from core.models import BrandStatistics
+
+from .base import Report
+
+
+class PriceBandsReport(Report):
+    """Отчет по средним рейтингам брендов в ценовых диапазонах."""
+
+    columns = (
+        "brand",
+        "price_band",
+        "average_rating",
+        "product_count",
+        "average_price",
+    )
+
+    @property
+    def name(self) -> str:
+        return "price-bands"
+
+    def generate(self, data: list[BrandStatistics]) -> str:
+        from tabulate import tabulate
+
+        table_data = []
+        for index, stats in enumerate(data, start=1):
+            table_data.append(
+                [
+                    index,
+                    stats.brand,
+                    stats.price_band,
+                    stats.average_rating,
+                    stats.product_count,
+                    stats.average_price,
+                ]
+            )
+
+        return tabulate(
+            table_data,
+            headers=["", "brand", "price band", "rating", "products", "price"],
+            tablefmt="grid",
+            stralign="center",
+            numalign="center",
+        )
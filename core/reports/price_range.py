@@ -0,0 +1,44 @@
+from core.models import BrandStatistics
+
+from .base import Report
+
+
+class PriceRangeReport(Report):
+    """Отчет по минимальной, средней и максимальной цене брендов."""
+
+    columns = ("brand", "min_price", "average_price", "max_price", "product_count")
+
+    @property
+    def name(self) -> str:
+        return "price-range"
+
+    def generate(self, data: list[BrandStatistics]) -> str:
+        from tabulate import tabulate
+
+        table_data = []
+        for index, stats in enumerate(data, start=1):
+            table_data.append(
+                [
+                    index,
+                    stats.brand,
+                    stats.min_price,
+                    stats.average_price,
+                    stats.max_price,
+                    stats.product_count,
+                ]
+            )
+
+        return tabulate(
+            table_data,
+            headers=[
+                "",
+                "brand",
+                "min price",
+                "average price",
+                "max price",
+                "products",
+            ],
+            tablefmt="grid",
+            stralign="center",
+            numalign="center",
+        )
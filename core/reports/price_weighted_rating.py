@@ -0,0 +1,36 @@
+from core.models import BrandStatistics
+
+from .base import Report
+
+
+class PriceWeightedRatingReport(Report):
+    """Отчет по рейтингам брендов, взвешенным по цене продуктов."""
+
+    columns = ("brand", "weighted_rating", "average_rating", "product_count")
+
+    @property
+    def name(self) -> str:
+        return "price-weighted-rating"
+
+    def generate(self, data: list[BrandStatistics]) -> str:
+        from tabulate import tabulate
+
+        table_data = []
+        for index, stats in enumerate(data, start=1):
+            table_data.append(
+                [
+                    index,
+                    stats.brand,
+                    stats.weighted_rating,
+                    stats.average_rating,
+                    stats.product_count,
+                ]
+            )
+
+        return tabulate(
+            table_data,
+            headers=["", "brand", "weighted rating", "rating", "products"],
+            tablefmt="grid",
+            stralign="center",
+            numalign="center",
+        )
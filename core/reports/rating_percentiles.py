@@ -0,0 +1,36 @@
+from core.models import BrandStatistics
+
+from .base import Report
+
+
+class RatingPercentilesReport(Report):
+    """Отчет по медиане и 90-му перцентилю рейтингов брендов."""
+
+    columns = ("brand", "median_rating", "p90_rating", "product_count")
+
+    @property
+    def name(self) -> str:
+        return "rating-percentiles"
+
+    def generate(self, data: list[BrandStatistics]) -> str:
+        from tabulate import tabulate
+
+        table_data = []
+        for index, stats in enumerate(data, start=1):
+            table_data.append(
+                [
+                    index,
+                    stats.brand,
+                    stats.median_rating,
+                    stats.p90_rating,
+                    stats.product_count,
+                ]
+            )
+
+        return tabulate(
+            table_data,
+            headers=["", "brand", "median", "p90", "products"],
+            tablefmt="grid",
+            stralign="center",
+            numalign="center",
+        )
@@ -0,0 +1,389 @@
+"""
+Сервер отчетов: данные читаются один раз, хранятся в памяти в виде индекса
+статистик по брендам и обновляются при изменении входных файлов.
+"""
+
+import functools
+import json
+import os
+import socket
+import socketserver
+import stat
+import threading
+import time
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any
+from urllib.parse import unquote, urlsplit
+
+from core.debug import debug_print, error_print
+from core.models import BrandStatistics
+from core.reports import ReportFactory
+
+if TYPE_CHECKING:
+    from core.analyzer import BrandRatingAnalyzer
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Период проверки входных файлов в секундах
+DEFAULT_WATCH_INTERVAL = 1.0
+
+FileSignature = tuple[tuple[int, int] | None, ...]
+
+
+def files_signature(file_paths: Sequence[str]) -> FileSignature:
+    """
+    Возвращает признаки изменения файлов: размер и mtime каждого файла.
+
+    :param file_paths: Пути к файлам
+    :return: Кортеж (size, mtime_ns) по файлам, None для отсутствующих
+    """
+    signature: list[tuple[int, int] | None] = []
+    for file_path in file_paths:
+        try:
+            file_stat = os.stat(file_path)
+        except FileNotFoundError:
+            signature.append(None)
+        else:
+            signature.append((file_stat.st_size, file_stat.st_mtime_ns))
+    return tuple(signature)
+
+
+def statistics_to_dict(statistics: BrandStatistics) -> dict[str, Any]:
+    """Возвращает статистику бренда в виде словаря без незаполненных метрик."""
+    return {
+        key: value for key, value in asdict(statistics).items() if value is not None
+    }
+
+
+@dataclass(frozen=True)
+class ReportSnapshot:
+    """Рассчитанный отчет: статистики, индекс по брендам и готовый текст."""
+
+    statistics: list[BrandStatistics]
+    # Строки отчета по брендам (в price-bands - строка на каждый диапазон цен)
+    brands: dict[str, list[BrandStatistics]]
+    text: str
+
+
+class BrandIndex:
+    """
+    Индекс статистик брендов в памяти для набора файлов и типов отчетов.
+
+    Отчеты рассчитываются при refresh и сразу генерируются через
+    ReportFactory, поэтому запрос к индексу - только поиск в словаре.
+    Новые данные подменяют старые одной операцией присваивания: читатели
+    видят либо прежний, либо новый набор отчетов целиком. Для повторных
+    расчетов анализатору нужен кэш контрольных точек (например,
+    MemoryCache): тогда дочитываются только дописанные в файлы записи.
+    """
+
+    def __init__(
+        self,
+        analyzer: "BrandRatingAnalyzer",
+        file_paths: Sequence[str],
+        report_types: Sequence[str],
+        top: int | None = None,
+        min_products: int = 1,
+    ) -> None:
+        """
+        :param analyzer: Анализатор, которым рассчитываются статистики
+        :param file_paths: Пути к CSV файлам
+        :param report_types: Типы отчетов, которые поддерживает индекс
+        :param top: Сколько первых брендов хранить в отчетах (None - все)
+        :param min_products: Минимальное количество продуктов бренда в отчетах
+
+        :raise ValueError: Если тип отчета неизвестен
+        """
+        available = ReportFactory.get_available_reports()
+        for report_type in report_types:
+            if report_type not in available:
+                raise ValueError("Unknown report type: %s" % report_type)
+
+        self.analyzer = analyzer
+        self.file_paths = list(file_paths)
+        self.report_types = list(report_types)
+        self.top = top
+        self.min_products = min_products
+        self.signature: FileSignature | None = None
+        self.updated_at: float | None = None
+        self._snapshots: dict[str, ReportSnapshot] = {}
+        self._refresh_lock = threading.Lock()
+
+    def refresh(self, force: bool = False) -> bool:
+        """
+        Пересчитывает отчеты, если файлы изменились с прошлого расчета.
+
+        При ошибке чтения индекс сохраняет прежние данные; повторный
+        расчет выполняется после следующего изменения файлов.
+
+        :param force: Пересчитать независимо от признаков изменения файлов
+        :return: True, если отчеты пересчитаны
+
+        :raises
+            FileNotFoundError: Если файл не найден
+            ValueError: Если данные некорректны
+        """
+        with self._refresh_lock:
+            signature = files_signature(self.file_paths)
+            if not force and signature == self.signature:
+                return False
+
+            # Признаки берутся до чтения: изменение файлов во время расчета
+            # будет обнаружено при следующей проверке
+            self.signature = signature
+            snapshots = {}
+            # Все отчеты считаются за одно чтение файлов
+            results = self.analyzer.calculate_statistics_each(
+                self.file_paths, self.report_types, self.top, self.min_products
+            )
+            for report_type, statistics in zip(self.report_types, results, strict=True):
+                brands: dict[str, list[BrandStatistics]] = {}
+                for item in statistics:
+                    brands.setdefault(item.brand, []).append(item)
+                snapshots[report_type] = ReportSnapshot(
+                    statistics=statistics,
+                    brands=brands,
+                    text=ReportFactory.create(report_type).generate(statistics),
+                )
+
+            self._snapshots = snapshots
+            self.updated_at = time.time()
+            debug_print("Индекс обновлен: %s", ", ".join(self.report_types))
+            return True
+
+    def get_snapshot(self, report_type: str) -> ReportSnapshot:
+        """
+        Возвращает последний рассчитанный отчет.
+
+        :param report_type: Тип отчета
+        :return: Снимок отчета
+
+        :raise KeyError: Если отчет не поддерживается индексом или еще не рассчитан
+        """
+        return self._snapshots[report_type]
+
+
+class FileWatcher(threading.Thread):
+    """Фоновый поток, периодически обновляющий индекс при изменении файлов."""
+
+    def __init__(
+        self, index: BrandIndex, interval: float = DEFAULT_WATCH_INTERVAL
+    ) -> None:
+        super().__init__(name="file-watcher", daemon=True)
+        self.index = index
+        self.interval = interval
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.index.refresh()
+            except Exception as e:
+                error_print("Ошибка обновления данных: %s", e)
+
+    def stop(self) -> None:
+        """Останавливает наблюдение за файлами."""
+        self._stopped.set()
+
+
+class ReportRequestHandler(BaseHTTPRequestHandler):
+    """
+    Обработчик HTTP запросов к индексу:
+
+    - GET /health - состояние сервера;
+    - GET /reports - список отчетов;
+    - GET /reports/<type> - отчет в текстовом виде (ReportFactory);
+    - GET /reports/<type>/brands - статистики брендов в JSON;
+    - GET /reports/<type>/brands/<brand> - строки отчета одного бренда в JSON.
+    """
+
+    protocol_version = "HTTP/1.1"  # Соединения переиспользуются клиентами
+
+    def __init__(self, *args: Any, index: BrandIndex, **kwargs: Any) -> None:
+        self.index = index
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self) -> None:
+        parts = [unquote(part) for part in urlsplit(self.path).path.split("/") if part]
+
+        if parts == ["health"]:
+            self._send_json(
+                {
+                    "status": "ok",
+                    "files": self.index.file_paths,
+                    "updated_at": self.index.updated_at,
+                }
+            )
+            return
+
+        if parts == ["reports"]:
+            self._send_json({"reports": self.index.report_types})
+            return
+
+        if len(parts) in (2, 3, 4) and parts[0] == "reports":
+            self._send_report(parts[1], parts[2:])
+            return
+
+        self._send_error(HTTPStatus.NOT_FOUND, "Unknown path: %s" % self.path)
+
+    def _send_report(self, report_type: str, parts: list[str]) -> None:
+        try:
+            snapshot = self.index.get_snapshot(report_type)
+        except KeyError:
+            self._send_error(
+                HTTPStatus.NOT_FOUND, "Unknown report type: %s" % report_type
+            )
+            return
+
+        if not parts:
+            self._send(HTTPStatus.OK, "text/plain; charset=utf-8", snapshot.text)
+            return
+        if parts == ["brands"]:
+            self._send_json([statistics_to_dict(item) for item in snapshot.statistics])
+            return
+        if parts[0] != "brands":
+            self._send_error(HTTPStatus.NOT_FOUND, "Unknown path: %s" % self.path)
+            return
+
+        # Бренд запроса нормализуется тем же normalizer, что и при чтении,
+        # поэтому псевдоним ("Apple Inc.") находит канонический бренд
+        normalize = self.index.analyzer.reader.normalizer.normalize
+        rows = snapshot.brands.get(normalize(parts[1]))
+        if rows is None:
+            self._send_error(HTTPStatus.NOT_FOUND, "Unknown brand: %s" % parts[1])
+        else:
+            self._send_json([statistics_to_dict(item) for item in rows])
+
+    def _send_json(self, data: Any) -> None:
+        self._send(
+            HTTPStatus.OK,
+            "application/json",
+            json.dumps(data, ensure_ascii=False),
+        )
+
+    def _send_error(self, status: HTTPStatus, message: str) -> None:
+        self._send(
+            status,
+            "application/json",
+            json.dumps({"error": message}, ensure_ascii=False),
+        )
+
+    def _send(self, status: HTTPStatus, content_type: str, body: str) -> None:
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def address_string(self) -> str:
+        # У клиентов Unix сокета нет адреса
+        if isinstance(self.client_address, tuple):
+            return super().address_string()
+        return "unix"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        debug_print("%s - " + format, self.address_string(), *args)
+
+
+if hasattr(socketserver, "ThreadingUnixStreamServer"):
+
+    class _UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+        """HTTP поверх Unix сокета."""
+
+        daemon_threads = True
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """
+    Удаляет файл сокета, оставшийся от завершенного сервера.
+
+    :raise ValueError: Если путь занят другим файлом или работающим сервером
+    """
+    try:
+        mode = os.stat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise ValueError("%s exists and is not a socket" % socket_path)
+
+    with socket.socket(socket.AF_UNIX) as probe:
+        try:
+            probe.connect(socket_path)
+        except OSError:
+            os.unlink(socket_path)
+            return
+    raise ValueError("Socket %s is already in use" % socket_path)
+
+
+class ReportServer:
+    """
+    Сервер отчетов по индексу: HTTP на локальном TCP порту или Unix сокете
+    и наблюдение за входными файлами.
+    """
+
+    def __init__(
+        self,
+        index: BrandIndex,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        socket_path: str | None = None,
+        watch_interval: float = DEFAULT_WATCH_INTERVAL,
+    ) -> None:
+        """
+        :param index: Индекс с рассчитанными отчетами
+        :param host: Адрес TCP сервера
+        :param port: Порт TCP сервера (0 - свободный порт)
+        :param socket_path: Путь к Unix сокету вместо TCP
+        :param watch_interval: Период проверки входных файлов в секундах
+
+        :raise ValueError: Если Unix сокет недоступен или занят
+        """
+        self.index = index
+        self.socket_path = socket_path
+        handler = functools.partial(ReportRequestHandler, index=index)
+
+        self.httpd: socketserver.TCPServer
+        if socket_path is None:
+            self.httpd = ThreadingHTTPServer((host, port), handler)
+        elif not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            raise ValueError("Unix sockets are not supported on this platform")
+        else:
+            _remove_stale_socket(socket_path)
+            self.httpd = _UnixHTTPServer(socket_path, handler)
+
+        self.watcher = FileWatcher(index, watch_interval)
+
+    @property
+    def address(self) -> str:
+        """Адрес, на котором сервер принимает запросы."""
+        if self.socket_path is not None:
+            return "unix:%s" % self.socket_path
+        host, port = self.httpd.socket.getsockname()[:2]
+        return "http://%s:%d" % (host, port)
+
+    def serve_forever(self) -> None:
+        """Обслуживает запросы до вызова shutdown (из другого потока)."""
+        self.watcher.start()
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.close()
+
+    def shutdown(self) -> None:
+        """Останавливает обслуживание запросов."""
+        self.httpd.shutdown()
+
+    def close(self) -> None:
+        """Освобождает сокет и останавливает наблюдение за файлами."""
+        self.watcher.stop()
+        self.httpd.server_close()
+        if self.socket_path is not None:
+            try:
+                os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,218 @@
+"""
+Вероятностные структуры (скетчи) фиксированного размера для приближенных
+статистик: квантили (KLL) и число уникальных значений (HyperLogLog).
+
+Скетчи объединяются через merge() и сериализуются через pickle, поэтому
+подходят для частичных состояний калькуляторов: их можно считать
+в разных процессах, хранить в кэше и сливать в любом порядке.
+"""
+
+import hashlib
+import math
+from collections.abc import Iterable
+
+# Параметр точности KLL: ошибка ранга порядка 1.7 / k (около 1% при k = 200)
+DEFAULT_KLL_K = 200
+
+# Точность HyperLogLog: 2 ** p регистров, стандартная ошибка 1.04 / sqrt(2 ** p)
+DEFAULT_HLL_PRECISION = 12
+
+_KLL_CAPACITY_DECAY = 2 / 3
+
+
+class KLLSketch:
+    """
+    Скетч квантилей KLL (Karnin, Lang, Liberty, 2016).
+
+    Значения хранятся в уровнях-компакторах: элемент уровня h представляет
+    2 ** h исходных значений. Переполненный уровень сортируется, и каждый
+    второй элемент переходит на уровень выше. Вместимость уровней убывает
+    геометрически вниз от верхнего, поэтому размер скетча - O(k) значений
+    независимо от их числа, а пока значений меньше вместимости нижнего
+    уровня, квантили точные.
+
+    Четность сжатия чередуется детерминированно (а не случайно), поэтому
+    одинаковые данные в одинаковом порядке всегда дают одинаковый результат.
+    """
+
+    __slots__ = ("k", "count", "_levels", "_size", "_max_size", "_compactions")
+
+    def __init__(self, k: int = DEFAULT_KLL_K) -> None:
+        """
+        :param k: Вместимость верхнего уровня (точность скетча)
+
+        :raise ValueError: Если k < 2
+        """
+        if k < 2:
+            raise ValueError("KLL parameter k must be >= 2, got %d" % k)
+        self.k = k
+        self.count = 0  # Количество добавленных значений
+        self._levels: list[list[float]] = [[]]
+        self._size = 0  # Количество хранимых значений
+        self._max_size = self._capacity(0)
+        self._compactions = 0
+
+    def add(self, value: float) -> None:
+        """Добавляет значение."""
+        self._levels[0].append(value)
+        self.count += 1
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def update(self, values: Iterable[float]) -> None:
+        """Добавляет значения."""
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """
+        Добавляет в скетч значения другого скетча.
+
+        :param other: Присоединяемый скетч (не изменяется)
+        :return: Текущий скетч
+        """
+        while len(self._levels) < len(other._levels):
+            self._grow()
+        for level, items in zip(self._levels, other._levels, strict=False):
+            level.extend(items)
+        self.count += other.count
+        self._size += other._size
+        while self._size >= self._max_size:
+            self._compress()
+        return self
+
+    def quantile(self, q: float) -> float:
+        """
+        Возвращает приближенный квантиль (по ближайшему рангу: наименьшее
+        значение, не меньше которого q-я доля значений).
+
+        :param q: Доля от 0 до 1
+        :return: Значение квантиля
+
+        :raise ValueError: Если q вне [0, 1] или скетч пуст
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1, got %s" % q)
+        if not self.count:
+            raise ValueError("Quantile of an empty sketch")
+
+        weighted = sorted(
+            (value, 1 << height)
+            for height, level in enumerate(self._levels)
+            for value in level
+        )
+        # Вес хранимых значений равен count: сжатие сохраняет суммарный вес
+        target = max(1, math.ceil(q * self.count))
+        rank = 0
+        for value, weight in weighted:
+            rank += weight
+            if rank >= target:
+                return value
+        return weighted[-1][0]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _capacity(self, height: int) -> int:
+        depth = len(self._levels) - height - 1
+        return max(2, math.ceil(self.k * _KLL_CAPACITY_DECAY**depth))
+
+    def _grow(self) -> None:
+        self._levels.append([])
+        self._max_size = sum(self._capacity(h) for h in range(len(self._levels)))
+
+    def _compress(self) -> None:
+        """Сжимает нижний переполненный уровень в следующий."""
+        for height, level in enumerate(self._levels):
+            if len(level) < self._capacity(height):
+                continue
+            if height + 1 == len(self._levels):
+                self._grow()
+
+            level.sort()
+            # Нечетный элемент остается на уровне, остальные - парами
+            odd = level.pop() if len(level) % 2 else None
+            offset = self._compactions & 1
+            self._compactions += 1
+            self._levels[height + 1].extend(level[offset::2])
+            self._size -= len(level) // 2
+            level.clear()
+            if odd is not None:
+                level.append(odd)
+            return
+
+
+class HyperLogLog:
+    """
+    Скетч HyperLogLog (Flajolet и др., 2007) для оценки числа уникальных
+    строк.
+
+    Хранит 2 ** precision однобайтовых регистров: максимальную позицию
+    первой единицы в 64-битных хэшах значений, попавших в регистр.
+    Малые количества оцениваются по числу пустых регистров (linear
+    counting), поэтому для небольших наборов оценка практически точная.
+    Хэш (BLAKE2b) не зависит от PYTHONHASHSEED, поэтому скетчи из разных
+    процессов и из кэша можно объединять.
+    """
+
+    __slots__ = ("precision", "registers")
+
+    def __init__(self, precision: int = DEFAULT_HLL_PRECISION) -> None:
+        """
+        :param precision: Количество бит хэша, выбирающих регистр (4..16)
+
+        :raise ValueError: Если precision вне диапазона
+        """
+        if not 4 <= precision <= 16:
+            raise ValueError(
+                "HLL precision must be between 4 and 16, got %d" % precision
+            )
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value: str) -> None:
+        """Добавляет строку."""
+        hashed = int.from_bytes(
+            hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        bits = 64 - self.precision
+        index = hashed >> bits
+        rank = bits - (hashed & ((1 << bits) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values: Iterable[str]) -> None:
+        """Добавляет строки."""
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """
+        Объединяет множества скетчей (поэлементный максимум регистров).
+
+        :param other: Присоединяемый скетч той же точности (не изменяется)
+        :return: Текущий скетч
+
+        :raise ValueError: Если точность скетчей различается
+        """
+        if other.precision != self.precision:
+            raise ValueError(
+                "Cannot merge HLL sketches with precision %d and %d"
+                % (self.precision, other.precision)
+            )
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def count(self) -> int:
+        """Возвращает оценку числа уникальных строк."""
+        size = len(self.registers)
+        zeros = self.registers.count(0)
+        if zeros == size:
+            return 0
+
+        alpha = 0.7213 / (1 + 1.079 / size)
+        estimate = alpha * size * size / sum(2.0**-rank for rank in self.registers)
+        if estimate <= 2.5 * size and zeros:
+            estimate = size * math.log(size / zeros)
+        return round(estimate)
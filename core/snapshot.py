@@ -0,0 +1,267 @@
+"""
+Колоночный бинарный снимок продуктов.
+
+Снимок создается из CSV файлов один раз (main.py --convert) и хранит уже
+проверенные и преобразованные продукты, поэтому при анализе строки не
+разбираются. Файл отображается в память (mmap): цены, рейтинги и коды
+названий становятся колонками ProductTable без копирования (memoryview над
+отображением, которое живет, пока на него ссылается таблица). Колонки вне
+проекции читателя не читаются; декодируются только словари строк, а коды
+брендов восстанавливаются из диапазонов строк. На big-endian платформе
+колонки копируются с перестановкой байтов.
+
+Формат (little-endian, секции выровнены по 8 байт):
+
+- заголовок _HEADER: сигнатура, версия, количество строк, брендов
+  и названий, размеры текстов словарей в байтах;
+- смещения брендов: (brands + 1) x uint64. Строки отсортированы по бренду
+  (устойчиво, бренды в порядке первого появления), поэтому закодированная
+  словарем колонка брендов хранится диапазонами строк: строки бренда
+  с кодом code - [offsets[code], offsets[code + 1]);
+- словарь брендов: (brands + 1) x uint64 смещений в символах и текст UTF-8;
+- словарь названий в том же виде;
+- коды названий: rows x uint32;
+- цены и рейтинги: rows x float64.
+
+Порядок строк бренда сохраняется, поэтому суммы рейтингов бренда
+совпадают с расчетом по исходным CSV файлам до бита. В снимок попадают
+только строки, корректные во всех колонках (как при чтении CSV без
+проекции).
+"""
+
+import contextlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections.abc import Iterable
+from itertools import pairwise
+from math import nan
+from typing import BinaryIO, Literal
+
+from core.models import PRODUCT_COLUMNS, Column, Product, ProductTable
+
+_MAGIC = b"BRSN"
+_VERSION = 1
+# Сигнатура, версия, строки, бренды, названия, байты текстов брендов и названий
+_HEADER = struct.Struct("<4sIQIIQQ")
+_ALIGNMENT = 8
+_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def is_snapshot(file_path: str) -> bool:
+    """
+    Возвращает True, если файл начинается с сигнатуры снимка.
+
+    Отсутствующий файл снимком не считается: ошибку сообщит его чтение.
+    """
+    try:
+        with open(file_path, "rb") as file:
+            return file.read(len(_MAGIC)) == _MAGIC
+    except OSError:
+        return False
+
+
+def write_snapshot(file_path: str, products: Iterable[Product]) -> int:
+    """
+    Записывает продукты в снимок. Существующий файл заменяется атомарно.
+
+    :param file_path: Путь к файлу снимка
+    :param products: Проверенные продукты со всеми колонками
+
+    :return: Количество записанных продуктов
+    """
+    # Колонки строк каждого бренда: коды названий, цены, рейтинги
+    brands: dict[str, tuple[array, array, array]] = {}
+    names: dict[str, int] = {}
+    for product in products:
+        columns = brands.get(product.brand)
+        if columns is None:
+            columns = brands[product.brand] = (array("I"), array("d"), array("d"))
+        code = names.get(product.name)
+        if code is None:
+            code = names[product.name] = len(names)
+        columns[0].append(code)
+        columns[1].append(product.price)
+        columns[2].append(product.rating)
+
+    offsets = array("Q", [0])
+    name_codes, prices, ratings = array("I"), array("d"), array("d")
+    for brand_names, brand_prices, brand_ratings in brands.values():
+        name_codes.extend(brand_names)
+        prices.extend(brand_prices)
+        ratings.extend(brand_ratings)
+        offsets.append(len(ratings))
+
+    brand_offsets, brand_text = _encode_strings(brands)
+    name_offsets, name_text = _encode_strings(names)
+    header = _HEADER.pack(
+        _MAGIC,
+        _VERSION,
+        len(ratings),
+        len(brands),
+        len(names),
+        len(brand_text),
+        len(name_text),
+    )
+    sections = (
+        offsets,
+        brand_offsets,
+        brand_text,
+        name_offsets,
+        name_text,
+        name_codes,
+        prices,
+        ratings,
+    )
+
+    # Запись через временный файл, чтобы не оставить недописанный снимок
+    # (права доступа по umask, как у обычного файла)
+    temp_path = "%s.%d.tmp" % (file_path, os.getpid())
+    try:
+        with open(temp_path, "wb") as file:
+            file.write(header)
+            for section in sections:
+                _write_section(file, section)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(temp_path)
+        raise
+    return len(ratings)
+
+
+def read_snapshot(
+    file_path: str, columns: Iterable[str] = PRODUCT_COLUMNS
+) -> ProductTable:
+    """
+    Читает снимок в колоночную таблицу.
+
+    Колонки вне проекции не читаются с диска и заполняются значениями
+    по умолчанию, как при чтении CSV (name - "", price и rating - nan).
+
+    :param file_path: Путь к файлу снимка
+    :param columns: Читаемые колонки из PRODUCT_COLUMNS
+
+    :return: Таблица продуктов, строки отсортированы по бренду
+
+    :raises
+        FileNotFoundError: Если файл не найден
+        ValueError: Если файл не является снимком или поврежден
+    """
+    columns = set(columns)
+    with open(file_path, "rb") as file:
+        if os.fstat(file.fileno()).st_size < _HEADER.size:
+            raise ValueError("File %s is not a snapshot" % file_path)
+        # Отображение не закрывается явно: на него ссылаются колонки таблицы,
+        # и оно освобождается вместе с ними
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    return _SnapshotSections(memoryview(data), file_path).read_table(columns)
+
+
+class _SnapshotSections:
+    """Последовательное чтение секций отображенного в память снимка."""
+
+    def __init__(self, view: memoryview, file_path: str) -> None:
+        self.view = view
+        self.file_path = file_path
+        self.position = _HEADER.size
+
+    def read_table(self, columns: set[str]) -> ProductTable:
+        (
+            magic,
+            version,
+            rows,
+            brand_count,
+            name_count,
+            brand_text_size,
+            name_text_size,
+        ) = _HEADER.unpack_from(self.view)
+        if magic != _MAGIC:
+            raise ValueError("File %s is not a snapshot" % self.file_path)
+        if version != _VERSION:
+            raise ValueError(
+                "Unsupported snapshot version %d in file %s" % (version, self.file_path)
+            )
+
+        row_offsets = self.values("Q", brand_count + 1)
+        if row_offsets[0] != 0 or row_offsets[-1] != rows:
+            raise ValueError("Snapshot %s is corrupted" % self.file_path)
+        brands = self.strings(brand_count, brand_text_size)
+        brand_codes = array("I")
+        for code, (start, end) in enumerate(pairwise(row_offsets)):
+            brand_codes.extend(array("I", (code,)) * (end - start))
+
+        if "name" in columns:
+            names = self.strings(name_count, name_text_size)
+            name_codes = self.values("I", rows)
+        else:
+            for size in (8 * (name_count + 1), name_text_size, 4 * rows):
+                self.skip(size)
+            names, name_codes = [""], array("I", bytes(4 * rows))
+
+        prices = self.column("price" in columns, rows)
+        ratings = self.column("rating" in columns, rows)
+        return ProductTable.from_columns(
+            names, brands, name_codes, brand_codes, prices, ratings
+        )
+
+    def values(self, typecode: Literal["I", "Q", "d"], count: int) -> Column:
+        """
+        Возвращает следующую секцию как memoryview над отображением
+        (на big-endian платформе - копию в array).
+        """
+        values = array(typecode)
+        section = self._take(values.itemsize * count)
+        if _LITTLE_ENDIAN:
+            return section.cast(typecode)
+        values.frombytes(section)
+        values.byteswap()
+        return values
+
+    def strings(self, count: int, text_size: int) -> list[str]:
+        """Читает словарь строк: смещения в символах и текст UTF-8."""
+        offsets = self.values("Q", count + 1)
+        text = str(self._take(text_size), "utf-8")
+        return [text[start:end] for start, end in pairwise(offsets)]
+
+    def column(self, selected: bool, rows: int) -> Column:
+        """Читает колонку float64 или пропускает ее (значения nan)."""
+        if selected:
+            return self.values("d", rows)
+        self.skip(8 * rows)
+        return array("d", (nan,)) * rows
+
+    def skip(self, size: int) -> None:
+        self._take(size)
+
+    def _take(self, size: int) -> memoryview:
+        start = self.position
+        end = start + size
+        if end > len(self.view):
+            raise ValueError("Snapshot %s is truncated" % self.file_path)
+        self.position = end + -end % _ALIGNMENT
+        return self.view[start:end]
+
+
+def _encode_strings(values: Iterable[str]) -> tuple[array, bytes]:
+    """Кодирует словарь строк: смещения в символах и текст UTF-8."""
+    offsets = array("Q", [0])
+    parts = []
+    length = 0
+    for value in values:
+        parts.append(value)
+        length += len(value)
+        offsets.append(length)
+    return offsets, "".join(parts).encode("utf-8")
+
+
+def _write_section(file: BinaryIO, section: array | bytes) -> None:
+    """Записывает секцию в little-endian и дополняет ее до _ALIGNMENT."""
+    if isinstance(section, array) and not _LITTLE_ENDIAN:
+        section = array(section.typecode, section)
+        section.byteswap()
+    data = section.tobytes() if isinstance(section, array) else section
+    file.write(data)
+    file.write(bytes(-len(data) % _ALIGNMENT))
@@ -0,0 +1,145 @@
+"""
+Нормализация брендов: кэш приведения сырых значений к каноническому виду.
+
+Во входных файлах различных брендов обычно несколько тысяч, поэтому
+результат нормализации (strip, lower, псевдонимы) кэшируется по сырому
+значению поля. Кэш ограничен, чтобы файл с миллионами уникальных брендов
+не занимал память без предела. Все сырые значения одного бренда получают
+один и тот же объект строки: словари калькуляторов сравнивают такие ключи
+по ссылке, а хэш строки уже вычислен.
+"""
+
+import csv
+import hashlib
+from collections.abc import Callable, Mapping
+from typing import Any
+
+# Количество сырых значений брендов в кэше нормализации
+DEFAULT_CACHE_SIZE = 64 * 1024
+
+
+class BrandNormalizer:
+    """
+    Приводит бренд к каноническому виду: без пробелов по краям, в нижнем
+    регистре, с заменой псевдонима на бренд (например, "Apple Inc." ->
+    "apple"). Псевдонимы сравниваются после strip и lower и не
+    разворачиваются по цепочке.
+
+    Кэш состоит из двух поколений по max_size / 2 значений. Попадание
+    в текущее поколение - один dict.get без обновления порядка (lookup
+    можно вызывать прямо в цикле чтения). Когда текущее поколение
+    заполнено, оно становится предыдущим, а прежнее предыдущее удаляется;
+    значение из предыдущего поколения при обращении переносится в текущее.
+    Так вытесняются значения, не использованные за последнее поколение
+    (приближенный LRU).
+
+    Объект можно использовать из нескольких потоков (гонка приводит
+    только к повторной нормализации) и передавать в дочерние процессы.
+    """
+
+    # Значение из текущего поколения кэша или None
+    lookup: Callable[[str | bytes], str | None]
+
+    def __init__(
+        self,
+        aliases: Mapping[str, str] | None = None,
+        max_size: int = DEFAULT_CACHE_SIZE,
+    ) -> None:
+        """
+        :param aliases: Псевдонимы брендов: псевдоним -> бренд
+        :param max_size: Количество сырых значений в кэше нормализации
+
+        :raise ValueError: Если псевдоним указывает на пустой бренд
+        """
+        self.aliases: dict[str, str] = {}
+        for alias, brand in (aliases or {}).items():
+            target = _canonical_form(brand)
+            if not target:
+                raise ValueError("Empty brand for alias: %s" % alias)
+            self.aliases[_canonical_form(alias)] = target
+        self.max_size = max_size
+        self._generation_size = max(1, max_size // 2)
+        self._recent: dict[str | bytes, str] = {}
+        self._previous: dict[str | bytes, str] = {}
+        # Канонические строки для интернирования; при переполнении
+        # очищается, на результат это не влияет
+        self._canonical: dict[str, str] = {}
+        self.lookup = self._recent.get
+
+    @property
+    def fingerprint(self) -> str:
+        """Отпечаток псевдонимов для ключей кэша результатов ("" - без них)."""
+        if not self.aliases:
+            return ""
+        digest = hashlib.blake2b(digest_size=8)
+        for alias, brand in sorted(self.aliases.items()):
+            digest.update(("%s\0%s\0" % (alias, brand)).encode("utf-8"))
+        return digest.hexdigest()
+
+    def normalize(self, raw: str | bytes) -> str:
+        """
+        Возвращает канонический бренд.
+
+        :param raw: Значение поля бренда (str или ASCII bytes)
+
+        :return: Канонический бренд ("" для пустого значения)
+        """
+        brand = self._recent.get(raw)
+        if brand is not None:
+            return brand
+
+        brand = self._previous.get(raw)
+        if brand is None:
+            brand = self._canonicalize(raw)
+
+        if len(self._recent) >= self._generation_size:
+            # Текущий словарь не заменяется: на его get ссылается lookup
+            self._previous = self._recent.copy()
+            self._recent.clear()
+        self._recent[raw] = brand
+        return brand
+
+    def _canonicalize(self, raw: str | bytes) -> str:
+        brand = _canonical_form(raw.decode("utf-8") if isinstance(raw, bytes) else raw)
+        brand = self.aliases.get(brand, brand)
+
+        canonical = self._canonical.get(brand)
+        if canonical is None:
+            if len(self._canonical) >= self.max_size:
+                self._canonical.clear()
+            canonical = self._canonical[brand] = brand
+        return canonical
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        # Кэш не сериализуется: в дочернем процессе он заполняется заново
+        return type(self), (self.aliases, self.max_size)
+
+
+def load_brand_aliases(file_path: str) -> dict[str, str]:
+    """
+    Читает псевдонимы брендов из CSV файла с колонками alias и brand.
+
+    :param file_path: Путь к CSV файлу
+
+    :return: Псевдонимы: псевдоним -> бренд
+
+    :raises
+        FileNotFoundError: Если файл не найден
+        ValueError: Если в файле нет колонок alias и brand
+    """
+    with open(file_path, encoding="utf-8", newline="") as file:
+        reader = csv.DictReader(file)
+        missing = {"alias", "brand"}.difference(reader.fieldnames or [])
+        if missing:
+            raise ValueError(
+                "File %s missing required columns: %s" % (file_path, sorted(missing))
+            )
+        return {
+            row["alias"]: row["brand"] or ""
+            for row in reader
+            if (row["alias"] or "").strip()
+        }
+
+
+def _canonical_form(value: str) -> str:
+    return value.strip().lower()
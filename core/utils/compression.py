@@ -0,0 +1,245 @@
+"""
+Утилиты для потокового чтения сжатых входных файлов (gzip, bz2, xz, zstd).
+
+Сжатие определяется по расширению файла, а если расширение не указывает
+на сжатие - по сигнатуре в начале файла. Данные распаковываются потоково,
+без временных файлов. Распаковка может выполняться в фоновом потоке
+(BackgroundReader): zlib, bz2 и lzma освобождают GIL, поэтому она идет
+параллельно с разбором CSV.
+"""
+
+import bz2
+import contextlib
+import gzip
+import importlib
+import io
+import lzma
+import os
+import queue
+import threading
+from collections.abc import Iterator
+from typing import Any, BinaryIO, cast
+
+# Сжатие по расширению файла
+COMPRESSION_EXTENSIONS = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".xz": "xz",
+    ".zst": "zstd",
+    ".zstd": "zstd",
+}
+
+# Сигнатуры сжатых форматов. Для bzip2 проверяется и магическое число
+# первого блока, чтобы текстовый файл, начинающийся с "BZh", не считался
+# сжатым
+_MAGIC_NUMBERS = (
+    (b"\x1f\x8b", "gzip"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+)
+_BZIP2_MAGIC = b"BZh"
+_BZIP2_BLOCK_MAGIC = b"\x31\x41\x59\x26\x53\x59"
+
+# Сколько первых байт файла нужно для определения сжатия по сигнатуре
+MAGIC_SIZE = 10
+
+# Размер блока распаковки и количество блоков в очереди фонового потока
+DEFAULT_BLOCK_SIZE = 256 * 1024
+DEFAULT_QUEUE_SIZE = 4
+
+_EOF = b""
+
+
+def detect_compression(file_path: str, head: bytes | None = None) -> str | None:
+    """
+    Определяет сжатие файла по расширению или сигнатуре.
+
+    :param file_path: Путь к файлу
+    :param head: Первые байты файла; если None, читаются из файла
+
+    :return: gzip, bz2, xz, zstd или None для несжатого файла
+
+    :raise FileNotFoundError: Если сигнатуру нужно прочитать, а файла нет
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    if extension in COMPRESSION_EXTENSIONS:
+        return COMPRESSION_EXTENSIONS[extension]
+
+    if head is None:
+        with open(file_path, "rb") as file:
+            head = file.read(MAGIC_SIZE)
+
+    for magic, compression in _MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return compression
+    if (
+        head.startswith(_BZIP2_MAGIC)
+        and head[3:4].isdigit()
+        and head[4:10] == _BZIP2_BLOCK_MAGIC
+    ):
+        return "bz2"
+    return None
+
+
+def is_compressed(file_path: str) -> bool:
+    """
+    Возвращает True, если файл сжат (см. detect_compression).
+
+    Отсутствующий файл считается несжатым: ошибку сообщит его чтение.
+    """
+    try:
+        return detect_compression(file_path) is not None
+    except OSError:
+        return False
+
+
+def decompress_stream(file: BinaryIO, compression: str) -> BinaryIO:
+    """
+    Оборачивает бинарный поток потоковой распаковкой.
+
+    :param file: Сжатые данные
+    :param compression: gzip, bz2, xz или zstd
+
+    :return: Бинарный поток распакованных данных
+
+    :raise ValueError: Если сжатие неизвестно или для zstd нет библиотеки
+    """
+    if compression == "gzip":
+        return cast(BinaryIO, gzip.GzipFile(fileobj=file, mode="rb"))
+    if compression == "bz2":
+        return cast(BinaryIO, bz2.BZ2File(file, mode="rb"))
+    if compression == "xz":
+        return cast(BinaryIO, lzma.LZMAFile(file, mode="rb"))
+    if compression == "zstd":
+        return _zstd_stream(file)
+    raise ValueError("Unknown compression: %s" % compression)
+
+
+def _zstd_stream(file: BinaryIO) -> BinaryIO:
+    # compression.zstd входит в стандартную библиотеку с Python 3.14
+    try:
+        module: Any = importlib.import_module("compression.zstd")
+        return cast(BinaryIO, module.ZstdFile(file, mode="rb"))
+    except ImportError:
+        pass
+    try:
+        module = importlib.import_module("zstandard")
+    except ImportError as e:
+        raise ValueError("Compression zstd requires zstandard") from e
+    stream = module.ZstdDecompressor().stream_reader(file, read_across_frames=True)
+    return cast(BinaryIO, stream)
+
+
+class BackgroundReader(io.RawIOBase):
+    """
+    Бинарный поток, блоки которого читает из source фоновый поток.
+
+    Очередь блоков ограничена, поэтому фоновый поток опережает читателя
+    не больше чем на queue_size блоков. Ошибка чтения source передается
+    читателю при следующем чтении.
+    """
+
+    def __init__(
+        self,
+        source: BinaryIO,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ) -> None:
+        super().__init__()
+        self._source = source
+        self._block_size = block_size
+        self._queue: queue.Queue[bytes | BaseException] = queue.Queue(queue_size)
+        self._stopped = threading.Event()
+        self._block = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+        self._thread.start()
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        if not self._block and not self._eof:
+            item = self._queue.get()
+            if isinstance(item, BaseException):
+                self._eof = True
+                raise item
+            self._eof = item == _EOF
+            self._block = memoryview(item)
+
+        size = min(len(buffer), len(self._block))
+        buffer[:size] = self._block[:size]
+        self._block = self._block[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._stopped.set()
+            # Фоновый поток мог остаться в ожидании места в очереди
+            with contextlib.suppress(queue.Empty):
+                while True:
+                    self._queue.get_nowait()
+            self._thread.join()
+            self._source.close()
+        super().close()
+
+    def _produce(self) -> None:
+        try:
+            while not self._stopped.is_set():
+                block = self._source.read(self._block_size)
+                self._put(block)
+                if block == _EOF:
+                    return
+        except Exception as e:
+            self._put(e)
+
+    def _put(self, item: bytes | BaseException) -> None:
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+
+def decompress_input(
+    file: "io.BufferedReader[Any]", file_path: str, background: bool = False
+) -> BinaryIO:
+    """
+    Распаковывает входной поток, если он сжат.
+
+    :param file: Буферизованный бинарный поток с начала файла
+    :param file_path: Путь к файлу (для определения сжатия по расширению)
+    :param background: Распаковывать в фоновом потоке
+
+    :return: Бинарный поток данных (для несжатого - сам file)
+
+    :raise ValueError: Если для сжатия нет библиотеки
+    """
+    compression = detect_compression(file_path, file.peek(MAGIC_SIZE)[:MAGIC_SIZE])
+    if compression is None:
+        return cast(BinaryIO, file)
+
+    stream = decompress_stream(file, compression)
+    if background:
+        reader = io.BufferedReader(BackgroundReader(stream), DEFAULT_BLOCK_SIZE)
+        return cast(BinaryIO, reader)
+    return stream
+
+
+@contextlib.contextmanager
+def open_input(file_path: str, background: bool = True) -> Iterator[BinaryIO]:
+    """
+    Открывает входной файл для чтения, распаковывая его при необходимости.
+
+    :param file_path: Путь к файлу
+    :param background: Распаковывать в фоновом потоке
+
+    :return: Бинарный поток данных файла (для несжатого - сам файл)
+
+    :raise FileNotFoundError: Если файл не найден
+    :raise ValueError: Если для сжатия нет библиотеки
+    """
+    with open(file_path, "rb") as file:
+        with decompress_input(file, file_path, background) as stream:
+            yield stream
@@ -4,6 +4,8 @@
 
 from typing import Any
 
+from core.utils.validators import SKIP_MISSING_FIELD, RowValidationError
+
 
 class DataConverter:
     """Конвертер данных продуктов."""
@@ -34,7 +36,7 @@ class DataConverter:
         :raise ValueError: Если значение не может быть преобразовано в число
         """
         if value is None:
-            raise ValueError("Value cannot be None")
+            raise RowValidationError("Value cannot be None", SKIP_MISSING_FIELD)
 
         # Если это строка, очищаем ее
         if isinstance(value, str):
@@ -0,0 +1,120 @@
+"""
+Утилиты для чтения CSV записей с учетом байтовых смещений в файле.
+"""
+
+from collections.abc import Iterator, Sequence
+from mmap import mmap
+from typing import Any, BinaryIO
+
+
+def next_line_start(file: BinaryIO, offset: int) -> int:
+    """
+    Возвращает первое начало строки (позицию сразу после b"\\n"),
+    которое не меньше offset.
+
+    Такая позиция - только кандидат на границу CSV записи: перевод строки
+    внутри поля в кавычках запись не завершает.
+
+    :param file: Файл, открытый в бинарном режиме
+    :param offset: Смещение, от которого ищется начало строки
+
+    :return: Смещение начала строки или размер файла
+    """
+    if offset <= 0:
+        return 0
+
+    file.seek(offset - 1)
+    file.readline()
+    return file.tell()
+
+
+def last_line_end(
+    file: BinaryIO, start: int, end: int, block_size: int = 64 * 1024
+) -> int:
+    """
+    Возвращает позицию сразу после последнего b"\\n" в диапазоне [start, end).
+
+    Байты после этой позиции - строка, которую, возможно, еще дописывают.
+
+    :param file: Файл, открытый в бинарном режиме
+    :param start: Начало диапазона
+    :param end: Конец диапазона
+    :param block_size: Размер блока чтения с конца диапазона
+
+    :return: Смещение конца последней завершенной строки или start
+    """
+    position = end
+    while position > start:
+        block_start = max(start, position - block_size)
+        file.seek(block_start)
+        index = file.read(position - block_start).rfind(b"\n")
+        if index >= 0:
+            return block_start + index + 1
+        position = block_start
+    return start
+
+
+def row_to_dict(header: Sequence[str], row: list[str]) -> dict[Any, Any]:
+    """
+    Превращает запись в словарь так же, как csv.DictReader:
+    лишние значения попадают под ключ None, недостающие поля равны None.
+
+    :param header: Названия колонок
+    :param row: Значения записи
+
+    :return: Словарь колонка -> значение
+    """
+    data: dict[Any, Any] = dict(zip(header, row, strict=False))
+    header_len, row_len = len(header), len(row)
+    if header_len < row_len:
+        data[None] = row[header_len:]
+    elif header_len > row_len:
+        for key in header[row_len:]:
+            data[key] = None
+    return data
+
+
+class RecordLines:
+    """
+    Итератор строк бинарного файла (или mmap) для csv.reader.
+
+    Строки декодируются из UTF-8, переводы строк приводятся к "\\n",
+    как в текстовом режиме open(). csv.reader запрашивает строки только
+    по мере необходимости, поэтому после каждой прочитанной записи
+    position указывает точно на начало следующей записи.
+
+    exhausted становится True, когда строки файла закончились. Если это
+    случилось во время чтения записи, ее закрыл только конец файла внутри
+    кавычек: csv.reader без strict возвращает такую запись как завершенную.
+    """
+
+    def __init__(
+        self, file: BinaryIO | mmap, start: int, encoding: str = "utf-8"
+    ) -> None:
+        file.seek(start)
+        self.position = start
+        self.encoding = encoding
+        self.exhausted = False
+        self._lines = self._iter_lines(file)
+
+    def __iter__(self) -> "RecordLines":
+        return self
+
+    def __next__(self) -> str:
+        return next(self._lines)
+
+    def _iter_lines(self, file: BinaryIO | mmap) -> Iterator[str]:
+        for raw in iter(file.readline, b""):
+            # Одиночный \r тоже завершает строку в текстовом режиме
+            pieces = raw.splitlines(keepends=True) if b"\r" in raw else (raw,)
+
+            for piece in pieces:
+                self.position += len(piece)
+                line = piece.decode(self.encoding)
+                if line.endswith("\r\n"):
+                    line = line[:-2] + "\n"
+                elif line.endswith("\r"):
+                    line = line[:-1] + "\n"
+                yield line
+
+        self.exhausted = True
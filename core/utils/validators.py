@@ -2,8 +2,45 @@
 Утилиты для валидации данных.
 """
 
+from collections.abc import Collection
 from typing import Any
 
+# Причины пропуска строк (метрики rows_skipped)
+SKIP_EMPTY_ROW = "empty_row"
+SKIP_MISSING_FIELD = "missing_field"
+SKIP_INVALID_NUMBER = "invalid_number"
+SKIP_INVALID_RATING = "invalid_rating"
+
+
+class RowValidationError(ValueError):
+    """Ошибка проверки строки с причиной пропуска."""
+
+    def __init__(self, message: str, reason: str) -> None:
+        """
+        :param message: Описание ошибки
+        :param reason: Причина пропуска строки (SKIP_*)
+        """
+        super().__init__(message)
+        self.reason = reason
+
+
+def skip_reason(error: Exception) -> str:
+    """
+    Возвращает причину пропуска строки по ошибке ее обработки.
+
+    Ошибки преобразования чисел (ValueError) - SKIP_INVALID_NUMBER,
+    отсутствие поля в записи (IndexError, KeyError) - SKIP_MISSING_FIELD.
+
+    :param error: Ошибка обработки строки
+
+    :return: Причина пропуска (SKIP_*)
+    """
+    if isinstance(error, RowValidationError):
+        return error.reason
+    if isinstance(error, (IndexError, KeyError)):
+        return SKIP_MISSING_FIELD
+    return SKIP_INVALID_NUMBER
+
 
 class DataValidator:
     """Валидатор данных продуктов."""
@@ -28,21 +65,28 @@ class DataValidator:
         return True
 
     @staticmethod
-    def validate_required_fields(product_data: dict[str, Any]) -> None:
+    def validate_required_fields(
+        product_data: dict[str, Any],
+        fields: Collection[str] = ("name", "brand"),
+    ) -> None:
         """
         Проверяет, что все обязательные поля заполнены.
 
         :param product_data: Словарь с данными продукта
+        :param fields: Проверяемые поля (name, brand)
 
-        :raise ValueError: Если какое-либо обязательное поле пустое
+        :raise RowValidationError: Если какое-либо обязательное поле пустое
         """
-        name = product_data.get("name")
-        brand = product_data.get("brand")
-
-        if not name or (isinstance(name, str) and not name.strip()):
-            raise ValueError("Product name cannot be empty")
-        if not brand or (isinstance(brand, str) and not brand.strip()):
-            raise ValueError("Brand cannot be empty")
+        if "name" in fields:
+            name = product_data.get("name")
+            if not name or (isinstance(name, str) and not name.strip()):
+                raise RowValidationError(
+                    "Product name cannot be empty", SKIP_MISSING_FIELD
+                )
+        if "brand" in fields:
+            brand = product_data.get("brand")
+            if not brand or (isinstance(brand, str) and not brand.strip()):
+                raise RowValidationError("Brand cannot be empty", SKIP_MISSING_FIELD)
 
     @staticmethod
     def validate_rating(rating: float) -> None:
@@ -51,7 +95,10 @@ class DataValidator:
 
         :param rating: Рейтинг для проверки
 
-        :raise ValueError: Если рейтинг не в диапазоне от 0 до 5
+        :raise RowValidationError: Если рейтинг не в диапазоне от 0 до 5
         """
         if not 0 <= rating <= 5:
-            raise ValueError("Rating must be between 0 and 5, got %.2f" % rating)
+            raise RowValidationError(
+                "Rating must be between 0 and 5, got %.2f" % rating,
+                SKIP_INVALID_RATING,
+            )
@@ -3,9 +3,179 @@
 """
 
 import argparse
+from typing import TYPE_CHECKING
 
-from core.analyzer import BrandRatingAnalyzer
-from core.debug import debug_print, error_print, set_debug_mode
+from core.options import (
+    ACCUMULATOR_TYPES,
+    DEFAULT_ACCUMULATOR,
+    DEFAULT_ENGINE,
+    DEFAULT_READER,
+    READER_TYPES,
+    STATS_FORMATS,
+    default_cache_dir,
+    get_available_engines,
+)
+from core.reports import ReportFactory, ReportWriterFactory
+from core.reports.formats import DEFAULT_FORMAT
+
+if TYPE_CHECKING:
+    from core.metrics import Metrics
+
+# Варианты аргументов берутся из core.options и реестров отчетов. Читатели,
+# калькуляторы, кэш, анализатор и сервер импортируются после разбора
+# аргументов: --help и --list-reports не должны их загружать
+
+
+def positive_int(value: str) -> int:
+    """
+    Тип аргумента argparse: целое число больше нуля.
+
+    :param value: Строковое значение аргумента
+
+    :return: Число
+
+    :raise argparse.ArgumentTypeError: Если значение не положительное целое
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "ожидается целое число, получено: %s" % value
+        ) from None
+    if number < 1:
+        raise argparse.ArgumentTypeError("значение должно быть >= 1")
+    return number
+
+
+def positive_float(value: str) -> float:
+    """
+    Тип аргумента argparse: число больше нуля.
+
+    :param value: Строковое значение аргумента
+
+    :return: Число
+
+    :raise argparse.ArgumentTypeError: Если значение не положительное число
+    """
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "ожидается число, получено: %s" % value
+        ) from None
+    if not number > 0:
+        raise argparse.ArgumentTypeError("значение должно быть > 0")
+    return number
+
+
+def load_aliases(args: argparse.Namespace) -> dict[str, str] | None:
+    """
+    Читает псевдонимы брендов из файла --brand-aliases.
+
+    :param args: Аргументы командной строки
+
+    :return: Псевдонимы или None, если файл не указан
+    """
+    if args.brand_aliases is None:
+        return None
+
+    from core.utils.brands import load_brand_aliases
+
+    return load_brand_aliases(args.brand_aliases)
+
+
+def serve(args: argparse.Namespace) -> int:
+    """
+    Запускает сервер отчетов: файлы читаются один раз, затем отчеты
+    обновляются при изменении файлов и отдаются по HTTP.
+
+    :param args: Аргументы командной строки
+
+    :return: Код завершения
+    """
+    from core.analyzer import BrandRatingAnalyzer
+    from core.cache import MemoryCache
+    from core.debug import debug_print
+    from core.server import BrandIndex, ReportServer
+
+    analyzer = BrandRatingAnalyzer(
+        jobs=args.jobs,
+        engine=args.engine,
+        reader_type=args.reader,
+        cache=MemoryCache(),
+        accumulator=args.accumulator,
+        brand_aliases=load_aliases(args),
+    )
+    report_types = args.report or ReportFactory.get_available_reports()
+    index = BrandIndex(
+        analyzer,
+        args.files,
+        report_types,
+        top=args.top,
+        min_products=args.min_products,
+    )
+    index.refresh()
+
+    # Не заданные аргументы - значения по умолчанию ReportServer
+    options = {
+        name: value
+        for name, value in (
+            ("host", args.host),
+            ("port", args.port),
+            ("watch_interval", args.watch_interval),
+        )
+        if value is not None
+    }
+    server = ReportServer(index, socket_path=args.socket, **options)
+    print("Сервер отчетов запущен: %s" % server.address)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        debug_print("Сервер остановлен")
+    return 0
+
+
+def convert(args: argparse.Namespace) -> int:
+    """
+    Преобразует входные файлы в колоночный снимок (core.snapshot): при
+    анализе снимка строки не разбираются и не проверяются заново.
+
+    :param args: Аргументы командной строки
+
+    :return: Код завершения
+    """
+    from core.reader import READERS
+    from core.snapshot import write_snapshot
+    from core.utils.brands import BrandNormalizer
+    from core.utils.converters import DataConverter
+    from core.utils.validators import DataValidator
+
+    reader = READERS[args.reader](
+        DataValidator(),
+        DataConverter(),
+        normalizer=BrandNormalizer(load_aliases(args)),
+    )
+    rows = write_snapshot(args.convert, reader.iter_products(args.files))
+    print("Снимок %s: %d продуктов" % (args.convert, rows))
+    return 0
+
+
+def write_stats(metrics: "Metrics", stats_format: str, path: str | None) -> None:
+    """
+    Записывает метрики анализа в файл или стандартный поток ошибок.
+
+    :param metrics: Собранные метрики
+    :param stats_format: Формат метрик (см. STATS_FORMATS)
+    :param path: Путь к файлу или None для stderr
+    """
+    from core.debug import error_print
+
+    text = metrics.export(stats_format)
+    if path is None:
+        error_print(text.rstrip("\n"))
+        return
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(text if text.endswith("\n") else text + "\n")
 
 
 def main() -> int:
@@ -20,30 +190,178 @@ def main() -> int:
         Примеры использования:
             python main.py --files products1.csv products2.csv --report average-rating
             python main.py -f data/*.csv -r average-rating
+            python main.py -f data/*.csv -r average-rating --jobs 8
+            python main.py -f data/*.csv -r average-rating --engine numpy
+            python main.py -f data/*.csv -r average-rating --top 20 --min-products 5
+            python main.py -f data/*.csv -r average-rating --format csv -o report.csv
+            python main.py -f data/*.csv -r average-rating distinct-products \\
+                --format csv -o report.csv
+            python main.py -f data/*.csv -r average-rating --stats
+            python main.py -f data/*.csv -r average-rating --stats prometheus \\
+                --stats-output metrics.prom
             python main.py --list-reports
+            python main.py --serve -f data/*.csv --port 8765
+            python main.py --serve -f data/*.csv --socket /tmp/reports.sock
+            python main.py --convert data.brs -f data/*.csv
+            python main.py -f data/*.csv -r average-rating --brand-aliases aliases.csv
+            python main.py -f data.brs -r average-rating
         """,
     )
 
-    analyzer = BrandRatingAnalyzer()
-
     # Основная mutually exclusive группа
     main_group = parser.add_mutually_exclusive_group()
 
     main_group.add_argument(
         "--list-reports", action="store_true", help="Показать доступные отчеты"
     )
+    main_group.add_argument(
+        "--serve",
+        action="store_true",
+        help="Запустить сервер отчетов по HTTP с обновлением при изменении файлов",
+    )
+    main_group.add_argument(
+        "--convert",
+        metavar="SNAPSHOT",
+        help=(
+            "Преобразовать --files в колоночный снимок: снимок принимается "
+            "вместо CSV файлов и читается без разбора строк"
+        ),
+    )
 
     # Группа аргументов для анализа (требуется, если не --list-reports)
     analysis_group = parser.add_argument_group("аргументы анализа")
     analysis_group.add_argument(
-        "--files", "-f", nargs="+", help="Пути к CSV файлам с данными о продуктах"
+        "--files",
+        "-f",
+        nargs="+",
+        help="Пути к CSV файлам или снимкам с данными о продуктах",
     )
 
     analysis_group.add_argument(
         "--report",
         "-r",
-        choices=analyzer.get_available_reports(),
-        help="Тип отчета для генерации",
+        nargs="+",
+        choices=ReportFactory.get_available_reports(),
+        help=(
+            "Типы отчетов для генерации: несколько отчетов считаются "
+            "за одно чтение файлов"
+        ),
+    )
+
+    analysis_group.add_argument(
+        "--top",
+        type=positive_int,
+        help="Показать только K первых брендов отчета",
+    )
+
+    analysis_group.add_argument(
+        "--min-products",
+        type=positive_int,
+        default=1,
+        help="Учитывать только бренды с не меньшим количеством продуктов",
+    )
+
+    analysis_group.add_argument(
+        "--format",
+        choices=ReportWriterFactory.get_available_formats(),
+        default=DEFAULT_FORMAT,
+        help=(
+            "Формат вывода: grid - таблица, csv и jsonl - построчный вывод, "
+            "parquet - требует pyarrow (по умолчанию: %(default)s)"
+        ),
+    )
+
+    analysis_group.add_argument(
+        "--output",
+        "-o",
+        help="Файл для записи отчета (по умолчанию: стандартный вывод)",
+    )
+
+    analysis_group.add_argument(
+        "--jobs",
+        "-j",
+        type=positive_int,
+        default=1,
+        help="Количество процессов для параллельной обработки файлов",
+    )
+
+    analysis_group.add_argument(
+        "--engine",
+        choices=get_available_engines(),
+        default=DEFAULT_ENGINE,
+        help="Движок расчета статистик (numpy требует установленный NumPy)",
+    )
+
+    analysis_group.add_argument(
+        "--brand-aliases",
+        metavar="FILE",
+        help=(
+            "CSV файл псевдонимов брендов с колонками alias и brand "
+            '(например, "Apple Inc.,apple")'
+        ),
+    )
+
+    analysis_group.add_argument(
+        "--accumulator",
+        choices=ACCUMULATOR_TYPES,
+        default=DEFAULT_ACCUMULATOR,
+        help=(
+            "Суммирование рейтингов и цен: fsum - точное, не зависит от порядка "
+            "файлов и --jobs; float - обычное сложение (по умолчанию: %(default)s)"
+        ),
+    )
+
+    analysis_group.add_argument(
+        "--reader",
+        choices=READER_TYPES,
+        default=DEFAULT_READER,
+        help=(
+            "Режим чтения CSV (fast - без промежуточных словарей на строку, "
+            "mmap - декодирование только нужных колонок)"
+        ),
+    )
+
+    analysis_group.add_argument(
+        "--stats",
+        nargs="?",
+        const="text",
+        choices=STATS_FORMATS,
+        help=(
+            "Вывести время этапов и счетчики по файлам: text - сводка, "
+            "json, prometheus (по умолчанию: text)"
+        ),
+    )
+
+    analysis_group.add_argument(
+        "--stats-output",
+        help="Файл для метрик --stats (по умолчанию: стандартный поток ошибок)",
+    )
+
+    cache_group = analysis_group.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        "--cache-dir",
+        default=default_cache_dir(),
+        help="Каталог кэша результатов по файлам (по умолчанию: %(default)s)",
+    )
+    cache_group.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Не использовать кэш и всегда перечитывать файлы",
+    )
+
+    server_group = parser.add_argument_group("аргументы сервера (--serve)")
+    server_group.add_argument(
+        "--host", help="Адрес HTTP сервера (по умолчанию: 127.0.0.1)"
+    )
+    address_group = server_group.add_mutually_exclusive_group()
+    address_group.add_argument(
+        "--port", type=int, help="Порт HTTP сервера (по умолчанию: 8765)"
+    )
+    address_group.add_argument("--socket", help="Путь к Unix сокету вместо TCP порта")
+    server_group.add_argument(
+        "--watch-interval",
+        type=positive_float,
+        help="Период проверки изменения файлов в секундах (по умолчанию: 1.0)",
     )
 
     # Общие аргументы (доступны всегда)
@@ -55,38 +373,75 @@ def main() -> int:
 
     if args.list_reports:
         print("Доступные отчеты:")
-        for report in analyzer.get_available_reports():
+        for report in ReportFactory.get_available_reports():
             print("  - %s" % report)
         return 0
 
-    if not args.files or not args.report:
+    if args.serve and not args.files:
+        parser.error("для сервера требуется --files")
+
+    if args.convert and not args.files:
+        parser.error("для преобразования требуется --files")
+
+    if not (args.serve or args.convert) and (not args.files or not args.report):
         parser.error(
             "для анализа требуются --files и --report (или используйте --list-reports)"
         )
 
+    from core.debug import debug_print, error_print, set_debug_mode
+
     # Устанавливаем debug режим для всех модулей
     set_debug_mode(args.debug)
 
     try:
+        if args.serve:
+            return serve(args)
+        if args.convert:
+            return convert(args)
+
         # Генерируем и выводим отчет
-        debug_print("Чтение файлов: %s" % ", ".join(args.files))
-        result = analyzer.analyze(args.files, args.report)
+        from core.analyzer import BrandRatingAnalyzer
+        from core.cache import AggregateCache
+        from core.metrics import Metrics, set_metrics
 
-        debug_print("\nОтчет: %s" % args.report)
+        debug_print("Чтение файлов: %s", ", ".join(args.files))
+        cache = None if args.no_cache else AggregateCache(args.cache_dir)
+        analyzer = BrandRatingAnalyzer(
+            jobs=args.jobs,
+            engine=args.engine,
+            reader_type=args.reader,
+            cache=cache,
+            accumulator=args.accumulator,
+            brand_aliases=load_aliases(args),
+        )
+        # Повторно указанный отчет выводится один раз
+        report_types = list(dict.fromkeys(args.report))
+        debug_print("\nОтчет: %s (%s)", ", ".join(report_types), args.format)
         debug_print("=" * 40)
 
-        print(result)
+        metrics = Metrics() if args.stats else None
+        set_metrics(metrics)
+        analyzer.write_reports(
+            args.files,
+            report_types,
+            output_format=args.format,
+            output_path=args.output,
+            top=args.top,
+            min_products=args.min_products,
+        )
+        if metrics is not None:
+            write_stats(metrics, args.stats, args.stats_output)
 
     except FileNotFoundError as e:
-        error_print("Ошибка: файл не найден - %s" % e)
+        error_print("Ошибка: файл не найден - %s", e)
         return 1
 
     except Exception as e:
-        error_print("Ошибка при выполнении скрипта: %s" % e)
+        error_print("Ошибка при выполнении скрипта: %s", e)
         if args.debug:
             import traceback
 
-            debug_print("Подробности ошибки:\n%s" % traceback.format_exc())
+            debug_print("Подробности ошибки:\n%s", traceback.format_exc())
         return 1
 
     return 0
@@ -0,0 +1,181 @@
+import math
+import pickle
+import random
+import statistics
+
+import pytest
+
+from core.accumulators import ACCUMULATORS, WelfordAccumulator, create_accumulator
+from core.calculator import BrandRatingCalculator, CalculatorFactory
+from core.models import Product, ProductTable
+from core.parallel import ParallelAggregator
+from core.reader import CSVProductReader
+from core.utils.converters import DataConverter
+from core.utils.validators import DataValidator
+
+# Значения, сумма которых зависит от порядка сложения float
+VALUES = [random.Random(1).uniform(0, 5) for _ in range(5000)] + [1e16, -1e16]
+
+
+def accumulate(name, *parts):
+    """Складывает части значений в отдельные аккумуляторы и объединяет их."""
+    result = create_accumulator(name)
+    for part in parts:
+        accumulator = create_accumulator(name)
+        accumulator.add_many(part)
+        result.merge(accumulator)
+    return result
+
+
+class TestAccumulators:
+    """Тесты аккумуляторов сумм."""
+
+    @pytest.mark.parametrize("name", list(ACCUMULATORS))
+    def test_sum_and_mean(self, name):
+        accumulator = create_accumulator(name)
+        accumulator.add_many([1.0, 2.0])
+        accumulator.add(4.5)
+
+        assert accumulator.count == 3
+        assert accumulator.total == pytest.approx(7.5)
+        assert accumulator.mean == pytest.approx(2.5)
+        assert math.isnan(create_accumulator(name).mean)
+
+    @pytest.mark.parametrize("name", list(ACCUMULATORS))
+    def test_merge_copy_and_pickle(self, name):
+        accumulator = accumulate(name, [1.0, 2.0], [], [3.0])
+        clone = pickle.loads(pickle.dumps(accumulator))
+
+        assert clone == accumulator
+        clone.merge(accumulator.copy())
+        assert clone.count == 6
+        assert accumulator.count == 3
+
+    def test_fsum_is_exact_and_order_independent(self):
+        exact = math.fsum(VALUES)
+        rng = random.Random(2)
+        for _ in range(5):
+            values = VALUES[:]
+            rng.shuffle(values)
+            split = rng.randrange(len(values))
+
+            assert accumulate("fsum", values).total == exact
+            assert accumulate("fsum", values[split:], values[:split]).total == exact
+
+    def test_float_depends_on_order(self):
+        assert accumulate("float", VALUES).total != math.fsum(VALUES)
+
+    def test_welford_variance(self):
+        values = VALUES[:-2]
+        accumulator = accumulate("welford", values[:1000], values[1000:])
+
+        assert accumulator.mean == pytest.approx(statistics.fmean(values))
+        assert accumulator.variance() == pytest.approx(statistics.pvariance(values))
+        assert accumulator.variance(1) == pytest.approx(statistics.variance(values))
+        assert math.isnan(WelfordAccumulator().variance())
+
+    def test_unknown_accumulator(self):
+        with pytest.raises(ValueError, match="Unknown accumulator"):
+            create_accumulator("decimal")
+        with pytest.raises(ValueError, match="Unknown accumulator"):
+            BrandRatingCalculator(accumulator="decimal")
+
+
+class TestReproducibleAverages:
+    """Средние с fsum не зависят от порядка файлов и количества процессов."""
+
+    def test_file_order_and_jobs(self, temp_csv_file):
+        rng = random.Random(3)
+        lines = [
+            "p%d,brand%d,100,%r" % (row, row % 3, rng.uniform(0, 5))
+            for row in range(300)
+        ]
+        paths = [
+            temp_csv_file("name,brand,price,rating\n" + "\n".join(part) + "\n")
+            for part in (lines[:100], lines[100:250], lines[250:])
+        ]
+        reader = CSVProductReader(DataValidator(), DataConverter())
+        calculator = BrandRatingCalculator()
+
+        expected = calculator.create_state()
+        for path in paths:
+            calculator.accumulate(expected, reader.iter_products([path]))
+
+        for jobs, chunk_size in ((1, 1000), (2, 64), (3, 200)):
+            aggregator = ParallelAggregator(reader, jobs=jobs, chunk_size=chunk_size)
+            state = aggregator.aggregate(calculator, paths[::-1])
+            assert state == expected
+            assert calculator.finalize(state) == calculator.finalize(expected)
+
+    @pytest.mark.parametrize(
+        "report",
+        [
+            "rating-percentiles",
+            "distinct-products",
+            "price-bands",
+            "price-weighted-rating",
+            "price-range",
+        ],
+    )
+    def test_other_reports(self, report):
+        rng = random.Random(4)
+        products = [
+            Product("p%d" % i, "b%d" % (i % 3), rng.uniform(1, 2000), rng.uniform(0, 5))
+            for i in range(3000)
+        ]
+        calculator = CalculatorFactory.create(report)
+
+        def calculate(*parts):
+            state = calculator.create_state()
+            for part in parts:
+                part_state = calculator.create_state()
+                calculator.accumulate(part_state, part)
+                calculator.merge(state, part_state)
+            # Бренды с равными ключами идут в порядке появления в данных
+            return sorted(
+                calculator.finalize(state),
+                key=lambda row: (row.brand, row.price_band or ""),
+            )
+
+        expected = calculate(products)
+        for _ in range(3):
+            products = products[:]
+            rng.shuffle(products)
+            split = rng.randrange(len(products))
+            result = calculate(products[split:], products[:split])
+            if report == "rating-percentiles":
+                # Перцентили приближенные (KLLSketch), точно совпадают средние
+                result = [row.average_rating for row in result]
+                assert result == [row.average_rating for row in expected]
+            else:
+                assert result == expected
+
+    @pytest.mark.parametrize("report", ["rating-percentiles", "distinct-products"])
+    @pytest.mark.parametrize("name", list(ACCUMULATORS))
+    def test_reports_use_accumulator(self, report, name):
+        calculator = CalculatorFactory.create(report, accumulator=name)
+        state = calculator.create_state()
+        calculator.accumulate(state, [Product("p", "b", 1.0, 4.0)])
+
+        assert isinstance(state["b"]["total_rating"], ACCUMULATORS[name])
+
+    @pytest.mark.parametrize("name", list(ACCUMULATORS))
+    def test_price_reports_use_accumulator(self, name):
+        calculator = CalculatorFactory.create("price-bands", accumulator=name)
+        state = calculator.create_state()
+        calculator.accumulate(state, [Product("p", "b", 10.0, 4.0)])
+
+        (stats,) = state.values()
+        assert all(isinstance(value, ACCUMULATORS[name]) for value in stats[1:4])
+
+    @pytest.mark.parametrize("name", list(ACCUMULATORS))
+    def test_products_and_table_match(self, name):
+        products = [Product("p%d" % i, "b%d" % (i % 4), 1.0, i / 10) for i in range(50)]
+        calculator = BrandRatingCalculator(accumulator=name)
+
+        state = calculator.create_state()
+        calculator.accumulate(state, products)
+        table_state = calculator.create_state()
+        calculator.accumulate(table_state, ProductTable.from_products(products))
+
+        assert state == table_state
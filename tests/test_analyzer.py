@@ -1,6 +1,12 @@
+import os
+
 import pytest
 
 from core.analyzer import BrandRatingAnalyzer
+from core.reader import CSVProductReader
+
+FILES = ["tests/fixtures/sample.csv", "tests/fixtures/multiple_brands.csv"]
+REPORTS = ["average-rating", "distinct-products"]
 
 
 @pytest.fixture
@@ -25,7 +31,79 @@ class TestBrandRatingAnalyzer:
         for expected in expected_contains:
             assert expected in result
 
+    def test_analyze_with_jobs_matches_serial(self, analyzer):
+        files = ["tests/fixtures/sample.csv", "tests/fixtures/multiple_brands.csv"]
+
+        parallel = BrandRatingAnalyzer(jobs=2).analyze(files, "average-rating")
+
+        assert parallel == analyzer.analyze(files, "average-rating")
+
+    def test_feed_without_price(self, analyzer, temp_csv_file):
+        full = "tests/fixtures/multiple_brands.csv"
+        with open(full, encoding="utf-8") as file:
+            rows = [line.rstrip("\n").split(",") for line in file]
+        path = temp_csv_file("\n".join(",".join(row[:2] + row[3:]) for row in rows))
+
+        result = analyzer.analyze([path], "average-rating")
+
+        assert result == analyzer.analyze([full], "average-rating")
+
+    def test_top_renders_selected_rows(self, analyzer):
+        files = ["tests/fixtures/sample.csv", "tests/fixtures/multiple_brands.csv"]
+
+        result = analyzer.analyze(files, "average-rating", top=1)
+
+        assert "apple" in result
+        assert "samsung" not in result and "xiaomi" not in result
+
     def test_get_available_reports(self, analyzer):
         reports = analyzer.get_available_reports()
         assert "average-rating" in reports
         assert isinstance(reports, list)
+
+
+class TestMultipleReports:
+    """Тесты расчета нескольких отчетов за одно чтение файлов."""
+
+    def test_files_are_read_once(self, analyzer, monkeypatch):
+        opened = []
+        iter_single_file = CSVProductReader._iter_single_file
+
+        def tracking(reader, file_path):
+            opened.append(file_path)
+            return iter_single_file(reader, file_path)
+
+        monkeypatch.setattr(CSVProductReader, "_iter_single_file", tracking)
+        results = analyzer.calculate_statistics_each(FILES, REPORTS, top=3)
+
+        assert opened == FILES
+        assert results == [
+            analyzer.calculate_statistics(FILES, report_type, top=3)
+            for report_type in REPORTS
+        ]
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_write_reports_to_files(self, tmp_path, jobs):
+        output = str(tmp_path / "report.csv")
+
+        BrandRatingAnalyzer(jobs=jobs).write_reports(FILES, REPORTS, "csv", output)
+
+        for report_type in REPORTS:
+            single = str(tmp_path / ("%s.csv" % report_type))
+            BrandRatingAnalyzer().write_report(FILES, report_type, "csv", single)
+            with open(single, encoding="utf-8") as expected:
+                path = os.path.join(tmp_path, "report.%s.csv" % report_type)
+                with open(path, encoding="utf-8") as actual:
+                    assert actual.read() == expected.read()
+
+    def test_write_grid_reports_to_stdout(self, analyzer, capsys):
+        analyzer.write_reports(FILES, REPORTS)
+
+        output = capsys.readouterr().out
+        assert output.startswith("Отчет: average-rating\n")
+        assert "\nОтчет: distinct-products\n" in output
+        assert analyzer.analyze(FILES, "distinct-products") in output
+
+    def test_machine_format_requires_output(self, analyzer):
+        with pytest.raises(ValueError, match="requires --output"):
+            analyzer.write_reports(FILES, REPORTS, "jsonl")
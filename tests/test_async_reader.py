@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from core.analyzer import BrandRatingAnalyzer
+from core.async_reader import AsyncCSVProductReader
+from core.calculator import BrandRatingCalculator
+from core.reader import CSVProductReader, FastCSVProductReader
+from core.utils.converters import DataConverter
+from core.utils.validators import DataValidator
+from tests.test_parallel import TRICKY_CSV
+
+FILES = ["tests/fixtures/sample.csv", "tests/fixtures/multiple_brands.csv"]
+
+
+def aggregate(async_reader, file_paths):
+    calculator = BrandRatingCalculator()
+
+    async def run():
+        try:
+            return await async_reader.aggregate(calculator, file_paths)
+        finally:
+            async_reader.close()
+
+    return calculator.finalize(asyncio.run(run()))
+
+
+class TestAsyncCSVProductReader:
+    """Тесты асинхронного чтения."""
+
+    @pytest.mark.parametrize("block_size", [1, 7, 1024])
+    def test_matches_sync_reader(self, temp_csv_file, block_size):
+        paths = [*FILES, temp_csv_file(TRICKY_CSV)]
+        reader = FastCSVProductReader(DataValidator(), DataConverter())
+        async_reader = AsyncCSVProductReader(reader, block_size=block_size)
+
+        expected = BrandRatingCalculator().calculate(reader.iter_products(paths))
+        assert aggregate(async_reader, paths) == expected
+
+    def test_missing_file(self):
+        reader = CSVProductReader(DataValidator(), DataConverter())
+        async_reader = AsyncCSVProductReader(reader)
+
+        with pytest.raises(FileNotFoundError, match="not found"):
+            aggregate(async_reader, [*FILES, "tests/fixtures/missing.csv"])
+
+    def test_parse_error_does_not_hang(self, temp_csv_file):
+        # Разбор падает сразу, а чтение упирается в заполненную очередь
+        path = temp_csv_file("name,brand\n" + "x,y\n" * 10000)
+        reader = CSVProductReader(DataValidator(), DataConverter())
+        async_reader = AsyncCSVProductReader(reader, queue_size=1, block_size=16)
+
+        with pytest.raises(ValueError, match="missing required columns"):
+            aggregate(async_reader, [path])
+
+    def test_concurrency_is_bounded(self, monkeypatch):
+        reader = CSVProductReader(DataValidator(), DataConverter())
+        async_reader = AsyncCSVProductReader(reader, max_files=3, max_files_per_call=2)
+        active = peak = 0
+        aggregate_file = async_reader.aggregate_file
+
+        async def tracking_aggregate_file(calculator, file_path):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            try:
+                await asyncio.sleep(0.01)
+                return await aggregate_file(calculator, file_path)
+            finally:
+                active -= 1
+
+        monkeypatch.setattr(async_reader, "aggregate_file", tracking_aggregate_file)
+        aggregate(async_reader, FILES * 5)
+
+        assert peak == 2
+
+    def test_event_loop_is_not_blocked(self, temp_csv_file):
+        path = temp_csv_file("name,brand,price,rating\n" + "x,Apple,1,4.5\n" * 20000)
+        analyzer = BrandRatingAnalyzer()
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        async def run():
+            task = asyncio.create_task(ticker())
+            try:
+                return await analyzer.analyze_async([path], "average-rating")
+            finally:
+                task.cancel()
+
+        result = asyncio.run(run())
+
+        assert result == analyzer.analyze([path], "average-rating")
+        assert ticks > 10
@@ -0,0 +1,136 @@
+import pickle
+
+import pytest
+
+from core.analyzer import BrandRatingAnalyzer
+from core.cache import MemoryCache
+from core.reader import READERS, CSVProductReader
+from core.snapshot import write_snapshot
+from core.utils.brands import BrandNormalizer, load_brand_aliases
+from core.utils.converters import DataConverter
+from core.utils.validators import DataValidator
+
+ALIASES = {"Apple Inc.": "Apple", " SAMSUNG Electronics ": "samsung"}
+
+CSV = """name,brand,price,rating
+iPhone,Apple Inc.,999,4.9
+iPad, APPLE ,599,4.1
+Galaxy,Samsung Electronics,899,4.8
+Pixel,,699,4.5
+Ёлка,Ёж,1,1.0
+"""
+
+
+class TestBrandNormalizer:
+    """Тесты нормализации брендов."""
+
+    def test_variants_share_one_string(self):
+        normalizer = BrandNormalizer()
+        brands = [normalizer.normalize(raw) for raw in (" Apple", "APPLE ", b"apple")]
+
+        assert brands == ["apple"] * 3
+        assert brands[0] is brands[1] is brands[2]
+        assert normalizer.lookup(" Apple") is brands[0]
+        assert normalizer.normalize("  ") == ""
+
+    def test_aliases(self):
+        normalizer = BrandNormalizer(ALIASES)
+
+        assert normalizer.normalize("apple inc. ") == "apple"
+        assert normalizer.normalize("Samsung Electronics") == "samsung"
+        assert normalizer.normalize("Apple") is normalizer.normalize("Apple Inc.")
+        assert BrandNormalizer().fingerprint == ""
+        assert normalizer.fingerprint == BrandNormalizer(ALIASES).fingerprint
+
+        with pytest.raises(ValueError, match="Empty brand"):
+            BrandNormalizer({"Apple Inc.": " "})
+
+    def test_cache_is_bounded(self):
+        normalizer = BrandNormalizer(max_size=4)
+
+        for index in range(100):
+            # Часто используемый бренд не вытесняется уникальными
+            assert normalizer.normalize("Hot") == "hot"
+            assert normalizer.normalize("brand %d" % index) == "brand %d" % index
+
+        assert len(normalizer._recent) + len(normalizer._previous) <= 4
+        assert len(normalizer._canonical) <= 4
+        assert "Hot" in normalizer._recent or "Hot" in normalizer._previous
+
+    def test_pickle_keeps_aliases(self):
+        normalizer = BrandNormalizer(ALIASES)
+        normalizer.normalize("Apple Inc.")
+
+        clone = pickle.loads(pickle.dumps(normalizer))
+
+        assert clone.aliases == normalizer.aliases
+        assert clone.lookup("Apple Inc.") is None
+        assert clone.normalize("Apple Inc.") == "apple"
+
+    def test_load_aliases(self, temp_csv_file):
+        path = temp_csv_file("alias,brand\nApple Inc.,apple\n,ignored\n")
+
+        assert load_brand_aliases(path) == {"Apple Inc.": "apple"}
+
+        with pytest.raises(ValueError, match="missing required columns"):
+            load_brand_aliases(temp_csv_file("name,brand\n"))
+
+
+class TestBrandAliasesInAnalysis:
+    """Псевдонимы брендов при чтении и анализе."""
+
+    @pytest.mark.parametrize("reader_type", list(READERS))
+    def test_readers(self, temp_csv_file, reader_type):
+        reader = READERS[reader_type](
+            DataValidator(), DataConverter(), normalizer=BrandNormalizer(ALIASES)
+        )
+
+        products = reader.read([temp_csv_file(CSV)])
+
+        assert [product.brand for product in products] == [
+            "apple",
+            "apple",
+            "samsung",
+            "ёж",
+        ]
+        assert products[0].brand is products[1].brand
+        assert reader.with_columns(["brand"]).normalizer is reader.normalizer
+
+    def test_cache_key_depends_on_aliases(self, temp_csv_file):
+        path = temp_csv_file(CSV)
+        cache = MemoryCache()
+
+        def brands(aliases):
+            analyzer = BrandRatingAnalyzer(cache=cache, brand_aliases=aliases)
+            return {
+                stat.brand: stat.product_count
+                for stat in analyzer.calculate_statistics([path], "average-rating")
+            }
+
+        assert brands(None) == {
+            "apple inc.": 1,
+            "apple": 1,
+            "samsung electronics": 1,
+            "ёж": 1,
+        }
+        assert brands(ALIASES) == {"apple": 2, "samsung": 1, "ёж": 1}
+        assert brands(None)["apple"] == 1
+
+    @pytest.mark.parametrize("reader_type", list(READERS))
+    def test_snapshot_matches_csv(self, temp_csv_file, tmp_path, reader_type):
+        csv_path = temp_csv_file(CSV)
+        # Снимок строится без псевдонимов, как main.py --convert
+        snapshot_path = str(tmp_path / "products.brs")
+        reader = CSVProductReader(DataValidator(), DataConverter())
+        write_snapshot(snapshot_path, reader.iter_products([csv_path]))
+
+        analyzer = BrandRatingAnalyzer(reader_type=reader_type, brand_aliases=ALIASES)
+        reports = ["average-rating", "distinct-products", "price-bands"]
+        expected = analyzer.calculate_statistics_each([csv_path], reports)
+
+        assert analyzer.calculate_statistics_each([snapshot_path], reports) == expected
+        assert [stat.brand for stat in expected[0]] == [
+            "samsung",
+            "apple",
+            "ёж",
+        ]
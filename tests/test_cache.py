@@ -0,0 +1,109 @@
+import os
+
+import pytest
+
+from core.analyzer import BrandRatingAnalyzer
+from core.cache import AggregateCache, MemoryCache
+from core.reader import CSVProductReader
+
+CSV = "name,brand,price,rating\niPhone,Apple,999,4.9\nGalaxy,Samsung,899,4.7\n"
+
+
+@pytest.fixture
+def cache(tmp_path) -> AggregateCache:
+    return AggregateCache(str(tmp_path / "cache"))
+
+
+def fail_reading(*args, **kwargs):
+    raise AssertionError("file must not be read")
+
+
+class TestAggregateCache:
+    """Тесты дискового кэша частичных состояний."""
+
+    def test_store_and_load(self, cache, temp_csv_file):
+        path = temp_csv_file(CSV)
+        cache.store(path, "key", {"apple": 1})
+
+        assert cache.load(path, "key") == {"apple": 1}
+        assert cache.load(path, "other-key") is None
+
+    def test_missing_and_corrupted_entries(self, cache, temp_csv_file):
+        path = temp_csv_file(CSV)
+        assert cache.load(path, "key") is None
+
+        cache.store(path, "key", {"apple": 1})
+        with open(cache._entry_path(path, "key"), "wb") as file:
+            file.write(b"garbage")
+        assert cache.load(path, "key") is None
+
+    def test_lru_eviction(self, tmp_path, temp_csv_file):
+        cache = AggregateCache(str(tmp_path / "cache"), max_size=0)
+        paths = [temp_csv_file(CSV) for _ in range(3)]
+        for path in paths:
+            cache.store(path, "key", {"apple": 1})
+
+        entries = os.listdir(tmp_path / "cache")
+        assert entries == []
+
+    def test_lru_keeps_recently_used(self, tmp_path, temp_csv_file):
+        cache = AggregateCache(str(tmp_path / "cache"))
+        paths = [temp_csv_file(CSV) for _ in range(3)]
+        for index, path in enumerate(paths):
+            cache.store(path, "key", {"index": index})
+            entry = cache._entry_path(path, "key")
+            os.utime(entry, ns=(index, index))
+
+        cache.load(paths[0], "key")  # Запись становится самой свежей
+        entry_size = os.path.getsize(cache._entry_path(paths[0], "key"))
+        cache.max_size = entry_size * 2
+        cache._evict()
+
+        assert cache.load(paths[0], "key") == {"index": 0}
+        assert cache.load(paths[1], "key") is None
+        assert cache.load(paths[2], "key") == {"index": 2}
+
+
+class TestAnalyzerWithCache:
+    """Тесты анализатора с кэшем."""
+
+    def test_second_run_uses_cache(self, cache, temp_csv_file, monkeypatch):
+        paths = [temp_csv_file(CSV), temp_csv_file(CSV.replace("Apple", "Google"))]
+        analyzer = BrandRatingAnalyzer(cache=cache)
+        first = analyzer.analyze(paths, "average-rating")
+
+        monkeypatch.setattr(CSVProductReader, "iter_chunk", fail_reading)
+        assert analyzer.analyze(paths, "average-rating") == first
+
+    def test_result_matches_uncached(self, cache):
+        paths = ["tests/fixtures/sample.csv", "tests/fixtures/multiple_brands.csv"]
+
+        cached = BrandRatingAnalyzer(cache=cache).analyze(paths, "average-rating")
+
+        assert cached == BrandRatingAnalyzer().analyze(paths, "average-rating")
+
+
+class TestMemoryCache:
+    """Тесты кэша в памяти."""
+
+    def test_store_copies_value(self):
+        cache = MemoryCache()
+        value = {"apple": [1]}
+        cache.store("data.csv", "key", value)
+        value["apple"].append(2)
+
+        loaded = cache.load("data.csv", "key")
+        assert loaded == {"apple": [1]}
+        loaded["apple"].append(3)
+        assert cache.load("data.csv", "key") == {"apple": [1]}
+        assert cache.load("data.csv", "other-key") is None
+
+    def test_second_run_uses_memory_cache(self, temp_csv_file, monkeypatch):
+        path = temp_csv_file(CSV)
+        analyzer = BrandRatingAnalyzer(cache=MemoryCache())
+        analyzer.analyze([path], "average-rating")
+
+        monkeypatch.setattr(CSVProductReader, "iter_chunk", fail_reading)
+        assert analyzer.analyze([path], "average-rating") == (
+            BrandRatingAnalyzer().analyze([path], "average-rating")
+        )
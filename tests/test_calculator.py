@@ -1,6 +1,15 @@
 import pytest
 
-from core.calculator import BrandRatingCalculator
+from core.calculator import (
+    BrandRatingCalculator,
+    CalculatorFactory,
+    CompositeCalculator,
+    DistinctProductsCalculator,
+    PriceBandsCalculator,
+    PriceRangeCalculator,
+    PriceWeightedRatingCalculator,
+    RatingPercentilesCalculator,
+)
 from core.models import Product
 
 
@@ -46,6 +55,33 @@ class TestBrandRatingCalculator:
         result = calculator.calculate([])
         assert result == []
 
+    def test_calculate_from_generator(self, calculator):
+        products = (
+            Product("P%d" % i, "brand%d" % (i % 2), 100, i % 5) for i in range(10)
+        )
+        result = calculator.calculate(products)
+
+        assert {stats.brand: stats.product_count for stats in result} == {
+            "brand0": 5,
+            "brand1": 5,
+        }
+
+    def test_merge_partial_states(self, calculator):
+        left = calculator.create_state()
+        calculator.accumulate(left, [Product("P1", "apple", 100, 4.0)])
+        right = calculator.create_state()
+        calculator.accumulate(
+            right,
+            [Product("P2", "apple", 100, 5.0), Product("P3", "xiaomi", 100, 3.0)],
+        )
+
+        result = calculator.finalize(calculator.merge(left, right))
+
+        assert [(s.brand, s.average_rating, s.product_count) for s in result] == [
+            ("apple", 4.5, 2),
+            ("xiaomi", 3.0, 1),
+        ]
+
     @pytest.mark.parametrize(
         "products,expected_order",
         [
@@ -63,3 +99,215 @@ class TestBrandRatingCalculator:
         result = calculator.calculate(products)
         actual_order = [stats.brand for stats in result]
         assert actual_order == expected_order
+
+
+class TestTopAndMinProducts:
+    """Тесты отбора первых брендов и фильтра по количеству продуктов."""
+
+    PRODUCTS = [
+        Product("P%d" % i, "brand%d" % (i % 50), 100, (i * 7 % 11) / 2.2)
+        for i in range(400)
+    ]
+
+    @pytest.mark.parametrize(
+        "calculator_type",
+        ["average-rating", "rating-percentiles", "distinct-products"],
+    )
+    def test_top_is_prefix_of_full_result(self, calculator_type):
+        full = CalculatorFactory.create(calculator_type).calculate(self.PRODUCTS)
+        top = CalculatorFactory.create(calculator_type, top=5).calculate(self.PRODUCTS)
+
+        assert top == full[:5]
+
+    def test_equal_ratings_keep_order(self):
+        products = [Product("P", "brand%d" % i, 100, 4.0) for i in range(10)]
+
+        result = BrandRatingCalculator(top=3).calculate(products)
+
+        assert [stats.brand for stats in result] == ["brand0", "brand1", "brand2"]
+
+    def test_min_products(self):
+        products = [
+            Product("iPhone", "apple", 999, 4.9),
+            Product("iPad", "apple", 799, 4.5),
+            Product("Galaxy", "samsung", 899, 4.8),
+        ]
+
+        result = BrandRatingCalculator(min_products=2).calculate(products)
+
+        assert [(s.brand, s.product_count) for s in result] == [("apple", 2)]
+
+
+class TestSketchCalculators:
+    """Тесты калькуляторов на скетчах."""
+
+    def test_rating_percentiles(self):
+        products = [Product("P%d" % i, "apple", 100, i / 2) for i in range(11)]
+        products.append(Product("Galaxy", "samsung", 899, 4.8))
+
+        result = RatingPercentilesCalculator().calculate(products)
+
+        assert [stats.brand for stats in result] == ["samsung", "apple"]
+        assert result[1].median_rating == 2.5
+        assert result[1].p90_rating == 4.5
+        assert result[1].product_count == 11
+        assert result[1].average_rating == 2.5
+
+    def test_distinct_products(self):
+        products = [
+            Product("iPhone", "apple", 999, 4.9),
+            Product("iPhone", "apple", 999, 4.7),
+            Product("iPad", "apple", 799, 4.5),
+            Product("Galaxy", "samsung", 899, 4.8),
+        ]
+
+        result = DistinctProductsCalculator().calculate(products)
+
+        assert [(s.brand, s.distinct_products, s.product_count) for s in result] == [
+            ("apple", 2, 3),
+            ("samsung", 1, 1),
+        ]
+
+    @pytest.mark.parametrize(
+        "calculator", [RatingPercentilesCalculator(), DistinctProductsCalculator()]
+    )
+    def test_merge_matches_single_pass(self, calculator):
+        products = [
+            Product("P%d" % (i % 7), "brand%d" % (i % 3), 100, (i % 11) / 2)
+            for i in range(300)
+        ]
+        first, second = calculator.create_state(), calculator.create_state()
+        calculator.accumulate(first, products[:100])
+        calculator.accumulate(second, products[100:])
+
+        merged = calculator.merge(calculator.create_state(), first)
+        merged = calculator.merge(merged, second)
+
+        assert calculator.finalize(merged) == calculator.calculate(products)
+
+
+class TestPriceCalculators:
+    """Тесты калькуляторов по ценам."""
+
+    PRODUCTS = [
+        Product("iPhone", "apple", 999, 4.9),
+        Product("iPad", "apple", 500, 4.5),
+        Product("Watch", "apple", 499, 4.0),
+        Product("Redmi", "xiaomi", 100, 4.0),
+        Product("Mi", "xiaomi", 300, 5.0),
+    ]
+
+    def test_price_bands(self):
+        result = PriceBandsCalculator().calculate(self.PRODUCTS)
+
+        # Цена, равная границе, относится к верхнему диапазону
+        assert [
+            (s.brand, s.price_band, s.average_rating, s.product_count) for s in result
+        ] == [
+            ("xiaomi", "< 200", 4.0, 1),
+            ("xiaomi", "200 - 500", 5.0, 1),
+            ("apple", "200 - 500", 4.0, 1),
+            ("apple", "500 - 1000", 4.7, 2),
+        ]
+
+    def test_price_bands_top_selects_brands(self):
+        result = PriceBandsCalculator(top=1, price_bounds=[300]).calculate(
+            self.PRODUCTS
+        )
+
+        assert [(s.brand, s.price_band) for s in result] == [
+            ("xiaomi", "< 300"),
+            ("xiaomi", ">= 300"),
+        ]
+
+    def test_price_weighted_rating(self):
+        result = PriceWeightedRatingCalculator().calculate(self.PRODUCTS)
+
+        assert [(s.brand, s.weighted_rating) for s in result] == [
+            ("xiaomi", 4.75),
+            ("apple", 4.58),
+        ]
+
+    def test_price_range(self):
+        result = PriceRangeCalculator(min_products=3).calculate(self.PRODUCTS)
+
+        assert [
+            (s.brand, s.min_price, s.average_price, s.max_price) for s in result
+        ] == [("apple", 499, 666.0, 999)]
+
+    def test_merge_matches_single_pass(self):
+        calculator = PriceBandsCalculator()
+        first, second = calculator.create_state(), calculator.create_state()
+        calculator.accumulate(first, self.PRODUCTS[:2])
+        calculator.accumulate(second, self.PRODUCTS[2:])
+
+        merged = calculator.merge(first, second)
+
+        assert calculator.finalize(merged) == calculator.calculate(self.PRODUCTS)
+
+    def test_bounds_must_increase(self):
+        with pytest.raises(ValueError, match="increasing"):
+            PriceBandsCalculator(price_bounds=[500, 200])
+
+    def test_composite_shares_state(self):
+        types = ["price-bands", "price-weighted-rating", "price-range"]
+        calculators = [CalculatorFactory.create(t) for t in types]
+        composite = CompositeCalculator(calculators)
+
+        state = composite.create_state()
+        composite.accumulate(state, self.PRODUCTS)
+
+        assert len(state) == 1
+        assert composite.finalize_each(state) == [
+            calculator.calculate(self.PRODUCTS) for calculator in calculators
+        ]
+
+
+class TestCompositeCalculator:
+    """Тесты расчета нескольких отчетов за один проход."""
+
+    PRODUCTS = [
+        Product("P%d" % (i % 7), "brand%d" % (i % 3), 100, (i % 11) / 2)
+        for i in range(3000)
+    ]
+    TYPES = ["average-rating", "rating-percentiles", "distinct-products"]
+
+    def test_matches_separate_calculators(self):
+        calculators = [CalculatorFactory.create(t, top=2) for t in self.TYPES]
+        composite = CompositeCalculator(calculators)
+        state = composite.create_state()
+        composite.accumulate(state, iter(self.PRODUCTS))
+
+        assert composite.finalize_each(state) == [
+            calculator.calculate(self.PRODUCTS) for calculator in calculators
+        ]
+        assert composite.required_columns == ("name", "brand", "rating")
+        with pytest.raises(TypeError, match="finalize_each"):
+            composite.finalize(state)
+
+    def test_merge(self):
+        composite = CompositeCalculator(CalculatorFactory.create(t) for t in self.TYPES)
+        first, second = composite.create_state(), composite.create_state()
+        composite.accumulate(first, self.PRODUCTS[:1000])
+        composite.accumulate(second, self.PRODUCTS[1000:])
+        whole = composite.create_state()
+        composite.accumulate(whole, self.PRODUCTS)
+
+        merged = composite.merge(first, second)
+
+        assert composite.finalize_each(merged) == composite.finalize_each(whole)
+
+    def test_requires_calculators(self):
+        with pytest.raises(ValueError, match="No calculators"):
+            CompositeCalculator([])
+
+
+class TestCalculatorFactory:
+    """Тесты фабрики калькуляторов."""
+
+    def test_required_columns(self):
+        columns = CalculatorFactory.get_required_columns("average-rating")
+        assert columns == ("brand", "rating")
+
+        with pytest.raises(ValueError, match="Unknown calculator type"):
+            CalculatorFactory.get_required_columns("unknown")
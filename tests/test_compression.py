@@ -0,0 +1,169 @@
+import asyncio
+import bz2
+import gzip
+import importlib.util
+import lzma
+import os
+
+import pytest
+
+from core.async_reader import AsyncCSVProductReader
+from core.cache import AggregateCache
+from core.calculator import BrandRatingCalculator
+from core.incremental import IncrementalAggregator
+from core.parallel import ParallelAggregator
+from core.reader import READERS, CSVProductReader
+from core.utils.compression import (
+    BackgroundReader,
+    decompress_stream,
+    detect_compression,
+    open_input,
+)
+from core.utils.converters import DataConverter
+from core.utils.validators import DataValidator
+from tests.test_parallel import TRICKY_CSV
+
+COMPRESSORS = {"gzip": gzip.compress, "bz2": bz2.compress, "xz": lzma.compress}
+EXTENSIONS = {"gzip": ".gz", "bz2": ".bz2", "xz": ".xz"}
+
+
+@pytest.fixture
+def compressed_csv(tmp_path):
+    """Создает сжатый CSV файл с расширением сжатия или без него."""
+
+    def _create(content: str, compression: str, extension: bool = True) -> str:
+        name = "products.csv" + (EXTENSIONS[compression] if extension else "")
+        path = tmp_path / name
+        path.write_bytes(COMPRESSORS[compression](content.encode("utf-8")))
+        return str(path)
+
+    return _create
+
+
+def calculate(reader, paths):
+    return BrandRatingCalculator().calculate(reader.iter_products(paths))
+
+
+class TestDetectCompression:
+    """Тесты определения сжатия."""
+
+    @pytest.mark.parametrize("compression", list(COMPRESSORS))
+    def test_by_extension_and_magic(self, compressed_csv, compression):
+        assert detect_compression(compressed_csv("a\n", compression)) == compression
+        path = compressed_csv("a\n", compression, extension=False)
+        assert detect_compression(path) == compression
+
+    def test_plain_file(self, temp_csv_file):
+        assert detect_compression(temp_csv_file("BZh9,brand\n")) is None
+        assert detect_compression("products.csv.zst", b"") == "zstd"
+
+    @pytest.mark.skipif(
+        importlib.util.find_spec("zstandard") is not None,
+        reason="zstandard установлен",
+    )
+    def test_zstd_requires_library(self, tmp_path):
+        path = tmp_path / "products.csv.zst"
+        path.write_bytes(b"\x28\xb5\x2f\xfd")
+        reader = CSVProductReader(DataValidator(), DataConverter())
+
+        with pytest.raises(ValueError, match="requires zstandard"):
+            reader.read([str(path)])
+
+
+class TestBackgroundReader:
+    """Тесты распаковки в фоновом потоке."""
+
+    def test_reads_all_blocks(self, tmp_path):
+        data = os.urandom(100_000)
+        path = tmp_path / "data.gz"
+        path.write_bytes(gzip.compress(data))
+
+        with open(path, "rb") as file:
+            stream = BackgroundReader(decompress_stream(file, "gzip"), 1000, 2)
+            assert stream.read() == data
+            stream.close()
+
+    def test_error_is_passed_to_reader(self, tmp_path):
+        path = tmp_path / "broken.csv.gz"
+        path.write_bytes(gzip.compress(os.urandom(10_000))[:5000])
+
+        with pytest.raises(EOFError):
+            with open_input(str(path)) as stream:
+                stream.read()
+
+    def test_close_before_end(self, tmp_path):
+        path = tmp_path / "data.gz"
+        path.write_bytes(gzip.compress(b"x" * 1_000_000))
+
+        with open(path, "rb") as file:
+            stream = BackgroundReader(decompress_stream(file, "gzip"), 100, 1)
+            assert stream.read(10) == b"x" * 10
+            stream.close()
+
+        assert stream.closed
+
+
+class TestCompressedInput:
+    """Тесты чтения сжатых CSV файлов."""
+
+    @pytest.mark.parametrize("reader_type", list(READERS))
+    @pytest.mark.parametrize("compression", list(COMPRESSORS))
+    @pytest.mark.parametrize("extension", [True, False])
+    def test_matches_plain_file(
+        self, temp_csv_file, compressed_csv, reader_type, compression, extension
+    ):
+        reader = READERS[reader_type](DataValidator(), DataConverter())
+        path = compressed_csv(TRICKY_CSV, compression, extension)
+
+        assert calculate(reader, [path]) == calculate(
+            reader, [temp_csv_file(TRICKY_CSV)]
+        )
+
+    def test_compressed_file_is_not_split(self, temp_csv_file, compressed_csv):
+        reader = READERS["fast"](DataValidator(), DataConverter())
+        path = compressed_csv(TRICKY_CSV, "gzip")
+        aggregator = ParallelAggregator(reader, jobs=2, chunk_size=16)
+
+        (state,) = aggregator.aggregate_each(BrandRatingCalculator(), [path])
+
+        assert BrandRatingCalculator().finalize(state) == calculate(
+            reader, [temp_csv_file(TRICKY_CSV)]
+        )
+
+    def test_incremental_rereads_changed_file(self, tmp_path, compressed_csv):
+        reader = CSVProductReader(DataValidator(), DataConverter())
+        cache = AggregateCache(str(tmp_path / "cache"))
+        aggregator = IncrementalAggregator(reader, cache, chunk_size=16)
+        calculator = BrandRatingCalculator()
+        header = "name,brand,price,rating\n"
+
+        def aggregate(path):
+            (state,) = aggregator.aggregate_each(calculator, [path], "average-rating")
+            return {
+                stat.brand: stat.product_count for stat in calculator.finalize(state)
+            }
+
+        path = compressed_csv(header + "iPhone,Apple,999,4.9\n", "gzip")
+        assert aggregate(path) == {"apple": 1}
+        assert aggregate(path) == {"apple": 1}
+
+        # Дописанный gzip-член: файл вырос, но дочитать его с середины нельзя
+        with open(path, "ab") as file:
+            file.write(gzip.compress(b"iPad,Apple,599,4.1\n"))
+        assert aggregate(path) == {"apple": 2}
+
+    def test_async_reader(self, temp_csv_file, compressed_csv):
+        reader = CSVProductReader(DataValidator(), DataConverter())
+        async_reader = AsyncCSVProductReader(reader, block_size=7)
+        path = compressed_csv(TRICKY_CSV, "xz", extension=False)
+        calculator = BrandRatingCalculator()
+
+        async def run():
+            try:
+                return await async_reader.aggregate(calculator, [path])
+            finally:
+                async_reader.close()
+
+        assert calculator.finalize(asyncio.run(run())) == calculate(
+            reader, [temp_csv_file(TRICKY_CSV)]
+        )
@@ -0,0 +1,60 @@
+import pytest
+
+from core.debug import (
+    DEFAULT_SAMPLE_LIMIT,
+    debug_print,
+    error_print,
+    sampled_debug_print,
+    set_debug_mode,
+)
+
+
+class Formatted:
+    """Значение, считающее свои форматирования."""
+
+    calls = 0
+
+    def __str__(self) -> str:
+        Formatted.calls += 1
+        return "value"
+
+
+@pytest.fixture
+def debug_mode():
+    set_debug_mode(True)
+    yield
+    set_debug_mode(False)
+
+
+class TestDebugOutput:
+    """Тесты debug-вывода через logging."""
+
+    def test_arguments_are_formatted_lazily(self, capsys):
+        Formatted.calls = 0
+
+        debug_print("Значение: %s", Formatted())
+
+        assert Formatted.calls == 0
+        assert capsys.readouterr().out == ""
+
+    def test_debug_output(self, debug_mode, capsys):
+        debug_print("Значение: %s, %d%%", Formatted(), 5)
+
+        assert capsys.readouterr().out == "Значение: value, 5%\n"
+
+    def test_errors_are_always_printed(self, capsys):
+        error_print("Analysis failed: %s", "reason")
+
+        captured = capsys.readouterr()
+        assert captured.err == "Analysis failed: reason\n"
+        assert captured.out == ""
+
+    def test_sampled_messages(self, debug_mode, capsys):
+        for count in range(1, DEFAULT_SAMPLE_LIMIT + 5):
+            sampled_debug_print(count, "empty_row", "Строка %d", count)
+
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[:-1] == [
+            "Строка %d" % n for n in range(1, DEFAULT_SAMPLE_LIMIT + 1)
+        ]
+        assert "empty_row" in lines[-1]
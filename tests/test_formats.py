@@ -0,0 +1,103 @@
+import csv
+import io
+import json
+
+import pytest
+
+from core.analyzer import BrandRatingAnalyzer
+from core.models import BrandStatistics
+from core.reports import ReportFactory, ReportWriterFactory
+
+FILES = ["tests/fixtures/sample.csv", "tests/fixtures/multiple_brands.csv"]
+
+STATISTICS = [
+    BrandStatistics("apple", 4.83, 3),
+    BrandStatistics("samsung", 4.67, 3),
+]
+
+
+def render(output_format: str, report_type: str = "average-rating") -> str:
+    output = io.StringIO()
+    ReportWriterFactory.create(output_format).write(
+        ReportFactory.create(report_type), iter(STATISTICS), output
+    )
+    return output.getvalue()
+
+
+class TestReportWriters:
+    """Тесты форматов вывода отчетов."""
+
+    def test_grid_matches_generate(self):
+        report = ReportFactory.create("average-rating")
+        assert render("grid") == report.generate(STATISTICS) + "\n"
+
+    def test_csv(self):
+        rows = list(csv.reader(io.StringIO(render("csv"))))
+
+        assert rows == [
+            ["brand", "average_rating", "product_count"],
+            ["apple", "4.83", "3"],
+            ["samsung", "4.67", "3"],
+        ]
+
+    def test_jsonl(self):
+        lines = render("jsonl").splitlines()
+
+        assert [json.loads(line) for line in lines] == [
+            {"brand": "apple", "average_rating": 4.83, "product_count": 3},
+            {"brand": "samsung", "average_rating": 4.67, "product_count": 3},
+        ]
+
+    def test_report_columns(self):
+        data = [BrandStatistics("apple", 4.5, 4, distinct_products=2)]
+        rows = ReportFactory.create("distinct-products").iter_rows(data)
+
+        assert list(rows) == [("apple", 2, 4)]
+
+    def test_unknown_format(self):
+        with pytest.raises(ValueError, match="Unknown output format"):
+            ReportWriterFactory.create("xml")
+
+    def test_parquet(self, tmp_path):
+        pq = pytest.importorskip("pyarrow.parquet")
+        path = str(tmp_path / "report.parquet")
+
+        BrandRatingAnalyzer().write_report(FILES, "average-rating", "parquet", path)
+
+        table = pq.read_table(path)
+        assert table.column_names == ["brand", "average_rating", "product_count"]
+        assert table.column("brand").to_pylist() == ["apple", "samsung", "xiaomi"]
+
+
+class TestWriteReport:
+    """Тесты записи отчета анализатором."""
+
+    def test_grid_to_stdout_matches_analyze(self, capsys):
+        analyzer = BrandRatingAnalyzer()
+        analyzer.write_report(FILES, "average-rating")
+
+        assert (
+            capsys.readouterr().out == analyzer.analyze(FILES, "average-rating") + "\n"
+        )
+
+    def test_csv_to_file(self, tmp_path):
+        path = str(tmp_path / "report.csv")
+
+        BrandRatingAnalyzer().write_report(FILES, "average-rating", "csv", path, top=2)
+
+        with open(path, encoding="utf-8") as file:
+            assert file.read() == (
+                "brand,average_rating,product_count\n"
+                "apple,4.83,3\n"
+                "samsung,4.67,3\n"
+            )
+
+    def test_failed_analysis_creates_no_file(self, tmp_path):
+        path = tmp_path / "report.csv"
+
+        with pytest.raises(FileNotFoundError):
+            BrandRatingAnalyzer().write_report(
+                ["missing.csv"], "average-rating", "csv", str(path)
+            )
+
+        assert not path.exists()
@@ -0,0 +1,281 @@
+import os
+
+import pytest
+
+from core import incremental
+from core.analyzer import BrandRatingAnalyzer
+from core.cache import AggregateCache, file_digest
+from core.calculator import BrandRatingCalculator
+from core.incremental import FileCheckpoint, IncrementalAggregator
+from core.reader import READERS, CSVProductReader
+from core.utils.converters import DataConverter
+from core.utils.validators import DataValidator
+
+HEADER = "name,brand,price,rating\n"
+ROWS = "iPhone,Apple,999,4.9\nGalaxy,Samsung,899,4.7\n"
+MORE_ROWS = "Redmi,Xiaomi,199,4.6\niPad,Apple,599,4.1\n"
+
+
+@pytest.fixture
+def cache(tmp_path) -> AggregateCache:
+    return AggregateCache(str(tmp_path / "cache"))
+
+
+@pytest.fixture
+def aggregator(cache, monkeypatch) -> IncrementalAggregator:
+    reader = CSVProductReader(DataValidator(), DataConverter())
+    aggregator = IncrementalAggregator(reader, cache, chunk_size=32)
+
+    # Запоминаем начала прочитанных фрагментов
+    aggregator.read_starts = []
+    iter_chunk = reader.iter_chunk
+
+    def tracking_iter_chunk(chunk, skipped=None):
+        aggregator.read_starts.append(chunk.start)
+        return iter_chunk(chunk, skipped)
+
+    monkeypatch.setattr(reader, "iter_chunk", tracking_iter_chunk)
+    return aggregator
+
+
+def aggregate(aggregator, path):
+    calculator = BrandRatingCalculator()
+    aggregator.read_starts.clear()
+    (state,) = aggregator.aggregate_each(calculator, [path], "average-rating")
+    return {
+        stat.brand: (stat.average_rating, stat.product_count)
+        for stat in calculator.finalize(state)
+    }
+
+
+def expected(path):
+    calculator = BrandRatingCalculator()
+    reader = CSVProductReader(DataValidator(), DataConverter())
+    return {
+        stat.brand: (stat.average_rating, stat.product_count)
+        for stat in calculator.calculate(reader.iter_products([path]))
+    }
+
+
+def append(path, text):
+    with open(path, "a", encoding="utf-8") as file:
+        file.write(text)
+
+
+class TestIncrementalAggregator:
+    """Тесты инкрементальной агрегации дописываемых файлов."""
+
+    def test_unchanged_file_is_not_read(self, aggregator, temp_csv_file):
+        path = temp_csv_file(HEADER + ROWS)
+        first = aggregate(aggregator, path)
+        assert aggregator.read_starts
+
+        assert aggregate(aggregator, path) == first == expected(path)
+        assert aggregator.read_starts == []
+
+    def test_appended_tail_is_read(self, aggregator, temp_csv_file):
+        path = temp_csv_file(HEADER + ROWS)
+        aggregate(aggregator, path)
+        size = os.path.getsize(path)
+
+        append(path, MORE_ROWS)
+        result = aggregate(aggregator, path)
+
+        assert result == expected(path)
+        assert result["apple"] == (4.5, 2)
+        assert min(aggregator.read_starts) == size
+
+    def test_truncated_file_is_rescanned(self, aggregator, temp_csv_file):
+        path = temp_csv_file(HEADER + ROWS + MORE_ROWS)
+        aggregate(aggregator, path)
+
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(HEADER + ROWS)
+
+        assert aggregate(aggregator, path) == expected(path)
+        assert min(aggregator.read_starts) == len(HEADER)
+
+    def test_rewritten_file_is_rescanned(self, aggregator, temp_csv_file):
+        path = temp_csv_file(HEADER + ROWS)
+        aggregate(aggregator, path)
+
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(HEADER + ROWS.replace("Apple", "Alpha") + MORE_ROWS)
+
+        assert aggregate(aggregator, path) == expected(path)
+        assert min(aggregator.read_starts) == len(HEADER)
+
+    def test_changed_header_is_rescanned(self, aggregator, temp_csv_file):
+        path = temp_csv_file(HEADER + ROWS)
+        aggregate(aggregator, path)
+
+        with open(path, "w", encoding="utf-8") as file:
+            file.write("rating,price,brand,name\n" + "4.0,1,Apple,X\n" * 4)
+
+        assert aggregate(aggregator, path) == expected(path)
+
+    def test_touched_file_is_checked_by_hash(
+        self, aggregator, temp_csv_file, monkeypatch
+    ):
+        path = temp_csv_file(HEADER + ROWS)
+        hashed = []
+        monkeypatch.setattr(
+            incremental,
+            "file_digest",
+            lambda file_path: hashed.append(file_path) or file_digest(file_path),
+        )
+        first = aggregate(aggregator, path)
+        # При первом чтении файл не хэшируется целиком
+        assert hashed == []
+
+        # Хэша нет: после первого изменения mtime файл читается заново
+        os.utime(path, ns=(1, 1))
+        assert aggregate(aggregator, path) == first
+        assert aggregator.read_starts
+        assert hashed == [path]
+
+        os.utime(path, ns=(2, 2))
+        assert aggregate(aggregator, path) == first
+        assert aggregator.read_starts == []
+
+        with open(path, "r+", encoding="utf-8") as file:
+            file.seek(len(HEADER))
+            file.write("iPhone,Apple,999,1.9")  # Тот же размер, другое содержимое
+        os.utime(path, ns=(3, 3))
+
+        assert aggregate(aggregator, path) == expected(path)
+        assert aggregator.read_starts
+
+    def test_unterminated_line_is_not_checkpointed(
+        self, aggregator, cache, temp_csv_file
+    ):
+        path = temp_csv_file(HEADER + ROWS + "Redmi,Xiao")
+        assert aggregate(aggregator, path) == expected(path)
+
+        checkpoint = cache.load(path, "average-rating")
+        assert isinstance(checkpoint, FileCheckpoint)
+        assert checkpoint.offset == len(HEADER + ROWS)
+        assert checkpoint.rows == 2
+
+        append(path, "mi,199,4.6\n")
+        assert aggregate(aggregator, path)["xiaomi"] == (4.6, 1)
+        assert aggregator.read_starts == [len(HEADER + ROWS)]
+
+    def test_quoted_newline_before_unterminated_end(
+        self, aggregator, cache, temp_csv_file
+    ):
+        path = temp_csv_file(HEADER + ROWS + '"Note\n10",Samsung,1,4.0')
+        assert aggregate(aggregator, path) == expected(path)
+        # Запись не завершена, контрольная точка не сохраняется
+        assert cache.load(path, "average-rating") is None
+
+        append(path, "\n" + MORE_ROWS)
+        assert aggregate(aggregator, path) == expected(path)
+        assert cache.load(path, "average-rating").offset == os.path.getsize(path)
+
+    @pytest.mark.parametrize("reader_type", list(READERS))
+    def test_appended_end_of_quoted_field(self, cache, temp_csv_file, reader_type):
+        path = temp_csv_file(HEADER + ROWS + '"multi\n')
+        reader = READERS[reader_type](DataValidator(), DataConverter())
+        aggregator = IncrementalAggregator(reader, cache, chunk_size=32)
+        aggregator.read_starts = []
+
+        assert aggregate(aggregator, path) == expected(path)
+        # Запись закрыта только концом файла внутри кавычек
+        assert cache.load(path, "average-rating").offset == len(HEADER + ROWS)
+
+        append(path, 'line, two",Xiaomi,143,5\n')
+        result = aggregate(aggregator, path)
+
+        assert result == expected(path)
+        assert result["xiaomi"] == (5.0, 1)
+
+    @pytest.mark.parametrize("reader_type", list(READERS))
+    def test_appended_after_open_quote_in_middle_chunk(
+        self, cache, temp_csv_file, reader_type
+    ):
+        rows = "".join("p%d,acme,10,1\n" % index for index in range(50))
+        path = temp_csv_file(HEADER + rows + '"stray,acme,10,1\n' + rows)
+        reader = READERS[reader_type](DataValidator(), DataConverter())
+        aggregator = IncrementalAggregator(reader, cache, chunk_size=256)
+        aggregator.read_starts = []
+
+        assert aggregate(aggregator, path) == expected(path)
+        # Контрольная точка не заходит за начало незакрытой записи
+        assert cache.load(path, "average-rating").offset <= len(HEADER + rows)
+
+        append(path, rows)
+        assert aggregate(aggregator, path) == expected(path)
+
+    def test_rewritten_prefix_of_grown_file(self, aggregator, cache, temp_csv_file):
+        rows = "".join("p%05d,acme,10,1\n" % index for index in range(10000))
+        path = temp_csv_file(HEADER + rows)
+        aggregate(aggregator, path)
+
+        # Правка в середине прочитанной части без изменения размера и дописывание
+        middle = len(HEADER + rows) // 2 + 1
+        with open(path, "r+b") as file:
+            file.seek(middle)
+            line = file.readline()
+            file.seek(middle)
+            file.write(line.replace(b",1\n", b",5\n"))
+        append(path, MORE_ROWS)
+
+        assert aggregate(aggregator, path) == expected(path)
+        assert aggregator.read_starts[0] == len(HEADER)
+        assert cache.load(path, "average-rating").offset == os.path.getsize(path)
+
+    def test_not_stored_if_file_changed_while_reading(
+        self, aggregator, cache, temp_csv_file, monkeypatch
+    ):
+        path = temp_csv_file(HEADER + ROWS)
+        plan_file = aggregator._plan_file
+
+        def plan_and_append(*args):
+            plan = plan_file(*args)
+            append(path, MORE_ROWS)
+            return plan
+
+        monkeypatch.setattr(aggregator, "_plan_file", plan_and_append)
+        aggregate(aggregator, path)
+
+        assert cache.load(path, "average-rating") is None
+
+    def test_missing_file(self, aggregator):
+        with pytest.raises(FileNotFoundError):
+            aggregate(aggregator, "missing.csv")
+
+
+class TestAnalyzerIncremental:
+    """Тесты анализатора на дописываемых файлах."""
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_appends_match_full_scan(self, cache, temp_csv_file, jobs):
+        path = temp_csv_file(HEADER + ROWS)
+        analyzer = BrandRatingAnalyzer(jobs=jobs, cache=cache)
+
+        for _ in range(3):
+            analyzer.analyze([path], "average-rating")
+            append(path, MORE_ROWS + "\n,,,\n")
+
+        result = analyzer.analyze([path], "average-rating")
+        assert result == BrandRatingAnalyzer().analyze([path], "average-rating")
+
+    def test_skipped_rows_are_numbered_from_file_start(
+        self, cache, temp_csv_file, capsys
+    ):
+        from core.debug import set_debug_mode
+
+        path = temp_csv_file(HEADER + ROWS)
+        analyzer = BrandRatingAnalyzer(cache=cache)
+        analyzer.analyze([path], "average-rating")
+
+        append(path, "Bad,Apple,1,9.0\n")
+        set_debug_mode(True)
+        try:
+            capsys.readouterr()
+            analyzer.analyze([path], "average-rating")
+        finally:
+            set_debug_mode(False)
+
+        assert "Пропуск пустой строки 4 в файле" in capsys.readouterr().out
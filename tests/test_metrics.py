@@ -0,0 +1,123 @@
+import json
+import pickle
+
+import pytest
+
+from core.analyzer import BrandRatingAnalyzer
+from core.calculator import BrandRatingCalculator
+from core.metrics import Metrics, NullMetrics, get_metrics, set_metrics
+from core.parallel import ParallelAggregator
+from core.reader import READERS
+from core.utils.converters import DataConverter
+from core.utils.validators import DataValidator
+
+CSV = (
+    "name,brand,price,rating\n"
+    "iPhone,Apple,999,4.9\n"
+    ",Apple,1,4.0\n"
+    "Galaxy,Samsung,1,x\n"
+    "Pixel,Google,1,7\n"
+    ",,,\n"
+    ",,1,x\n"
+    "Short,Nokia\n"
+    "Redmi,Xiaomi,199,4.2\n"
+)
+
+EXPECTED_SKIPPED = {
+    "missing_field": 3,
+    "invalid_number": 1,
+    "invalid_rating": 1,
+    "empty_row": 1,
+}
+
+
+@pytest.fixture
+def metrics():
+    metrics = Metrics()
+    set_metrics(metrics)
+    yield metrics
+    set_metrics(None)
+
+
+class TestMetrics:
+    """Тесты сборщика метрик."""
+
+    def test_disabled_by_default(self):
+        assert isinstance(get_metrics(), NullMetrics)
+        assert list(get_metrics().timed("read", [1, 2])) == [1, 2]
+
+    def test_nested_stage_time_is_excluded(self):
+        metrics = Metrics()
+
+        with metrics.stage("aggregate"):
+            items = list(metrics.timed("read", range(3000)))
+
+        assert items == list(range(3000))
+        assert set(metrics.stages) == {"aggregate", "read"}
+        assert metrics.stages["read"].wall_seconds > 0
+
+    def test_merge_and_pickle(self):
+        first = Metrics()
+        first.record_rows("a.csv", 2, {"empty_row": 1})
+        first.record_bytes("a.csv", 10)
+        second = pickle.loads(pickle.dumps(first))
+
+        first.merge(second)
+
+        assert first.files["a.csv"].rows_processed == 4
+        assert first.files["a.csv"].rows_skipped == {"empty_row": 2}
+        assert first.files["a.csv"].bytes_read == 20
+
+    def test_exports(self):
+        metrics = Metrics()
+        with metrics.stage("render"):
+            pass
+        metrics.record_rows('data "1".csv', 3, {"invalid_number": 1})
+
+        document = json.loads(metrics.export("json"))
+        assert document["files"]['data "1".csv']["rows_processed"] == 3
+
+        prometheus = metrics.export("prometheus")
+        assert "# TYPE brand_rating_stage_wall_seconds gauge" in prometheus
+        assert (
+            'brand_rating_file_rows_skipped{file="data \\"1\\".csv",'
+            'reason="invalid_number"} 1' in prometheus
+        )
+
+        assert "invalid_number: 1" in metrics.export("text")
+        with pytest.raises(ValueError, match="Unknown stats format"):
+            metrics.export("xml")
+
+
+class TestAnalysisMetrics:
+    """Тесты метрик, собираемых при анализе."""
+
+    @pytest.mark.parametrize("reader_type", list(READERS))
+    def test_skip_reasons_match_across_readers(
+        self, metrics, temp_csv_file, reader_type
+    ):
+        path = temp_csv_file(CSV)
+
+        BrandRatingAnalyzer(reader_type=reader_type).analyze(
+            [path], "distinct-products"
+        )
+
+        file_metrics = metrics.files[path]
+        assert file_metrics.rows_processed == 2
+        assert file_metrics.rows_skipped == EXPECTED_SKIPPED
+        assert file_metrics.bytes_read == len(CSV)
+        assert set(metrics.stages) == {"read", "aggregate", "finalize", "render"}
+
+    def test_chunks_in_processes(self, metrics, temp_csv_file):
+        path = temp_csv_file(CSV)
+        reader = READERS["fast"](DataValidator(), DataConverter())
+
+        ParallelAggregator(reader, jobs=2, chunk_size=16).aggregate(
+            BrandRatingCalculator(), [path]
+        )
+
+        file_metrics = metrics.files[path]
+        assert file_metrics.rows_processed == 2
+        assert file_metrics.rows_skipped == EXPECTED_SKIPPED
+        assert file_metrics.bytes_read == len(CSV) - len("name,brand,price,rating\n")
+        assert "read" in metrics.stages
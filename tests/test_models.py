@@ -0,0 +1,62 @@
+import dataclasses
+
+import pytest
+
+from core.calculator import BrandRatingCalculator
+from core.models import Product, ProductTable
+
+PRODUCTS = [
+    Product("iPhone", "apple", 999, 4.9),
+    Product("Galaxy", "samsung", 899, 4.8),
+    Product("iPhone", "apple", 999, 4.1),
+    Product("Redmi", "xiaomi", 199, 4.6),
+]
+
+
+class TestProduct:
+    """Тесты модели продукта."""
+
+    def test_is_frozen_and_slotted(self):
+        product = Product("iPhone", "apple", 999, 4.9)
+
+        assert not hasattr(product, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            product.rating = 5.0  # type: ignore[misc]
+
+    def test_invalid_rating(self):
+        with pytest.raises(ValueError):
+            Product("iPhone", "apple", 999, 5.1)
+
+
+class TestProductTable:
+    """Тесты колоночного хранилища продуктов."""
+
+    def test_round_trip(self):
+        table = ProductTable.from_products(PRODUCTS)
+
+        assert len(table) == 4
+        assert list(table) == PRODUCTS
+        assert table[2] == PRODUCTS[2]
+
+    def test_strings_are_dictionary_encoded(self):
+        table = ProductTable.from_products(PRODUCTS)
+
+        assert table.brands == ["apple", "samsung", "xiaomi"]
+        assert table.names == ["iPhone", "Galaxy", "Redmi"]
+        assert list(table.brand_codes) == [0, 1, 0, 2]
+
+    def test_calculator_aggregates_columns(self):
+        calculator = BrandRatingCalculator()
+        table = ProductTable.from_products(PRODUCTS)
+
+        assert calculator.calculate(table) == calculator.calculate(PRODUCTS)
+
+    def test_numpy_engine_uses_columns(self):
+        pytest.importorskip("numpy")
+        from core.numpy_engine import NumpyBrandRatingCalculator
+
+        table = ProductTable.from_products(PRODUCTS)
+
+        assert NumpyBrandRatingCalculator().calculate(
+            table
+        ) == BrandRatingCalculator().calculate(PRODUCTS)
@@ -0,0 +1,76 @@
+import sys
+
+import pytest
+
+from core.accumulators import ACCUMULATORS
+from core.calculator import BrandRatingCalculator, CalculatorFactory
+from core.models import Product, ProductTable
+
+PRODUCTS = [
+    Product("P%d" % i, "brand%d" % (i % 7), 100, (i * 37 % 501) / 100)
+    for i in range(1000)
+]
+
+
+class TestNumpyEngine:
+    """Тесты колоночного движка NumPy."""
+
+    def test_results_identical_to_python(self):
+        pytest.importorskip("numpy")
+        from core.numpy_engine import NumpyBrandRatingCalculator
+
+        python_state = BrandRatingCalculator().create_state()
+        BrandRatingCalculator().accumulate(python_state, PRODUCTS)
+
+        calculator = NumpyBrandRatingCalculator()
+        numpy_state = calculator.create_state()
+        calculator.accumulate(numpy_state, iter(PRODUCTS))
+
+        assert numpy_state == python_state
+        assert list(numpy_state) == list(python_state)
+
+    @pytest.mark.parametrize("name", list(ACCUMULATORS))
+    def test_table_with_accumulators(self, name):
+        pytest.importorskip("numpy")
+        from core.numpy_engine import NumpyBrandRatingCalculator
+
+        table = ProductTable.from_products(PRODUCTS)
+        python_calculator = BrandRatingCalculator(accumulator=name)
+        python_state = python_calculator.create_state()
+        python_calculator.accumulate(python_state, PRODUCTS)
+
+        calculator = NumpyBrandRatingCalculator(accumulator=name)
+        numpy_state = calculator.create_state()
+        calculator.accumulate(numpy_state, table)
+        # Второй блок объединяется с уже накопленными суммами
+        python_calculator.accumulate(python_state, PRODUCTS)
+        calculator.accumulate(numpy_state, table)
+
+        assert list(numpy_state) == list(python_state)
+        for brand, ratings in numpy_state.items():
+            assert isinstance(ratings, ACCUMULATORS[name])
+            assert ratings.count == python_state[brand].count
+            if name in ("fsum", "welford"):
+                assert ratings == python_state[brand]
+            else:
+                # Суммы блоков округляются иначе, чем по одному значению
+                assert ratings.total == pytest.approx(python_state[brand].total)
+
+    def test_factory_creates_numpy_calculator(self):
+        pytest.importorskip("numpy")
+        from core.numpy_engine import NumpyBrandRatingCalculator
+
+        calculator = CalculatorFactory.create("average-rating", engine="numpy")
+        assert isinstance(calculator, NumpyBrandRatingCalculator)
+
+    def test_fallback_without_numpy(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "numpy", None)
+        monkeypatch.setitem(sys.modules, "core.numpy_engine", None)
+
+        calculator = CalculatorFactory.create("average-rating", engine="numpy")
+
+        assert type(calculator) is BrandRatingCalculator
+
+    def test_unknown_engine(self):
+        with pytest.raises(ValueError, match="Unknown engine: gpu"):
+            CalculatorFactory.create("average-rating", engine="gpu")
@@ -0,0 +1,98 @@
+import pytest
+
+from core.calculator import BrandRatingCalculator
+from core.debug import set_debug_mode
+from core.parallel import ParallelAggregator
+from core.reader import CSVProductReader
+from core.utils.converters import DataConverter
+from core.utils.validators import DataValidator
+
+FILES = [
+    "tests/fixtures/sample.csv",
+    "tests/fixtures/multiple_brands.csv",
+    "tests/fixtures/empty.csv",
+]
+
+
+@pytest.fixture
+def reader() -> CSVProductReader:
+    return CSVProductReader(DataValidator(), DataConverter())
+
+
+class TestParallelAggregator:
+    """Тесты параллельной агрегации файлов."""
+
+    def test_matches_serial_result(self, reader):
+        calculator = BrandRatingCalculator()
+
+        state = ParallelAggregator(reader, jobs=2).aggregate(calculator, FILES)
+
+        expected = calculator.calculate(reader.iter_products(FILES))
+        assert calculator.finalize(state) == expected
+
+    def test_worker_errors_are_propagated(self, reader):
+        aggregator = ParallelAggregator(reader, jobs=2)
+
+        with pytest.raises(FileNotFoundError):
+            aggregator.aggregate(
+                BrandRatingCalculator(), [FILES[0], "tests/fixtures/missing.csv"]
+            )
+
+
+TRICKY_CSV = (
+    "name,brand,price,rating\r\n"
+    '"Phone\r\nwith, newline",Apple,999,4.9\r\n'
+    "\r\n"
+    'TV 55",Samsung,1,4.1\r\n'
+    ",,,\r\n"
+    '"multi\n""quoted""\nname",Xiaomi,199,4.6\r\n'
+    "bad rating,Apple,1,7\r\n"
+    "ok,Samsung,1,3.3\r\n"
+    "last,Xiaomi,1,5"
+)
+
+
+class TestChunkedFiles:
+    """Тесты параллельного чтения одного файла по фрагментам."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 16, 40, 1000])
+    def test_chunks_match_serial_read(self, reader, temp_csv_file, chunk_size):
+        path = temp_csv_file(TRICKY_CSV)
+        calculator = BrandRatingCalculator()
+
+        state = calculator.create_state()
+        expected_end = None
+        for chunk in reader.split_file(path, chunk_size):
+            if expected_end is not None and chunk.start != expected_end:
+                chunk.start = expected_end  # Перечитывание, как в ParallelAggregator
+            calculator.accumulate(state, reader.iter_chunk(chunk))
+            expected_end = chunk.end
+
+        expected = calculator.calculate(reader.iter_products([path]))
+        assert calculator.finalize(state) == expected
+
+    def test_parallel_chunks_report_file_row_numbers(
+        self, reader, temp_csv_file, capsys
+    ):
+        path = temp_csv_file(TRICKY_CSV)
+        calculator = BrandRatingCalculator()
+
+        set_debug_mode(True)
+        try:
+            list(reader.iter_products([path]))
+            serial_output = capsys.readouterr().out
+
+            aggregator = ParallelAggregator(reader, jobs=2, chunk_size=16)
+            state = aggregator.aggregate(calculator, [path])
+            parallel_output = capsys.readouterr().out
+        finally:
+            set_debug_mode(False)
+
+        assert calculator.finalize(state) == calculator.calculate(
+            reader.iter_products([path])
+        )
+        skip_lines = [line for line in serial_output.splitlines() if "Пропуск" in line]
+        assert skip_lines == [
+            line for line in parallel_output.splitlines() if "Пропуск" in line
+        ]
+        assert "обработано 5 строк, пропущено 2 строк" in parallel_output
@@ -0,0 +1,236 @@
+import math
+
+import pytest
+
+from core.debug import set_debug_mode
+from core.models import PRODUCT_COLUMNS, Product
+from core.reader import (
+    READERS,
+    CSVProductReader,
+    FastCSVProductReader,
+    MmapCSVProductReader,
+)
+from core.utils.converters import DataConverter
+from core.utils.validators import DataValidator
+
+
+@pytest.fixture
+def reader() -> CSVProductReader:
+    return CSVProductReader(DataValidator(), DataConverter())
+
+
+class TestCSVProductReader:
+    """Тесты чтения CSV файлов."""
+
+    def test_read_sample(self, reader):
+        products = reader.read(["tests/fixtures/sample.csv"])
+
+        assert len(products) == 3
+        assert products[0] == Product("iPhone 15 Pro", "apple", 999.0, 4.9)
+
+    def test_read_multiple_files(self, reader):
+        products = reader.read(
+            ["tests/fixtures/sample.csv", "tests/fixtures/multiple_brands.csv"]
+        )
+        assert len(products) == 9
+
+    def test_skips_invalid_rows(self, reader, temp_csv_file):
+        path = temp_csv_file(
+            "name,brand,price,rating\n"
+            "ok,Apple,1,4.5\n"
+            ",,,\n"
+            "no brand,,1,4.0\n"
+            "bad price,Apple,abc,4.0\n"
+            "bad rating,Apple,1,7\n"
+        )
+        products = reader.read([path])
+        assert [p.name for p in products] == ["ok"]
+
+    def test_missing_columns(self, reader, temp_csv_file):
+        path = temp_csv_file("name,brand\nx,y\n")
+        with pytest.raises(ValueError, match="missing required columns"):
+            reader.read([path])
+
+    def test_file_not_found(self, reader):
+        with pytest.raises(FileNotFoundError):
+            reader.read(["tests/fixtures/does_not_exist.csv"])
+
+    def test_iter_products_is_lazy(self, reader, temp_csv_file):
+        path = temp_csv_file("name,brand,price,rating\na,x,1,4\nb,y,2,bad\n")
+        products = reader.iter_products([path])
+
+        # Первая строка отдается до того, как прочитана некорректная вторая
+        assert next(products).name == "a"
+        assert list(products) == []
+
+
+DIRTY_CSV = (
+    "name,brand,price,rating,name\n"
+    "dup name,Apple,1,4.5,real name\n"
+    "\n"
+    "x,  Samsung ,\t10 , 4.0 ,  spaced  \n"
+    "short,Apple,1\n"
+    "extra,Apple,1,4.0,extra,more\n"
+    " , , , \n"
+    'x,Xiaomi,"1,5",3,"quoted, name"\n'
+    "x,Apple,1,nan,nan rating\n"
+    "x,Apple,inf,5,inf price\n"
+    "x,Apple,1,-0.1,neg\n"
+    "x,\u00c9clair\u00a0,1e3,0,unicode\n"
+    "x,Apple,1,4,\n"
+)
+
+
+class TestFastCSVProductReader:
+    """Тесты быстрого режима чтения: результат совпадает с обычным."""
+
+    @pytest.fixture
+    def fast_reader(self) -> FastCSVProductReader:
+        return FastCSVProductReader(DataValidator(), DataConverter())
+
+    def test_matches_default_reader(self, reader, fast_reader, temp_csv_file, capsys):
+        path = temp_csv_file(DIRTY_CSV)
+
+        set_debug_mode(True)
+        try:
+            expected = reader.read([path])
+            expected_output = capsys.readouterr().out
+            actual = fast_reader.read([path])
+            actual_output = capsys.readouterr().out
+        finally:
+            set_debug_mode(False)
+
+        assert actual == expected
+        assert [p.name for p in actual] == [
+            "real name",
+            "spaced",
+            "extra",
+            "inf price",
+            "unicode",
+        ]
+        assert actual_output == expected_output
+
+    def test_chunks_match_default_reader(self, reader, fast_reader, temp_csv_file):
+        path = temp_csv_file(DIRTY_CSV)
+
+        for current in (reader, fast_reader):
+            products = []
+            for chunk in current.split_file(path, 32):
+                products.extend(current.iter_chunk(chunk))
+            assert products == reader.read([path])
+
+    def test_skips_validated_post_init(self):
+        product = Product.from_validated("n", "b", 1.0, 4.0)
+        assert product == Product("n", "b", 1.0, 4.0)
+
+
+MMAP_CASES = {
+    "dirty": DIRTY_CSV.encode("utf-8"),
+    "crlf": DIRTY_CSV.replace("\n", "\r\n").encode("utf-8"),
+    "lone_cr": b"name,brand,price,rating\ra,Apple,1,4\rb,Samsung,2,3\r\r\n",
+    "quoted_newline": (
+        b'name,brand,price,rating\n"multi\nline",Apple,1,4\n'
+        b'x,"Sam\r\nsung",2,3\nlast,Apple,1,5'
+    ),
+    "control_whitespace": b"name,brand,price,rating\n\x1cx\x1f,Apple\x1e,1,4\n",
+    "nul": b"name,brand,price,rating\nx\x00y,Apple,1,4\n",
+    "non_ascii_whitespace": (
+        "name,brand,price,rating\nx,Яблоко,\u20031,\u00a04\n".encode("utf-8")
+    ),
+}
+
+
+class TestMmapCSVProductReader:
+    """Тесты чтения через mmap: результат совпадает с обычным."""
+
+    @pytest.fixture
+    def mmap_reader(self) -> MmapCSVProductReader:
+        return MmapCSVProductReader(DataValidator(), DataConverter())
+
+    @pytest.mark.parametrize("content", MMAP_CASES.values(), ids=MMAP_CASES.keys())
+    def test_matches_default_reader(
+        self, reader, mmap_reader, tmp_path, capsys, content
+    ):
+        path = tmp_path / "data.csv"
+        path.write_bytes(content)
+
+        set_debug_mode(True)
+        try:
+            expected = reader.read([str(path)])
+            expected_output = capsys.readouterr().out
+            actual = mmap_reader.read([str(path)])
+            actual_output = capsys.readouterr().out
+        finally:
+            set_debug_mode(False)
+
+        assert actual == expected
+        assert actual_output == expected_output
+
+    @pytest.mark.parametrize("content", MMAP_CASES.values(), ids=MMAP_CASES.keys())
+    def test_chunks_match_default_reader(self, reader, mmap_reader, tmp_path, content):
+        path = tmp_path / "data.csv"
+        path.write_bytes(content)
+
+        for chunk_size in (1, 16, 1000):
+            products = []
+            expected_start = -1
+            for chunk in mmap_reader.split_file(str(path), chunk_size):
+                if expected_start >= 0:
+                    chunk.start = max(chunk.start, expected_start)
+                products.extend(mmap_reader.iter_chunk(chunk))
+                expected_start = chunk.end
+            assert products == reader.read([str(path)])
+
+    def test_invalid_utf8_is_an_error(self, mmap_reader, tmp_path):
+        path = tmp_path / "data.csv"
+        path.write_bytes(b"name,brand,price,rating\nx,\xff,1,4\n")
+
+        with pytest.raises(ValueError, match="Error reading file"):
+            mmap_reader.read([str(path)])
+
+
+PROJECTION_CSV = (
+    "brand,name,rating\n"
+    "Apple,,4.5\n"
+    "Samsung,x,4.0\n"
+    ",y,3.0\n"
+    "Apple,z,9\n"
+    "Xiaomi\n"
+)
+
+
+class TestColumnProjection:
+    """Тесты чтения только нужных колонок."""
+
+    @pytest.mark.parametrize("reader_class", READERS.values(), ids=READERS.keys())
+    def test_reads_only_projected_columns(self, temp_csv_file, reader_class):
+        path = temp_csv_file(PROJECTION_CSV)
+        reader = reader_class(DataValidator(), DataConverter(), ("brand", "rating"))
+
+        products = reader.read([path])
+
+        assert [(p.brand, p.rating) for p in products] == [
+            ("apple", 4.5),
+            ("samsung", 4.0),
+        ]
+        assert all(p.name == "" and math.isnan(p.price) for p in products)
+
+        chunked = []
+        for chunk in reader.split_file(path, 16):
+            chunked.extend(reader.iter_chunk(chunk))
+        assert [(p.brand, p.rating) for p in chunked] == [
+            (p.brand, p.rating) for p in products
+        ]
+
+    def test_headers_are_checked_for_projection_only(self, reader, temp_csv_file):
+        path = temp_csv_file(PROJECTION_CSV)
+
+        with pytest.raises(ValueError, match="missing required columns"):
+            reader.read([path])
+
+        assert reader.columns == PRODUCT_COLUMNS
+        assert reader.with_columns(["rating", "brand"]).columns == ("brand", "rating")
+
+    def test_unknown_column(self, reader):
+        with pytest.raises(ValueError, match="Unknown product columns"):
+            reader.with_columns(["brand", "color"])
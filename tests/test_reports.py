@@ -97,3 +97,62 @@ class TestAverageRatingReport:
         result = report.generate([])
         assert "brand" in result
         assert "rating" in result
+
+
+class TestSketchReports:
+    """Тесты отчетов по перцентилям и уникальным продуктам."""
+
+    def test_rating_percentiles_report(self):
+        report = ReportFactory.create("rating-percentiles")
+        result = report.generate(
+            [BrandStatistics("apple", 4.5, 10, median_rating=4.6, p90_rating=4.9)]
+        )
+
+        assert "median" in result and "p90" in result
+        assert "4.6" in result and "4.9" in result
+
+    def test_distinct_products_report(self):
+        report = ReportFactory.create("distinct-products")
+        result = report.generate(
+            [BrandStatistics("apple", 4.5, 10, distinct_products=7)]
+        )
+
+        assert "distinct products" in result
+        assert "apple" in result and "7" in result
+
+
+class TestPriceReports:
+    """Тесты отчетов по ценам."""
+
+    def test_price_bands_report(self):
+        report = ReportFactory.create("price-bands")
+        stats = BrandStatistics(
+            "apple", 4.5, 2, price_band="500 - 1000", average_price=750.5
+        )
+
+        result = report.generate([stats])
+
+        assert "price band" in result and "500 - 1000" in result
+        assert list(report.iter_rows([stats])) == [
+            ("apple", "500 - 1000", 4.5, 2, 750.5)
+        ]
+
+    def test_price_weighted_rating_report(self):
+        report = ReportFactory.create("price-weighted-rating")
+        result = report.generate(
+            [BrandStatistics("apple", 4.5, 2, weighted_rating=4.7)]
+        )
+
+        assert "weighted rating" in result and "4.7" in result
+
+    def test_price_range_report(self):
+        report = ReportFactory.create("price-range")
+        result = report.generate(
+            [
+                BrandStatistics(
+                    "apple", 4.5, 2, min_price=199, max_price=999, average_price=599
+                )
+            ]
+        )
+
+        assert "min price" in result and "199" in result and "999" in result
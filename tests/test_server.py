@@ -0,0 +1,182 @@
+import json
+import socket
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from core.analyzer import BrandRatingAnalyzer
+from core.cache import MemoryCache
+from core.server import BrandIndex, ReportServer
+
+CSV = "name,brand,price,rating\niPhone,Apple,999,4.9\nGalaxy,Samsung,899,4.7\n"
+
+
+@pytest.fixture
+def index(temp_csv_file) -> BrandIndex:
+    path = temp_csv_file(CSV)
+    index = BrandIndex(
+        BrandRatingAnalyzer(cache=MemoryCache()), [path], ["average-rating"]
+    )
+    index.refresh()
+    return index
+
+
+@pytest.fixture
+def running_server(index):
+    servers = []
+
+    def _start(brand_index=None, **kwargs) -> ReportServer:
+        kwargs.setdefault("watch_interval", 60)
+        server = ReportServer(brand_index or index, port=0, **kwargs)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        servers.append((server, thread))
+        return server
+
+    yield _start
+
+    for server, thread in servers:
+        server.shutdown()
+        thread.join()
+
+
+def get(server: ReportServer, path: str) -> tuple[int, str]:
+    try:
+        with urllib.request.urlopen(server.address + path) as response:
+            return response.status, response.read().decode("utf-8")
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode("utf-8")
+
+
+class TestBrandIndex:
+    """Тесты индекса статистик брендов."""
+
+    def test_refresh_only_after_change(self, index):
+        assert index.refresh() is False
+
+        with open(index.file_paths[0], "a", encoding="utf-8") as file:
+            file.write("iPad,Apple,799,4.5\n")
+
+        assert index.refresh() is True
+        (apple,) = index.get_snapshot("average-rating").brands["apple"]
+        assert apple.product_count == 2
+        assert apple.average_rating == 4.7
+
+    def test_snapshot_matches_analyze(self, index):
+        snapshot = index.get_snapshot("average-rating")
+        expected = BrandRatingAnalyzer().analyze(index.file_paths, "average-rating")
+
+        assert snapshot.text == expected
+        assert [item.brand for item in snapshot.statistics] == ["apple", "samsung"]
+
+    def test_failed_refresh_keeps_snapshot(self, index):
+        snapshot = index.get_snapshot("average-rating")
+        with open(index.file_paths[0], "w", encoding="utf-8") as file:
+            file.write("wrong,header\n")
+
+        with pytest.raises(ValueError):
+            index.refresh()
+
+        assert index.get_snapshot("average-rating") is snapshot
+        assert index.refresh() is False  # Повтор только после изменения файлов
+
+    def test_unknown_report(self):
+        with pytest.raises(ValueError, match="Unknown report type"):
+            BrandIndex(BrandRatingAnalyzer(), [], ["unknown"])
+
+
+class TestReportServer:
+    """Тесты HTTP сервера отчетов."""
+
+    def test_report_endpoints(self, index, running_server):
+        server = running_server()
+
+        assert get(server, "/reports") == (200, '{"reports": ["average-rating"]}')
+
+        status, body = get(server, "/reports/average-rating")
+        assert status == 200
+        assert body == index.get_snapshot("average-rating").text
+
+        status, body = get(server, "/reports/average-rating/brands")
+        assert json.loads(body) == [
+            {"brand": "apple", "average_rating": 4.9, "product_count": 1},
+            {"brand": "samsung", "average_rating": 4.7, "product_count": 1},
+        ]
+
+        status, body = get(server, "/reports/average-rating/brands/Apple")
+        assert status == 200
+        assert [item["brand"] for item in json.loads(body)] == ["apple"]
+
+    def test_brand_with_several_rows(self, temp_csv_file, running_server):
+        path = temp_csv_file(CSV + "iPad,Apple,99,4.1\nWatch,Apple,399,4.3\n")
+        index = BrandIndex(BrandRatingAnalyzer(), [path], ["price-bands"])
+        index.refresh()
+        server = running_server(brand_index=index)
+
+        status, body = get(server, "/reports/price-bands/brands/apple")
+
+        assert status == 200
+        rows = json.loads(body)
+        assert [row["product_count"] for row in rows] == [1, 1, 1]
+        assert len({row["price_band"] for row in rows}) == 3
+        _, all_rows = get(server, "/reports/price-bands/brands")
+        assert rows == [row for row in json.loads(all_rows) if row["brand"] == "apple"]
+
+    def test_brand_alias(self, temp_csv_file, running_server):
+        path = temp_csv_file(CSV + "iPad,Apple Inc.,799,4.5\n")
+        analyzer = BrandRatingAnalyzer(brand_aliases={"Apple Inc.": "Apple"})
+        index = BrandIndex(analyzer, [path], ["average-rating"])
+        index.refresh()
+        server = running_server(brand_index=index)
+
+        status, body = get(server, "/reports/average-rating/brands/Apple%20Inc.")
+
+        assert status == 200
+        (apple,) = json.loads(body)
+        assert apple["brand"] == "apple"
+        assert apple["product_count"] == 2
+
+    def test_not_found(self, running_server):
+        server = running_server()
+
+        assert get(server, "/reports/unknown")[0] == 404
+        assert get(server, "/reports/average-rating/brands/nokia")[0] == 404
+        assert get(server, "/other")[0] == 404
+
+    def test_watcher_refreshes_index(self, index, running_server):
+        server = running_server(watch_interval=0.01)
+
+        with open(index.file_paths[0], "a", encoding="utf-8") as file:
+            file.write("Pixel,Google,699,4.6\n")
+
+        for _ in range(500):
+            status, _ = get(server, "/reports/average-rating/brands/google")
+            if status == 200:
+                break
+            threading.Event().wait(0.01)
+        assert status == 200
+
+    @pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="no Unix sockets")
+    def test_unix_socket(self, tmp_path, running_server):
+        socket_path = str(tmp_path / "reports.sock")
+        server = running_server(socket_path=socket_path)
+        assert server.address == "unix:%s" % socket_path
+
+        with socket.socket(socket.AF_UNIX) as client:
+            client.connect(socket_path)
+            client.sendall(b"GET /health HTTP/1.0\r\n\r\n")
+            response = b""
+            while chunk := client.recv(4096):
+                response += chunk
+
+        assert response.startswith(b"HTTP/1.1 200")
+        assert b'"status": "ok"' in response
+
+    def test_unix_socket_in_use(self, tmp_path, running_server):
+        socket_path = str(tmp_path / "reports.sock")
+        running_server(socket_path=socket_path)
+
+        with pytest.raises(ValueError, match="already in use"):
+            running_server(socket_path=socket_path)
@@ -0,0 +1,87 @@
+import math
+import pickle
+import random
+
+import pytest
+
+from core.sketches import HyperLogLog, KLLSketch
+
+
+def exact_quantile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(q * len(ordered))) - 1]
+
+
+class TestKLLSketch:
+    """Тесты скетча квантилей."""
+
+    def test_exact_below_capacity(self):
+        sketch = KLLSketch()
+        sketch.update([4.0, 5.0, 3.0, 4.5])
+
+        assert sketch.quantile(0.5) == 4.0
+        assert sketch.quantile(0.9) == 5.0
+        assert sketch.quantile(0) == 3.0
+
+    def test_rank_error_and_bounded_size(self):
+        values = [random.Random(index).uniform(0, 5) for index in range(50_000)]
+        sketch = KLLSketch()
+        sketch.update(values)
+
+        assert len(sketch) < 1000
+        ordered = sorted(values)
+        for q in (0.1, 0.5, 0.9):
+            rank = ordered.index(sketch.quantile(q)) / len(ordered)
+            assert abs(rank - q) < 0.02
+
+    def test_merge_matches_single_sketch(self):
+        values = [random.Random(index).uniform(0, 5) for index in range(20_000)]
+        parts = [KLLSketch() for _ in range(4)]
+        for index, value in enumerate(values):
+            parts[index % 4].add(value)
+
+        merged = KLLSketch()
+        for part in parts:
+            merged.merge(pickle.loads(pickle.dumps(part)))
+
+        assert merged.count == len(values)
+        for q in (0.5, 0.9):
+            assert abs(merged.quantile(q) - exact_quantile(values, q)) < 0.1
+
+    def test_empty_and_invalid(self):
+        with pytest.raises(ValueError, match="empty"):
+            KLLSketch().quantile(0.5)
+        with pytest.raises(ValueError, match="between 0 and 1"):
+            KLLSketch().quantile(1.5)
+
+
+class TestHyperLogLog:
+    """Тесты скетча уникальных значений."""
+
+    def test_small_counts_are_exact(self):
+        sketch = HyperLogLog()
+        sketch.update(["iPhone", "Galaxy", "iPhone", "Pixel"])
+
+        assert sketch.count() == 3
+        assert HyperLogLog().count() == 0
+
+    def test_large_count_error(self):
+        sketch = HyperLogLog()
+        sketch.update("product-%d" % index for index in range(100_000))
+
+        assert abs(sketch.count() - 100_000) < 100_000 * 0.05
+
+    def test_merge_is_union(self):
+        first, second = HyperLogLog(), HyperLogLog()
+        first.update("p%d" % index for index in range(3_000))
+        second.update("p%d" % index for index in range(2_000, 5_000))
+
+        union = HyperLogLog()
+        union.update("p%d" % index for index in range(5_000))
+
+        merged = first.merge(pickle.loads(pickle.dumps(second)))
+        assert merged.count() == union.count()
+
+    def test_precision_mismatch(self):
+        with pytest.raises(ValueError, match="precision"):
+            HyperLogLog(10).merge(HyperLogLog(12))
@@ -0,0 +1,178 @@
+import asyncio
+import math
+import subprocess
+import sys
+
+import pytest
+
+from core.analyzer import BrandRatingAnalyzer
+from core.async_reader import AsyncCSVProductReader
+from core.cache import MemoryCache
+from core.calculator import BrandRatingCalculator
+from core.models import Product
+from core.reader import READERS, CSVProductReader
+from core.snapshot import is_snapshot, read_snapshot, write_snapshot
+from core.utils.converters import DataConverter
+from core.utils.validators import DataValidator
+from tests.test_startup import ROOT
+
+FILES = ["tests/fixtures/sample.csv", "tests/fixtures/multiple_brands.csv"]
+REPORTS = [
+    "average-rating",
+    "rating-percentiles",
+    "distinct-products",
+    "price-bands",
+    "price-range",
+]
+
+PRODUCTS = [
+    Product("iPhone", "apple", 999.0, 4.9),
+    Product("Galaxy", "samsung", 899.0, 4.8),
+    Product("iPad", "apple", 599.0, 4.1),
+    Product("Ёлка", "ёж", 1.5, 1.0),
+    Product("iPhone", "apple", 999.0, 4.7),
+]
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    """Преобразует CSV файлы в снимок так же, как main.py --convert."""
+
+    def _convert(file_paths) -> str:
+        path = str(tmp_path / "products.brs")
+        reader = CSVProductReader(DataValidator(), DataConverter())
+        write_snapshot(path, reader.iter_products(file_paths))
+        return path
+
+    return _convert
+
+
+class TestSnapshotFormat:
+    """Тесты записи и чтения снимка."""
+
+    def test_round_trip_groups_rows_by_brand(self, tmp_path):
+        path = str(tmp_path / "products.brs")
+
+        assert write_snapshot(path, PRODUCTS) == len(PRODUCTS)
+        assert is_snapshot(path)
+
+        table = read_snapshot(path)
+        assert table.brands == ["apple", "samsung", "ёж"]
+        assert list(table) == [
+            PRODUCTS[0],
+            PRODUCTS[2],
+            PRODUCTS[4],
+            PRODUCTS[1],
+            PRODUCTS[3],
+        ]
+        assert table.names == ["iPhone", "Galaxy", "iPad", "Ёлка"]
+
+    def test_projection(self, tmp_path):
+        path = str(tmp_path / "products.brs")
+        write_snapshot(path, PRODUCTS)
+
+        table = read_snapshot(path, ("brand", "rating"))
+
+        assert [product.name for product in table] == [""] * len(PRODUCTS)
+        assert all(math.isnan(price) for price in table.prices)
+        assert list(table.ratings) == [4.9, 4.1, 4.7, 4.8, 1.0]
+
+    @pytest.mark.skipif(sys.byteorder != "little", reason="big-endian copies columns")
+    def test_columns_are_not_copied(self, tmp_path):
+        path = str(tmp_path / "products.brs")
+        write_snapshot(path, PRODUCTS)
+        table = read_snapshot(path)
+
+        for column in (table.name_codes, table.prices, table.ratings):
+            assert isinstance(column, memoryview)
+            assert column.readonly
+        # Отображение живет вместе с таблицей, даже если снимок заменен
+        expected = list(table)
+        write_snapshot(path, PRODUCTS[:1])
+        assert list(table) == expected
+        assert len(read_snapshot(path)) == 1
+
+    def test_empty_snapshot(self, tmp_path):
+        path = str(tmp_path / "empty.brs")
+        write_snapshot(path, [])
+
+        assert len(read_snapshot(path)) == 0
+
+    def test_invalid_files(self, tmp_path):
+        path = str(tmp_path / "products.brs")
+        write_snapshot(path, PRODUCTS)
+        with open(path, "rb") as file:
+            data = file.read()
+
+        assert not is_snapshot("tests/fixtures/sample.csv")
+        assert not is_snapshot(str(tmp_path / "missing.brs"))
+
+        with open(path, "wb") as file:
+            file.write(data[:-8])
+        with pytest.raises(ValueError, match="truncated"):
+            read_snapshot(path)
+
+        with pytest.raises(ValueError, match="not a snapshot"):
+            read_snapshot("tests/fixtures/sample.csv")
+
+
+class TestSnapshotInput:
+    """Снимки принимаются везде вместо CSV файлов."""
+
+    @pytest.mark.parametrize("reader_type", list(READERS))
+    def test_reports_match_csv(self, snapshot, reader_type):
+        analyzer = BrandRatingAnalyzer(reader_type=reader_type)
+        path = snapshot(FILES)
+
+        assert analyzer.calculate_statistics_each(
+            [path], REPORTS
+        ) == analyzer.calculate_statistics_each(FILES, REPORTS)
+
+    @pytest.mark.parametrize("engine", ["python", "numpy"])
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_jobs_cache_and_engines(self, snapshot, engine, jobs):
+        if engine == "numpy":
+            pytest.importorskip("numpy")
+        path = snapshot(FILES)
+        expected = BrandRatingAnalyzer().analyze(FILES, "average-rating")
+
+        for cache in (None, MemoryCache()):
+            analyzer = BrandRatingAnalyzer(jobs=jobs, engine=engine, cache=cache)
+            # Снимок вместе с CSV файлом; с кэшем второй вызов берет результат из него
+            for _ in range(2):
+                result = analyzer.analyze([path, FILES[0]], "average-rating")
+                assert result == BrandRatingAnalyzer().analyze(
+                    FILES + FILES[:1], "average-rating"
+                )
+        assert analyzer.analyze([path], "average-rating") == expected
+
+    def test_async_reader(self, snapshot):
+        reader = CSVProductReader(DataValidator(), DataConverter())
+        async_reader = AsyncCSVProductReader(reader)
+        calculator = BrandRatingCalculator()
+        path = snapshot(FILES)
+
+        async def run():
+            try:
+                return await async_reader.aggregate(calculator, [path])
+            finally:
+                async_reader.close()
+
+        assert calculator.finalize(asyncio.run(run())) == calculator.calculate(
+            reader.iter_products(FILES)
+        )
+
+    def test_convert_command(self, tmp_path):
+        path = str(tmp_path / "products.brs")
+
+        result = subprocess.run(
+            [sys.executable, "main.py", "--convert", path, "-f", *FILES],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert "products.brs" in result.stdout
+        reader = CSVProductReader(DataValidator(), DataConverter())
+        assert len(read_snapshot(path)) == len(reader.read(FILES))
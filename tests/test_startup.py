@@ -0,0 +1,94 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from core import options
+from core.accumulators import ACCUMULATORS
+from core.calculator import CalculatorFactory
+from core.reader import READERS
+from core.reports import ReportFactory
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Бюджет запуска main.py --list-reports (python -X importtime). Без ленивых
+# импортов загружалось 233 модуля за 120 мс, с ними - 78 модулей за 30 мс.
+# Проверяется только количество модулей: время импортов зависит от
+# загрузки машины, и проверка времени давала ложные падения
+IMPORT_MODULES_BUDGET = 90
+
+# Модули, которые нужны только для анализа, сервера или отчетов. bz2 и lzma
+# сюда не входят: их загружает shutil, который импортирует сам argparse
+HEAVY_MODULES = {
+    "asyncio",
+    "concurrent.futures",
+    "gzip",
+    "http.server",
+    "mmap",
+    "numpy",
+    "pickle",
+    "tabulate",
+    "core.analyzer",
+    "core.async_reader",
+    "core.cache",
+    "core.calculator",
+    "core.reader",
+    "core.server",
+    "core.snapshot",
+    "core.utils.compression",
+    "core.reports.average_rating",
+    "core.reports.rating_percentiles",
+    "core.reports.distinct_products",
+    "core.reports.price_bands",
+    "core.reports.price_weighted_rating",
+    "core.reports.price_range",
+}
+
+
+def import_times(*args: str) -> dict[str, int]:
+    """
+    Запускает main.py с -X importtime.
+
+    :return: Собственное время импорта каждого модуля, мкс
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "main.py", *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(self_us)
+    return times
+
+
+class TestStartup:
+    """Тесты времени запуска CLI."""
+
+    @pytest.mark.parametrize("args", [("--list-reports",), ("--help",)])
+    def test_heavy_modules_are_not_imported(self, args):
+        imported = set(import_times(*args))
+
+        assert imported & HEAVY_MODULES == set()
+
+    def test_import_budget(self):
+        assert len(import_times("--list-reports")) < IMPORT_MODULES_BUDGET
+
+    def test_options_match_registries(self):
+        assert list(options.READER_TYPES) == list(READERS)
+        assert list(options.ACCUMULATOR_TYPES) == list(ACCUMULATORS)
+        assert options.DEFAULT_READER in READERS
+        assert options.DEFAULT_ACCUMULATOR in ACCUMULATORS
+        assert CalculatorFactory.get_available_engines() == ["python", "numpy"]
+
+    def test_lazy_report_is_loaded_on_create(self):
+        report = ReportFactory.create("average-rating")
+
+        assert report.name == "average-rating"
+        assert ReportFactory.get_report_class("average-rating") is type(report)